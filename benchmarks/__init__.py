@@ -0,0 +1,6 @@
+"""Benchmarks for the tangled.web request pipeline.
+
+Run with ``python -m benchmarks`` from the root of the repository. See
+``python -m benchmarks --help`` for options.
+
+"""
@@ -0,0 +1,165 @@
+"""Run the benchmarks.
+
+For each case, this reports:
+
+    - ops/sec: requests handled per second (including the cost of
+      creating a fresh environ for each request)
+    - mean: mean time per request in microseconds
+    - peak: the peak amount of memory allocated while handling
+      a single request, in bytes (measured with :mod:`tracemalloc`)
+    - blocks: the number of memory blocks allocated during a request
+      that are still alive at the end of the request
+
+Results can be written as JSON via ``--json`` and compared against
+previously written results via ``--compare``.
+
+"""
+import argparse
+import gc
+import json
+import platform
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from .cases import CASES, cleanup
+
+
+def start_response(status, headers, exc_info=None):
+    return lambda data: None
+
+
+def call(app, environ):
+    app_iter = app(environ, start_response)
+    try:
+        for _ in app_iter:
+            pass
+    finally:
+        close = getattr(app_iter, 'close', None)
+        if close is not None:
+            close()
+
+
+def case_name(name, params):
+    if params:
+        params = ', '.join('{}={}'.format(k, v) for k, v in sorted(params.items()))
+        name = '{name} ({params})'.format_map(locals())
+    return name
+
+
+def run_case(app, make_environ, iterations, warmup, allocation_iterations):
+    for _ in range(warmup):
+        call(app, make_environ())
+
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call(app, make_environ())
+    elapsed = time.perf_counter() - start
+
+    peaks = []
+    blocks = []
+    tracemalloc.start()
+    try:
+        for _ in range(allocation_iterations):
+            environ = make_environ()
+            gc.collect()
+            before = tracemalloc.take_snapshot()
+            base, _ = tracemalloc.get_traced_memory()
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            call(app, environ)
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            peaks.append(peak - base)
+            stats = after.compare_to(before, 'filename')
+            blocks.append(sum(s.count_diff for s in stats if s.count_diff > 0))
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'ops_per_sec': iterations / elapsed,
+        'mean_us': elapsed / iterations * 1000000,
+        'peak_bytes': sorted(peaks)[len(peaks) // 2],
+        'blocks': sorted(blocks)[len(blocks) // 2],
+    }
+
+
+def get_commit():
+    try:
+        output = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def print_results(results, baseline=None):
+    baseline = {r['name']: r for r in (baseline or {}).get('results', [])}
+    width = max(len(r['name']) for r in results)
+    header = '{:<{width}}  {:>12}  {:>10}  {:>10}  {:>8}'.format(
+        'CASE', 'OPS/SEC', 'MEAN (us)', 'PEAK (B)', 'BLOCKS', width=width)
+    if baseline:
+        header += '  {:>8}'.format('CHANGE')
+    print(header)
+    for result in results:
+        line = '{name:<{width}}  {ops_per_sec:>12.1f}  {mean_us:>10.2f}  {peak_bytes:>10}  ' \
+               '{blocks:>8}'.format(width=width, **result)
+        if result['name'] in baseline:
+            base_ops = baseline[result['name']]['ops_per_sec']
+            change = (result['ops_per_sec'] - base_ops) / base_ops * 100
+            line += '  {:>+7.1f}%'.format(change)
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', '--filter', help='Only run cases matching this regex')
+    parser.add_argument('-n', '--iterations', type=int, default=5000)
+    parser.add_argument('-w', '--warmup', type=int, default=500)
+    parser.add_argument('-a', '--allocation-iterations', type=int, default=25)
+    parser.add_argument('--json', dest='json_file', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare to results in this JSON file')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, factory, params in CASES:
+        name = case_name(name, params)
+        if args.filter and not re.search(args.filter, name):
+            continue
+        app, make_environ = factory(**params)
+        try:
+            result = run_case(
+                app, make_environ, args.iterations, args.warmup, args.allocation_iterations)
+        finally:
+            cleanup()
+        result['name'] = name
+        results.append(result)
+
+    if not results:
+        print('No cases matched', file=sys.stderr)
+        return 1
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+
+    print_results(results, baseline)
+
+    if args.json_file:
+        data = {
+            'commit': get_commit(),
+            'python': platform.python_version(),
+            'timestamp': time.time(),
+            'results': results,
+        }
+        with open(args.json_file, 'w') as fp:
+            json.dump(data, fp, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
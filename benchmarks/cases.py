@@ -0,0 +1,213 @@
+"""Benchmark cases.
+
+Each case is a function that returns a WSGI application and an environ
+factory. The environ factory is called once per iteration to get
+a fresh environ (WebOb stores state in the environ and request bodies
+can only be read once).
+
+"""
+import io
+import json
+import os
+import tempfile
+from urllib.parse import urlencode
+
+from webob import Request as WebObRequest
+from webob.exc import HTTPNotFound
+
+from tangled.web import Application, Resource, config
+
+
+CASES = []
+
+
+# Temporary directories created by cases (removed by cleanup())
+_temp_dirs = []
+
+
+def case(name, **params):
+    """Register a benchmark case (optionally parameterized)."""
+    def wrapper(func):
+        CASES.append((name, func, params))
+        return func
+    return wrapper
+
+
+def make_temp_dir():
+    """Make a temporary directory that's removed by :func:`cleanup`."""
+    temp_dir = tempfile.TemporaryDirectory(prefix='tangled-bench-')
+    _temp_dirs.append(temp_dir)
+    return temp_dir.name
+
+
+def cleanup():
+    """Remove temporary files created by cases.
+
+    This should be called after each case is run.
+
+    """
+    while _temp_dirs:
+        _temp_dirs.pop().cleanup()
+
+
+def make_environ_factory(path, method='GET', body=b'', headers=None, cycle=None):
+    """Make an environ factory for the specified request.
+
+    When ``cycle`` is a list of paths, each environ will use the next
+    path in the list. This is used to defeat match caching.
+
+    """
+    template = WebObRequest.blank(path, method=method, headers=headers).environ
+    template.pop('wsgi.input', None)
+    template['CONTENT_LENGTH'] = str(len(body))
+    paths = cycle or [path]
+    state = {'i': 0}
+
+    def factory():
+        environ = dict(template)
+        environ['wsgi.input'] = io.BytesIO(body)
+        if cycle:
+            i = state['i']
+            environ['PATH_INFO'] = paths[i % len(paths)]
+            state['i'] = i + 1
+        return environ
+
+    return factory
+
+
+def make_app(**settings):
+    settings.setdefault('tangled.app.testing', True)
+    return Application(settings)
+
+
+class Hello(Resource):
+
+    def GET(self):
+        return 'Hello, World'
+
+
+class Item(Resource):
+
+    def GET(self, id: int):
+        return {'id': id}
+
+
+class Items(Resource):
+
+    @config('application/json', status=201)
+    def POST(self, name, quantity: int = 1):
+        return {'name': name, 'quantity': quantity}
+
+
+class Form(Resource):
+
+    def POST(self, name):
+        return 'Hello, {}'.format(name)
+
+
+class Error(Resource):
+
+    def GET(self):
+        return {'status': self.request.response.status}
+
+
+class Fail(Resource):
+
+    def GET(self):
+        raise HTTPNotFound()
+
+
+@case('hello-world GET')
+def hello_world():
+    app = make_app()
+    app.mount_resource('hello', Hello, '/')
+    return app, make_environ_factory('/')
+
+
+@case('routed GET with urlvars', mounts=1000)
+@case('routed GET with urlvars', mounts=100)
+@case('routed GET with urlvars', mounts=10)
+def routed(mounts):
+    app = make_app(**{'tangled.app.default_content_type': 'application/json'})
+    # The target resource is mounted first, so it's searched last.
+    app.mount_resource('item', Item, '/items/<id>')
+    for i in range(mounts - 1):
+        app.mount_resource('other{}'.format(i), Item, '/other{}/<id>'.format(i))
+    paths = ['/items/{}'.format(i) for i in range(1000)]
+    return app, make_environ_factory('/items/0', cycle=paths)
+
+
+@case('JSON POST bind')
+def json_post():
+    app = make_app()
+    app.mount_resource('items', Items, '/items')
+    body = json.dumps({'name': 'widget', 'quantity': 2}).encode('utf-8')
+    headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+    return app, make_environ_factory('/items', 'POST', body, headers)
+
+
+class Session(dict):
+
+    # Minimal session for CSRF; sessions are provided by extensions.
+
+    def save(self):
+        pass
+
+
+@case('CSRF form POST')
+def csrf_form_post():
+    session = Session()
+    app = make_app(**{'tangled.app.csrf.enabled': True, 'tangled.app.defer_created': True})
+
+    def session_factory(request):
+        return session
+
+    app.register('session_factory', session_factory)
+    app.add_request_attribute(property(session_factory), name='session')
+    app.mount_resource('form', Form, '/form')
+    app.created()
+    request = app.make_blank_request('/form')
+    token_name = app.get_setting('csrf.token')
+    masked_token = request.masked_csrf_token
+    body = urlencode({'name': 'Bob', token_name: masked_token}).encode('utf-8')
+    headers = {
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'Cookie': '{}={}'.format(token_name, masked_token),
+    }
+    return app, make_environ_factory('/form', 'POST', body, headers)
+
+
+@case('static file hit')
+def static_file():
+    directory = make_temp_dir()
+    with open(os.path.join(directory, 'file.txt'), 'w') as fp:
+        fp.write('x' * 1024)
+    app = make_app()
+    app.mount_static_directory('static', directory)
+    app.mount_resource('hello', Hello, '/')
+    return app, make_environ_factory('/static/file.txt')
+
+
+@case('404 not found')
+def not_found():
+    app = make_app()
+    app.mount_resource('hello', Hello, '/')
+    paths = ['/nowhere/{}'.format(i) for i in range(1000)]
+    return app, make_environ_factory('/nowhere/0', cycle=paths)
+
+
+@case('405 method not allowed')
+def not_allowed():
+    app = make_app()
+    app.mount_resource('hello', Hello, '/')
+    return app, make_environ_factory('/', 'DELETE')
+
+
+@case('error resource')
+def error_resource():
+    app = make_app(**{
+        'tangled.app.error_resource': Error,
+        'tangled.app.default_content_type': 'application/json',
+    })
+    app.mount_resource('fail', Fail, '/fail')
+    return app, make_environ_factory('/fail')
@@ -0,0 +1,143 @@
+"""Measure per-worker memory in a pre-fork setup (Linux only).
+
+For each mode, an app is created in a parent process and then workers
+are forked. Each worker handles some requests and then reports its
+shared and private memory as read from ``/proc/self/smaps_rollup``.
+
+Modes:
+
+    - baseline: workers are forked without preparing the app
+    - prepared: the garbage collector is disabled in the parent before
+      the app is created, ``app.prepare_for_fork()`` is called before
+      forking, and the garbage collector is re-enabled in each worker
+
+Each mode runs in its own process so modes don't affect each other.
+
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+
+from tangled.web.snapshots import flush_all
+
+from .__main__ import call, case_name
+from .cases import CASES, cleanup
+
+
+MODES = ('baseline', 'prepared')
+
+FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+
+def read_smaps_rollup():
+    """Read memory stats (in KiB) for the current process."""
+    stats = {}
+    with open('/proc/self/smaps_rollup') as fp:
+        for line in fp:
+            name, _, value = line.partition(':')
+            if name in FIELDS:
+                stats[name] = int(value.split()[0])
+    return {
+        'rss': stats['Rss'],
+        'pss': stats['Pss'],
+        'shared': stats['Shared_Clean'] + stats['Shared_Dirty'],
+        'private': stats['Private_Clean'] + stats['Private_Dirty'],
+    }
+
+
+def get_case(name):
+    for case, factory, params in CASES:
+        if case_name(case, params) == name:
+            return factory, params
+    raise LookupError('Unknown case: {}'.format(name))
+
+
+def run_mode(mode, case, workers, requests):
+    """Run workers for ``mode`` and return their memory stats."""
+    factory, params = get_case(case)
+    if mode == 'prepared':
+        gc.disable()
+    app, make_environ = factory(**params)
+    if mode == 'prepared':
+        app.prepare_for_fork()
+
+    read_fd, write_fd = os.pipe()
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                os.close(read_fd)
+                gc.enable()
+                for _ in range(requests):
+                    call(app, make_environ())
+                gc.collect()
+                line = json.dumps(read_smaps_rollup()) + '\n'
+                os.write(write_fd, line.encode('ascii'))
+                exit_code = 0
+            finally:
+                # os._exit() skips atexit handlers
+                flush_all()
+                os._exit(exit_code)
+        pids.append(pid)
+
+    os.close(write_fd)
+    try:
+        with os.fdopen(read_fd) as fp:
+            results = [json.loads(line) for line in fp]
+        for pid in pids:
+            os.waitpid(pid, 0)
+    finally:
+        cleanup()
+    return results
+
+
+def run_mode_in_subprocess(mode, case, workers, requests):
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            os.close(read_fd)
+            results = run_mode(mode, case, workers, requests)
+            os.write(write_fd, json.dumps(results).encode('ascii'))
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as fp:
+        data = fp.read()
+    os.waitpid(pid, 0)
+    return json.loads(data) if data else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.memory', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-c', '--case', default='routed GET with urlvars (mounts=1000)')
+    parser.add_argument('-w', '--workers', type=int, default=4)
+    parser.add_argument('-n', '--requests', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print('/proc/self/smaps_rollup is not available on this system', file=sys.stderr)
+        return 1
+
+    print('Case: {0.case}; {0.workers} workers; {0.requests} requests per worker'.format(args))
+    print('{:<10}  {:>12}  {:>12}  {:>12}  {:>12}'.format(
+        'MODE', 'RSS (KiB)', 'PSS (KiB)', 'SHARED (KiB)', 'PRIVATE (KiB)'))
+    for mode in MODES:
+        results = run_mode_in_subprocess(mode, args.case, args.workers, args.requests)
+        if not results:
+            print('{:<10}  failed'.format(mode))
+            continue
+        means = {k: sum(r[k] for r in results) / len(results) for k in results[0]}
+        print('{mode:<10}  {rss:>12.0f}  {pss:>12.0f}  {shared:>12.0f}  {private:>12.0f}'.format(
+            mode=mode, **means))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,53 @@
-"""API typically used in applications."""
-from .app import Application
-from .events import subscriber
-from .request import Request
-from .resource.config import config
-from .resource.resource import Resource
-from .response import Response
-from .settings import make_app_settings
+"""API typically used in applications.
+
+On Python 3.7+, the API is imported lazily on first access so that
+importing :mod:`tangled.web` (e.g., to run a command or to import one
+of its submodules) doesn't import the entire framework.
+
+"""
+import sys
+
+
+__all__ = [
+    'Application',
+    'Request',
+    'Resource',
+    'Response',
+    'config',
+    'make_app_settings',
+    'subscriber',
+]
+
+
+# API name => module it's defined in
+_api = {
+    'Application': '.app',
+    'Request': '.request',
+    'Resource': '.resource.resource',
+    'Response': '.response',
+    'config': '.resource.config',
+    'make_app_settings': '.settings',
+    'subscriber': '.events',
+}
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _api:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+        from importlib import import_module
+        module = import_module(_api[name], __name__)
+        obj = getattr(module, name)
+        globals()[name] = obj
+        return obj
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
+else:
+    from .app import Application
+    from .events import subscriber
+    from .request import Request
+    from .resource.config import config
+    from .resource.resource import Resource
+    from .response import Response
+    from .settings import make_app_settings
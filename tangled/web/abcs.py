@@ -1,4 +1,4 @@
-from abc import ABCMeta
+from abc import ABCMeta, abstractmethod
 
 
 class AApplication(metaclass=ABCMeta):
@@ -6,6 +6,26 @@ class AApplication(metaclass=ABCMeta):
     """Just a marker for now."""
 
 
+class AAppComponent(metaclass=ABCMeta):
+
+    """A registry component with per-application state.
+
+    When an application is cloned, these components are created anew
+    for the clone via :meth:`from_app` rather than being shared (see
+    :meth:`tangled.web.app.Application.clone`).
+
+    """
+
+    @classmethod
+    @abstractmethod
+    def from_app(cls, app):
+        """Create the component for ``app`` using its settings."""
+        raise NotImplementedError
+
+    def prepare_for_fork(self):
+        """Called by :meth:`.Application.prepare_for_fork`."""
+
+
 class AAppSettings(metaclass=ABCMeta):
 
     """Just a marker for now."""
@@ -0,0 +1,137 @@
+"""Allocation tracking for the request path.
+
+This is a debugging tool. Enable it by setting
+``debug.alloc_tracking = true``. This will:
+
+    - Start :mod:`tracemalloc` (if it's not already tracing).
+    - Replace ``request.timings`` with an :class:`AllocationTimings`
+      instance, which records the memory blocks and bytes allocated
+      (net of frees) in each handler and in each phase of request
+      processing along with the usual timings (see
+      :mod:`tangled.web.timing`). In addition to the usual phases,
+      allocations are recorded for request creation (``request``),
+      adding dynamic request attributes (``request_attributes``), and
+      resource config construction (``config``).
+    - Add a handler that aggregates the allocations per mounted
+      resource.
+    - Mount a JSON resource that shows the aggregated allocations at
+      ``debug.alloc_tracking.path``.
+
+.. note:: Allocations are measured process-wide, so concurrent requests
+    will skew the numbers. Use a single-threaded server when tracking
+    allocations.
+
+"""
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict
+
+from .abcs import AAppComponent
+from .resource.resource import Resource
+from .timing import Timings, perf_counter_ns
+
+
+def include(app):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    app.register(AllocationStats, AllocationStats.from_app(app))
+    path = app.get_setting('debug.alloc_tracking.path')
+    if path:
+        app.mount_resource(
+            'tangled.web.alloc', AllocationStatsResource, path, methods=('GET',))
+
+
+def _get_traced_size():
+    return tracemalloc.get_traced_memory()[0]
+
+
+class AllocationTimings(Timings):
+
+    """Records allocations along with timings.
+
+    ``allocations`` maps names to ``[blocks, bytes]``.
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.allocations = OrderedDict()
+
+    @staticmethod
+    def start():
+        return perf_counter_ns(), sys.getallocatedblocks(), _get_traced_size()
+
+    def record(self, name, start):
+        start_ns, start_blocks, start_size = start
+        blocks = sys.getallocatedblocks() - start_blocks
+        size = _get_traced_size() - start_size
+        elapsed = perf_counter_ns() - start_ns
+        durations = self.durations
+        durations[name] = durations.get(name, 0) + elapsed
+        allocations = self.allocations.get(name)
+        if allocations is None:
+            self.allocations[name] = [blocks, size]
+        else:
+            allocations[0] += blocks
+            allocations[1] += size
+        return elapsed
+
+
+def alloc_tracking_handler(app, request, next_handler):
+    """Aggregate request allocations per mounted resource."""
+    response = next_handler(app, request)
+    timings = request.timings
+    if isinstance(timings, AllocationTimings):
+        mounted_resource = getattr(request, 'mounted_resource', None)
+        name = None if mounted_resource is None else mounted_resource.name
+        app.get_required(AllocationStats).add(name, timings.allocations)
+    return response
+
+
+class AllocationStats(AAppComponent):
+
+    """Aggregates allocations by route and phase."""
+
+    def __init__(self):
+        # route name => {phase => [requests, blocks, bytes]}
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_app(cls, app):
+        return cls()
+
+    def add(self, route, allocations):
+        with self._lock:
+            phases = self._routes.setdefault(route, OrderedDict())
+            for phase, (blocks, size) in allocations.items():
+                totals = phases.get(phase)
+                if totals is None:
+                    phases[phase] = [1, blocks, size]
+                else:
+                    totals[0] += 1
+                    totals[1] += blocks
+                    totals[2] += size
+
+    def summary(self):
+        """Get mean allocations per request by route and phase."""
+        with self._lock:
+            summary = {}
+            for route, phases in self._routes.items():
+                summary[route or '__unmatched__'] = OrderedDict(
+                    (phase, {
+                        'requests': count,
+                        'mean_blocks': blocks / count,
+                        'mean_bytes': size / count,
+                    })
+                    for phase, (count, blocks, size) in phases.items())
+            return summary
+
+
+class AllocationStatsResource(Resource):
+
+    """Exposes aggregated allocations as JSON."""
+
+    def GET(self):
+        return {'routes': self.app.get_required(AllocationStats).summary()}
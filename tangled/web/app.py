@@ -1,9 +1,14 @@
 import configparser
+import copy
 import functools
+import importlib.util
+import gc
 import logging
 import logging.config
 import pdb
 import re
+import sys
+import threading
 
 from webob.exc import HTTPInternalServerError
 
@@ -17,16 +22,21 @@ from tangled.util import (
     load_object,
 )
 
-from . import abcs, representations
+from . import abcs, representations, templates
+from .cache import LRUCache
 from .const import ALL_HTTP_METHODS
 from .events import Subscriber, ApplicationCreated
-from .exc import DebugHTTPInternalServerError
+from .exc import ConfigurationError, DebugHTTPInternalServerError
+from .frozen import FrozenDispatch
 from .handlers import HandlerWrapper
 from .representations import Representation
 from .resource.config import Field as ConfigField, RepresentationArg
 from .resource.mounted import MountedResource, MountedResourceMatch
-from .settings import make_app_settings
-from .static import LocalDirectory, RemoteDirectory
+from .settings import AppSettings, copy_settings, make_app_settings
+from .providers import Provider, SCOPES
+from .static import RemoteDirectory
+from .templates import TemplateEngine, TemplateRegistry
+from .timing import TimedHandlerWrapper, Timings
 
 
 log = logging.getLogger(__name__)
@@ -82,14 +92,49 @@ class Application(Registry):
     ``handlers``, ``loggers``), that logging configuration will
     automatically be loaded via ``logging.config.fileConfig``.
 
+    **Freezing:**
+
+    If the ``tangled.app.freeze`` setting is enabled, the application
+    will be frozen after it's created. See :meth:`freeze`.
+
     """
 
+    #: Frozen lookup tables; set by :meth:`freeze`.
+    _frozen = None
+
+    #: Settings that are only used while an application is being
+    #: constructed. These (and any settings nested under them) can't be
+    #: overridden in a clone. See :meth:`clone`.
+    construction_settings = (
+        'package',
+        'debug.alloc_tracking',
+        'tangled.app.csrf.enabled',
+        'tangled.app.handlers',
+        'tangled.app.includes',
+        'tangled.app.load_config',
+        'tangled.app.metrics',
+        'tangled.app.on_created',
+        'tangled.app.profiling',
+        'tangled.app.request_factory',
+        'tangled.app.resources',
+        'tangled.app.response_factory',
+        'tangled.app.slow_log',
+        'tangled.app.static_directories',
+        'tangled.app.testing',
+    )
+
     def __init__(self, settings, **extra_settings):
+        # Time spent in each phase of app creation; shown by
+        # `tangled show startup`.
+        timings = self.startup_timings = Timings()
+        start = timings.start()
+
         if not isinstance(settings, abcs.AAppSettings):
             settings = make_app_settings(settings, **extra_settings)
         self.settings = settings
 
         package = settings.get('package')
+        start = self._record_startup('settings', start)
 
         # Register default representations (content type => repr. type).
         # Includes can override this.
@@ -97,7 +142,8 @@ class Application(Registry):
             is_representation_type = (
                 isinstance(obj, type) and
                 issubclass(obj, Representation) and
-                obj is not Representation)
+                obj is not Representation and
+                obj.register_by_default)
             if is_representation_type:
                 self.register_representation_type(obj)
 
@@ -106,12 +152,18 @@ class Application(Registry):
         self.add_config_field('*/*', 'status', None)
         self.add_config_field('*/*', 'location', None)
         self.add_config_field('*/*', 'response_attrs', dict)
+        self.add_representation_arg('text/csv', 'columns', None)
+        self.add_representation_arg('text/csv', 'dialect', 'excel')
+        self.add_representation_arg('text/csv', 'header', True)
+        self.add_representation_arg('text/csv', 'flush_rows', 100)
+        start = self._record_startup('representations', start)
 
         # Handlers added from settings have precedence over handlers
         # added via includes.
         handlers = self.get_setting('handlers')
         for handler in handlers:
             self.add_handler(handler)
+        start = self._record_startup('handlers', start)
 
         # Mount static directories and resources from settings before
         # those from includes. It's assumed that only the main
@@ -119,6 +171,7 @@ class Application(Registry):
         # way.
         for static_args in self.get_setting('static_directories'):
             self.mount_static_directory(**static_args)
+        start = self._record_startup('static_directories', start)
 
         resources_package = self.get_setting('tangled.app.resources.package', package)
 
@@ -134,16 +187,35 @@ class Application(Registry):
                 factory = '{package}{factory}'.format(package=resources_package, factory=factory)
                 resource_args['factory'] = factory
             self.mount_resource(**resource_args)
+        start = self._record_startup('resources', start)
 
         # Before config is loaded via load_config()
+        includes = []
+
         if self.get_setting('csrf.enabled'):
-            self.include('.csrf')
+            includes.append('.csrf')
+
+        if self.get_setting('metrics.enabled'):
+            includes.append('.metrics')
+
+        if self.get_setting('profiling.enabled'):
+            includes.append('.profiling')
+
+        if self.get_setting('slow_log.enabled'):
+            includes.append('.slowlog')
+
+        if self.get_setting('debug.alloc_tracking', False):
+            includes.append('.alloc')
 
-        for include in self.get_setting('includes'):
+        includes.extend(self.get_setting('includes'))
+
+        for include in includes:
             self.include(include)
+            start = self._record_startup('include', start, include)
 
         for where in self.get_setting('load_config'):
             self.load_config(where)
+            start = self._record_startup('load_config', start, where)
 
         request_factory = self.get_setting('request_factory')
         request_factory = load_object(request_factory)
@@ -152,10 +224,12 @@ class Application(Registry):
         response_factory = self.get_setting('response_factory')
         response_factory = load_object(response_factory)
         self.register(abcs.AResponse, response_factory)
+        start = self._record_startup('factories', start)
 
         # TODO: Not sure this belongs here
         if not self.testing:
             self._configure_logging()
+            start = self._record_startup('logging', start)
 
         self.name = self.get_setting('name') or 'id={}'.format(id(self))
         process_registry.register(abcs.AApplication, self, self.name)
@@ -167,13 +241,200 @@ class Application(Registry):
             self.created()
 
     def created(self):
+        start = self.startup_timings.start()
+
         # Force early loading of handlers. This is intended to shake out
         # more errors without needing to issue a request.
         self._handlers
 
         self.notify_subscribers(ApplicationCreated, self)
+
+        if self.get_setting('freeze'):
+            self.freeze()
+
+        self._record_startup('created', start)
+        return self
+
+    def _record_startup(self, phase, start, obj=None):
+        # Record startup phase and return start of next phase
+        if obj is not None:
+            if not isinstance(obj, str):
+                obj = getattr(obj, '__name__', repr(obj))
+            phase = '{phase}:{obj}'.format_map(locals())
+        timings = self.startup_timings
+        timings.record(phase, start)
+        return timings.start()
+
+    def freeze(self):
+        """Compile dispatch data into immutable lookup tables.
+
+        After this is called, the application's configuration can no
+        longer be changed: registering or removing components will raise
+        a :class:`ConfigurationError`. See :mod:`tangled.web.frozen`.
+
+        This is called automatically after the application is created
+        when the ``tangled.app.freeze`` setting is enabled.
+
+        """
+        if self._frozen is None:
+            self._load_mounted_resources()
+            self._frozen_lock = threading.Lock()
+            self._frozen = FrozenDispatch(self)
         return self
 
+    def _load_mounted_resources(self):
+        # Mounted resource factories and methods are loaded lazily by
+        # default (see MountedResource).
+        for mounted_resource in self.get_all(abcs.AMountedResource, default=()):
+            mounted_resource.load()
+
+    @property
+    def frozen(self):
+        """Whether the application has been frozen."""
+        return self._frozen is not None
+
+    def prepare_for_fork(self):
+        """Prepare the application to be shared by forked workers.
+
+        Call this in the parent process after the application has been
+        created and right before forking worker processes. This will:
+
+            - Call :meth:`~tangled.web.abcs.AAppComponent.prepare_for_fork`
+              on the application's per-app components (e.g., to remove
+              stale metrics snapshots).
+            - Compute all of the application's lazily computed attributes
+              (settings wrappers, the handler chain, etc) so that they're
+              computed once in the parent process rather than once per
+              worker.
+            - Move all objects tracked by the garbage collector into
+              a permanent generation via :func:`gc.freeze` (on Python
+              3.7+) so that collections in workers won't touch them. This
+              helps memory pages be shared between workers instead of
+              being copied into every worker on write.
+
+        For best results, also call :func:`gc.disable` early in the
+        parent process (i.e., before creating the application) and
+        :func:`gc.enable` early in each worker. See the docs for
+        :func:`gc.freeze` for details.
+
+        .. note:: Other than the caches that are populated as requests
+            are handled (e.g., for resource lookups), nothing that's
+            shared by requests is lazily initialized after this is
+            called. To also compile the registry into immutable lookup
+            tables, enable ``tangled.app.freeze`` (see :meth:`freeze`).
+
+        """
+        self.debug
+        self.testing
+        self.exc_log_message_factory
+        self._timings_factory
+        self._timing_enabled
+        self._handlers
+        self._first_handler
+        self._request_finished_handler
+        self._negotiation_cache
+        self._url_base_cache
+        self._load_mounted_resources()
+        for registered in self._components.values():
+            for component in registered.values():
+                if isinstance(component, abcs.AAppComponent):
+                    component.prepare_for_fork()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+        return self
+
+    def clone(self, **settings):
+        """Create a copy of this application with some settings changed.
+
+        This is much cheaper than creating a new application because
+        includes, config loading, etc aren't run again. Instead, the
+        registry is copied structurally: mounted resources and config
+        are copied (so they can be changed independently), but the
+        objects they refer to (resource classes, compiled URL patterns,
+        etc) are shared. The clone's lazily computed attributes (such as
+        the handler chain) are computed from its own settings.
+
+        ``settings`` override this application's settings. Since the
+        keys are usually dotted names, they're typically passed via
+        ``**``::
+
+            tenant_app = app.clone(**{'tenant.name': 'acme'})
+
+        Components with per-application state (those that implement
+        :class:`~tangled.web.abcs.AAppComponent`, such as the metrics
+        registry and the fragment cache) are created anew for the clone
+        from its settings. Other components are shared.
+
+        The :attr:`construction_settings` can't be overridden, since
+        they determine what's registered when the application is
+        constructed; a :class:`ConfigurationError` is raised if any of
+        them is passed. (Rebuilding the application from its settings
+        would silently drop anything that was registered in code.)
+
+        Unless a name is passed via ``tangled.app.name``, the clone is
+        given a unique name.
+
+        .. note:: Configuration done by includes is *not* redone, so
+            includes that read settings must read them when they're
+            used (or from an :class:`~tangled.web.abcs.AAppComponent`)
+            for overrides of those settings to take effect in a clone.
+
+        """
+        construction_settings = self.construction_settings
+        for name in settings:
+            for construction_name in construction_settings:
+                if name == construction_name or name.startswith(construction_name + '.'):
+                    raise ConfigurationError(
+                        "Can't override construction setting {name} in a clone of {app}; "
+                        'create a new application with the setting instead'
+                        .format(name=name, app=self.name))
+
+        all_settings = AppSettings(copy_settings(self.settings))
+        all_settings.update(settings)
+        if not ('name' in settings or 'tangled.app.name' in settings):
+            all_settings['tangled.app.name'] = None
+
+        app = object.__new__(type(self))
+        app.startup_timings = Timings()
+        start = app.startup_timings.start()
+        app.settings = all_settings
+
+        components = app._components
+        for key, registered in self._components.items():
+            components[key] = registered.__class__(
+                (differentiator, self._clone_component(component, app))
+                for differentiator, component in registered.items())
+
+        # Once subscribers that have already been called (and removed)
+        for event_type, subscriber in self._called_once_subscribers:
+            app.register(event_type, subscriber, subscriber)
+
+        app._record_startup('clone', start)
+
+        app.name = app.get_setting('name') or 'id={}'.format(id(app))
+        process_registry.register(abcs.AApplication, app, app.name)
+
+        if not app.get_setting('tangled.app.defer_created', False):
+            app.created()
+        return app
+
+    def _clone_component(self, component, app):
+        if isinstance(component, MountedResource):
+            component = copy.copy(component)
+            component.app = app
+        elif isinstance(component, abcs.AAppComponent):
+            component = component.from_app(app)
+        elif isinstance(component, Registry):
+            registry = Registry()
+            for key, registered in component._components.items():
+                registry._components[key] = registered.__class__(
+                    (differentiator, self._clone_component(c, app))
+                    for differentiator, c in registered.items())
+            component = registry
+        elif isinstance(component, (dict, list, set)):
+            component = copy.copy(component)
+        return component
+
     def on_created(self, func, priority=None, once=True, **args):
         """Add an :class:`~tangled.web.events.ApplicationCreated`
         subscriber.
@@ -208,6 +469,90 @@ class Application(Registry):
             if self.debug:
                 print('No logging config found')
 
+    ## Registry
+
+    def register(self, key, component, differentiator=None, replace=False):
+        if self._frozen is not None:
+            raise ConfigurationError(
+                "Can't register {key!r} ({differentiator!r}) with frozen application {name}; "
+                'register components before the application is created or disable '
+                'tangled.app.freeze'.format(key=key, differentiator=differentiator, name=self.name))
+        super().register(key, component, differentiator, replace)
+        self._negotiation_cache.clear()
+        self._bind_plans.clear()
+
+    def remove(self, key, differentiator=None):
+        if self._frozen is not None:
+            raise ConfigurationError(
+                "Can't remove {key!r} ({differentiator!r}) from frozen application {name}"
+                .format(key=key, differentiator=differentiator, name=self.name))
+        super().remove(key, differentiator)
+        self._negotiation_cache.clear()
+        self._bind_plans.clear()
+
+    def get(self, key, differentiator=None, default=None):
+        frozen = self._frozen
+        if frozen is None:
+            return super().get(key, differentiator, default)
+        return frozen.components.get((key, differentiator), default)
+
+    def get_required(self, key, differentiator=None):
+        frozen = self._frozen
+        if frozen is None:
+            return super().get_required(key, differentiator)
+        try:
+            return frozen.components[(key, differentiator)]
+        except KeyError:
+            raise KeyError([key, differentiator]) from None
+
+    def get_all(self, key, default=None, as_dict=False):
+        frozen = self._frozen
+        if frozen is None:
+            return super().get_all(key, default, as_dict)
+        components = frozen.component_dicts if as_dict else frozen.component_lists
+        return components.get(key, default)
+
+    def contains(self, key, differentiator=None):
+        frozen = self._frozen
+        if frozen is None:
+            return super().contains(key, differentiator)
+        return (key, differentiator) in frozen.components
+
+    def has_any(self, key):
+        frozen = self._frozen
+        if frozen is None:
+            return super().has_any(key)
+        return key in frozen.component_lists
+
+    @cached_property
+    def _negotiation_cache(self):
+        # Caches content negotiation results (see
+        # Request.response_content_type and the tweaker handler). Since
+        # any registration could change the results, it's cleared
+        # whenever the registry is modified.
+        return LRUCache(self.get_setting('negotiation_cache.max_size'))
+
+    @cached_property
+    def _bind_plans(self):
+        # Resource method binding plans by resource class and method
+        # name (see Resource.bind). Since which parameters are injected
+        # depends on the providers that are registered, this is cleared
+        # whenever the registry is modified.
+        return {}
+
+    @cached_property
+    def _provided(self):
+        # App scoped provider values by type (see tangled.web.providers)
+        return {}
+
+    @cached_property
+    def _url_base_cache(self):
+        # Caches base URLs and paths used for URL generation (see
+        # Request._url_bases) by scheme, host, and script name. These
+        # come from the environ (and the Host header in particular
+        # can be anything), so the cache size is limited.
+        return LRUCache(self.get_setting('url_base_cache.max_size'))
+
     ## Settings
 
     @cached_property
@@ -226,6 +571,21 @@ class Application(Registry):
         """
         return self.settings['tangled.app.testing']
 
+    @cached_property
+    def _timings_factory(self):
+        # Creates request.timings when timing is enabled (either
+        # directly or via allocation tracking); None otherwise.
+        if self.get_setting('debug.alloc_tracking', False):
+            from .alloc import AllocationTimings
+            return AllocationTimings
+        if self.get_setting('timing.enabled'):
+            return Timings
+        return None
+
+    @cached_property
+    def _timing_enabled(self):
+        return self._timings_factory is not None
+
     @cached_property
     def exc_log_message_factory(self):
         factory = self.get_setting('exc_log_message_factory')
@@ -275,12 +635,23 @@ class Application(Registry):
         """Set up the handler chain."""
         settings = self.get_settings(prefix='tangled.app.handler.')
         # System handler chain
-        handlers = [settings['exc']]
+        handlers = []
+        if self.get_setting('debug.alloc_tracking', False):
+            handlers.append(settings['alloc_tracking'])
+        if self._timing_enabled:
+            handlers.append(settings['timing'])
+        if self.get_setting('metrics.enabled'):
+            handlers.append(settings['metrics'])
+        if self.get_setting('slow_log.enabled'):
+            handlers.append(settings['slow_log'])
+        handlers.append(settings['exc'])
+        if self.get_setting('profiling.enabled'):
+            handlers.append(settings['profiling'])
         if self.has_any('static_directory'):
             # Only enable static file handler if there's at least one
             # local static directory registered.
             dirs = self.get_all('static_directory')
-            if any(isinstance(d, LocalDirectory) for d in dirs):
+            if any(not isinstance(d, RemoteDirectory) for d in dirs):
                 handlers.append(settings['static_files'])
         handlers.append(settings['tweaker'])
         handlers.append(settings['notifier'])
@@ -296,10 +667,11 @@ class Application(Registry):
         # Main handler
         handlers.append(settings['main'])
         # Wrap handlers
+        wrapper = TimedHandlerWrapper if self._timing_enabled else HandlerWrapper
         wrapped_handlers = []
         next_handler = None
         for handler in reversed(handlers):
-            handler = HandlerWrapper(handler, next_handler)
+            handler = wrapper(handler, next_handler)
             wrapped_handlers.append(handler)
             next_handler = handler
         wrapped_handlers.reverse()
@@ -467,6 +839,13 @@ class Application(Registry):
         ``('GET', 'POST')``.
 
         """
+        if self._frozen is not None:
+            # The args are added to nested registries, which bypasses
+            # the check in register(), and the frozen tables wouldn't
+            # include them anyway.
+            raise ConfigurationError(
+                "Can't add @config arg {name!r} ({content_type}) to frozen application "
+                '{app}'.format(name=name, content_type=content_type, app=self.name))
         if methods == '*':
             methods = ALL_HTTP_METHODS
         arg = type_(methods, content_type, name, default, required)
@@ -548,7 +927,13 @@ class Application(Registry):
         ``parent/child`` and its path would be ``/parent/child``.
 
         """
-        factory = load_object(factory, level=_level)
+        if isinstance(factory, str) and factory.startswith(('.', ':')):
+            # Resolve relative factory path against the caller's package
+            # now since the factory is loaded lazily.
+            package = sys._getframe(_level - 2).f_globals['__package__']
+            module_name, colon, obj_name = factory.partition(':')
+            module_name = importlib.util.resolve_name(module_name or '.', package)
+            factory = ''.join((module_name, colon, obj_name))
         mounted_resource = MountedResource(self, name, factory, path, methods, method, add_slash)
         self.register(abcs.AMountedResource, mounted_resource, mounted_resource.name, replace)
         return SubResourceMounter(self, mounted_resource)
@@ -556,11 +941,16 @@ class Application(Registry):
     @functools.lru_cache()
     def find_mounted_resource(self, method, path, *, ignore_method=False):
         """Find resource mounted at path corresponding to method."""
-        candidates = self.get_all(abcs.AMountedResource, as_dict=True)
+        frozen = self._frozen
+        if frozen is not None:
+            candidates = frozen.mounted_resources
+        else:
+            candidates = self.get_all(abcs.AMountedResource, as_dict=True)
+            candidates = reversed(candidates.values()) if candidates else None
         if not candidates:
             log.warning('No resources mounted')
             return None
-        for mounted_resource in reversed(candidates.values()):
+        for mounted_resource in candidates:
             match = mounted_resource.path_regex.search(path)
             if match and (method in mounted_resource.methods or ignore_method):
                 return MountedResourceMatch(mounted_resource, match.groupdict())
@@ -587,6 +977,39 @@ class Application(Registry):
             'content_type', (content_type, quality), content_type,
             replace=replace)
 
+    def add_template_engine(self, content_type, engine, replace=False):
+        """Add a template engine for the specified content type.
+
+        ``engine`` can be a :class:`~tangled.web.templates.TemplateEngine`
+        instance or a string pointing to one. Templates rendered by the
+        engine are compiled once and cached (see
+        :mod:`tangled.web.templates`).
+
+        """
+        engine = load_object(engine)
+        if not self.contains(TemplateRegistry):
+            self.include(templates.include)
+        self.register(TemplateEngine, engine, content_type, replace=replace)
+
+    def add_provider(self, type_, factory, scope='request', replace=False):
+        """Add a provider for values of the specified type.
+
+        Resource method parameters annotated with ``type_`` will be
+        passed a value created by calling ``factory`` with the app and
+        the current request. ``scope`` determines how often ``factory``
+        is called: once per ``'app'``, once per ``'request'``, or on
+        every ``'call'``. See :mod:`tangled.web.providers`.
+
+        ``type_`` and ``factory`` can be strings pointing to objects.
+
+        """
+        if scope not in SCOPES:
+            raise ValueError(
+                'Provider scope must be one of {}; got {!r}'.format(', '.join(SCOPES), scope))
+        type_ = load_object(type_)
+        factory = load_object(factory)
+        self.register(Provider, Provider(type_, factory, scope), type_, replace=replace)
+
     def add_request_attribute(self, attr, name=None, decorator=None,
                               reify=False):
         """Add dynamic attribute to requests.
@@ -650,6 +1073,7 @@ class Application(Registry):
             directory = RemoteDirectory(directory)
         else:
             directory = abs_path(directory)
+            from .static import LocalDirectory
             directory = LocalDirectory(directory, index_page=index_page)
         self.register('static_directory', directory, prefix)
 
@@ -689,32 +1113,76 @@ class Application(Registry):
 
     def notify_subscribers(self, event_type, *event_args, **event_kwargs):
         """Call subscribers registered for ``event_type``."""
-        subscribers = self.get_all(event_type, default=())
-        if subscribers:
+        frozen = self._frozen
+        if frozen is not None:
+            subscribers = frozen.subscribers.get(event_type, ())
+        else:
+            subscribers = self.get_all(event_type, default=())
             subscribers = sorted(subscribers, key=Subscriber.sorter)
+        if subscribers:
             event = event_type(*event_args, **event_kwargs)
             for subscriber in subscribers:
                 subscriber.func(event, **subscriber.args)
                 if subscriber.once:
-                    self.remove(event_type, subscriber)
+                    self._remove_once_subscriber(event_type, subscriber)
+
+    @cached_property
+    def _called_once_subscribers(self):
+        # (event type, subscriber) for once subscribers that have been
+        # called and removed; used by clone().
+        return []
+
+    def _remove_once_subscriber(self, event_type, subscriber):
+        if self._frozen is None:
+            self._called_once_subscribers.append((event_type, subscriber))
+            self.remove(event_type, subscriber)
+            return
+        # Rebuild the frozen tables without the subscriber. The registry
+        # is modified directly (bypassing the frozen check) and the new
+        # tables are swapped in at once, so other threads always see
+        # a complete set of tables.
+        with self._frozen_lock:
+            if not Registry.contains(self, event_type, subscriber):
+                return  # Already removed by another thread
+            self._called_once_subscribers.append((event_type, subscriber))
+            Registry.remove(self, event_type, subscriber)
+            self._negotiation_cache.clear()
+            self._bind_plans.clear()
+            self._frozen = FrozenDispatch(self)
 
     # Request
 
     def make_request(self, environ, **kwargs):
         """Make a request using the registered request factory."""
-        factory = self.get(abcs.ARequest)
-        request = factory(environ, self, **kwargs)
-        self._set_request_attributes(request)
+        frozen = self._frozen
+        factory = self.get(abcs.ARequest) if frozen is None else frozen.request_factory
+        timings_factory = self._timings_factory
+        if timings_factory is None:
+            request = factory(environ, self, **kwargs)
+            self._set_request_attributes(request)
+        else:
+            timings = timings_factory()
+            start = timings.start()
+            request = factory(environ, self, **kwargs)
+            timings.record('request', start)
+            start = timings.start()
+            self._set_request_attributes(request)
+            timings.record('request_attributes', start)
+            request.timings = timings
         return request
 
     def make_blank_request(self, *args, **kwargs):
         """Make a blank request using the registered request factory."""
-        factory = self.get(abcs.ARequest)
+        frozen = self._frozen
+        factory = self.get(abcs.ARequest) if frozen is None else frozen.request_factory
         request = factory.blank(*args, app=self, **kwargs)
         self._set_request_attributes(request)
         return request
 
     def _set_request_attributes(self, request):
+        if self._frozen is not None:
+            # Dynamic attributes are added to the frozen request factory
+            return
         attrs = self.get_all('dynamic_request_attr', as_dict=True)
         if attrs:
             base = request.__class__
@@ -776,6 +1244,15 @@ class SubResourceMounter:
     def mount(self, name, path, factory=None, methods=None, method=None, add_slash=False):
         name = '/'.join((self.parent.name, name))
         path = '/'.join((self.parent.path, path.lstrip('/')))
-        factory = factory if factory is not None else self.parent.factory
-        methods = methods if methods is not None else self.parent.methods
+        parent = self.parent
+        if factory is None:
+            # Avoid loading the parent's factory (and methods) if they
+            # haven't been loaded yet.
+            factory = parent._factory
+            if methods is None:
+                # When the parent's methods haven't been determined yet,
+                # the child's will be determined the same way.
+                methods = parent._methods or ()
+        elif methods is None:
+            methods = parent.methods
         return self.app.mount_resource(name, factory, path, methods, method, add_slash, _level=4)
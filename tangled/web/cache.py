@@ -0,0 +1,48 @@
+import collections
+import threading
+
+
+class LRUCache:
+
+    """Keeps the ``max_size`` most recently used items.
+
+    Lookups don't lock, so a concurrent update may cause a lookup to
+    miss; that's okay since items can always be recomputed.
+
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        items = self._items
+        try:
+            value = items[key]
+            items.move_to_end(key)
+        except KeyError:
+            return default
+        return value
+
+    def set(self, key, value):
+        items = self._items
+        with self._lock:
+            items[key] = value
+            items.move_to_end(key)
+            while len(items) > self.max_size:
+                items.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
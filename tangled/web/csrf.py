@@ -3,7 +3,6 @@ import logging
 from datetime import datetime, timedelta
 from urllib.parse import urlparse
 
-from markupsafe import Markup
 from webob.exc import HTTPForbidden
 
 from tangled.util import constant_time_compare, random_string
@@ -88,6 +87,8 @@ def csrf_tag(request):
     token = get_token(request)
     tag = '<input type="hidden" name="{name}" value="{value}" />'
     tag = tag.format(name=token, value=request.masked_csrf_token)
+    # Imported here so markupsafe is only loaded when it's needed
+    from markupsafe import Markup
     return Markup(tag)
 
 
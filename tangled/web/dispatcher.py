@@ -0,0 +1,138 @@
+"""Dispatch requests to multiple applications in one process.
+
+A :class:`Dispatcher` is a WSGI application that routes requests to
+other WSGI applications (typically tangled.web applications) by host
+and/or path prefix::
+
+    dispatcher = Dispatcher(shared=(MetricsRegistry,))
+    dispatcher.mount(Application('api.ini'), '/api')
+    dispatcher.mount(Application('admin.ini'), '/admin')
+    dispatcher.mount(Application('site.ini'), host='www.example.com')
+
+When a request is dispatched to an application mounted at a prefix, the
+prefix is moved from ``PATH_INFO`` to ``SCRIPT_NAME`` (in place; the
+environ isn't copied), so URLs generated via :meth:`.Request.make_url`
+and friends in that application will include the prefix.
+
+Lookups are dict lookups: one per distinct prefix depth (i.e., number
+of path segments) per host. For the common case where all prefixes are
+a single segment, that's at most two lookups (mounted host and any
+host).
+
+"""
+from webob.exc import HTTPNotFound
+
+from tangled.registry import ARegistry
+
+
+class Dispatcher:
+
+    """Routes requests to applications by host and path prefix.
+
+    ``shared`` is a list of registry keys for components that should
+    be shared by tangled.web applications mounted in this dispatcher
+    (e.g., :class:`tangled.web.metrics.MetricsRegistry`). The component
+    registered in the first mounted application that has one is
+    registered in the other applications, replacing their own. Since
+    shared components are registered in mounted applications, those
+    applications can't be frozen when they're mounted (create them with
+    ``tangled.app.defer_created`` enabled and call their ``created()``
+    method after mounting them).
+
+    ``not_found`` is the WSGI application that's called when a request
+    doesn't match any mounted application. By default, a 404 response
+    is returned.
+
+    """
+
+    def __init__(self, shared=(), not_found=None):
+        self.shared = tuple(shared)
+        self.shared_components = {}
+        self.not_found = not_found or HTTPNotFound()
+        # host (None for any) => {prefix => app}
+        self.routes = {}
+        # host (None for any) => distinct prefix depths, deepest first
+        self.depths = {}
+
+    def mount(self, app, prefix='', host=None):
+        """Mount ``app`` at ``prefix`` (for ``host``, if specified).
+
+        ``prefix`` is a path like ``/api``; the empty prefix matches
+        any path. ``host`` is matched against the ``Host`` header
+        without its port; if it isn't specified, ``app`` will handle
+        requests for any host (that doesn't have an app mounted at the
+        same prefix specifically for it).
+
+        Returns ``app`` so this can be used in expressions.
+
+        """
+        prefix = prefix.strip('/')
+        prefix = '/{}'.format(prefix) if prefix else ''
+        if host is not None:
+            host = host.lower()
+        routes = self.routes.setdefault(host, {})
+        if prefix in routes:
+            raise ValueError(
+                'An app is already mounted at "{prefix}" for {host}'
+                .format(prefix=prefix, host=host or 'any host'))
+        if isinstance(app, ARegistry):
+            self._share_components(app)
+        routes[prefix] = app
+        depths = set(self.depths.get(host, ()))
+        depths.add(prefix.count('/'))
+        self.depths[host] = tuple(sorted(depths, reverse=True))
+        return app
+
+    def _share_components(self, app):
+        shared_components = self.shared_components
+        for key in self.shared:
+            if key in shared_components:
+                app.register(key, shared_components[key], replace=True)
+            else:
+                component = app.get(key)
+                if component is not None:
+                    shared_components[key] = component
+
+    def find_app(self, environ):
+        """Find the app mounted for the request in ``environ``.
+
+        Returns a tuple of ``(app, prefix)``. If no app is found,
+        ``(None, None)`` is returned.
+
+        """
+        path = environ.get('PATH_INFO', '')
+        host = environ.get('HTTP_HOST') or environ.get('SERVER_NAME', '')
+        host = host.partition(':')[0].lower()
+        routes = self.routes
+        depths = self.depths
+        for key in (host, None):
+            host_routes = routes.get(key)
+            if host_routes is None:
+                continue
+            for depth in depths[key]:
+                if depth:
+                    # Prefix with ``depth`` segments (with leading slash)
+                    segments = path.split('/', depth + 1)
+                    if len(segments) <= depth:
+                        continue
+                    prefix = '/'.join(segments[:depth + 1])
+                else:
+                    prefix = ''
+                app = host_routes.get(prefix)
+                if app is not None:
+                    return app, prefix
+        return None, None
+
+    def __call__(self, environ, start_response):
+        app, prefix = self.find_app(environ)
+        if app is None:
+            return self.not_found(environ, start_response)
+        if prefix:
+            environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + prefix
+            environ['PATH_INFO'] = environ['PATH_INFO'][len(prefix):]
+        return app(environ, start_response)
+
+    def __repr__(self):
+        return '<Dispatcher {}>'.format(', '.join(
+            '{}{}'.format(host or '*', prefix or '/')
+            for host, routes in self.routes.items() for prefix in routes))
@@ -0,0 +1,210 @@
+"""Fragment caching.
+
+Parts of pages that are the same across requests (navigation, footers,
+sidebars, etc) can be rendered once and cached. To enable fragment
+caching, include this module::
+
+    app.include('tangled.web.fragments')
+
+Fragments are cached via the ``cache_fragment`` helper, which calls
+``render`` only if the fragment isn't already cached::
+
+    nav = request.helpers.cache_fragment('nav', 60, render_nav, tags=['menu'])
+
+It can also be used as a decorator, in which case the decorated
+function is replaced with the rendered fragment::
+
+    @request.helpers.cache_fragment('nav', 60, tags=['menu'])
+    def nav():
+        return render_nav()
+
+Fragments can be tagged with the things they depend on. Invalidating
+a tag invalidates all the fragments tagged with it::
+
+    request.helpers.invalidate_fragments('menu')
+
+Fragment keys are namespaced by app name, so apps can share a backend.
+The backend is set via the ``tangled.app.fragments.backend`` setting;
+the default :class:`MemoryBackend` keeps the most recently used
+fragments in process. Other backends (e.g., memcached or Redis) can be
+used by implementing the :class:`FragmentBackend` interface.
+
+"""
+import time
+import uuid
+
+from tangled.decorators import cached_property
+from tangled.util import load_object
+
+from .abcs import AAppComponent
+from .cache import LRUCache
+
+
+def include(app):
+    app.register(FragmentCache, FragmentCache.from_app(app))
+    app.add_helper(cache_fragment)
+    app.add_helper(invalidate_fragments)
+
+
+def cache_fragment(helpers, key, ttl=None, render=None, tags=()):
+    """Get the fragment cached under ``key``, rendering it if necessary.
+
+    ``ttl`` is the number of seconds to keep the fragment. If it isn't
+    specified, the ``tangled.app.fragments.ttl`` setting is used; if
+    that's not set, the fragment is kept until it's evicted or one of
+    its ``tags`` is invalidated.
+
+    If ``render`` isn't passed, a decorator is returned.
+
+    """
+    cache = helpers.app.get_required(FragmentCache)
+    if render is None:
+        return lambda render: cache.get_or_render(key, render, ttl, tags)
+    return cache.get_or_render(key, render, ttl, tags)
+
+
+def invalidate_fragments(helpers, *tags):
+    """Invalidate fragments tagged with any of ``tags``."""
+    helpers.app.get_required(FragmentCache).invalidate(*tags)
+
+
+class FragmentBackend:
+
+    """Fragment backend interface.
+
+    Backends store (pickleable) values by string key.
+
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def get(self, key):
+        """Get the value stored under ``key`` or ``None``."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove the value stored under ``key``, if any."""
+        raise NotImplementedError
+
+
+class MemoryBackend(FragmentBackend):
+
+    """Keeps the most recently used values in process.
+
+    The number of values is limited by the
+    ``tangled.app.fragments.max_size`` setting.
+
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._cache = LRUCache(app.get_setting('fragments.max_size'))
+
+    def get(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= time.monotonic():
+            return None
+        return value
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else time.monotonic() + ttl
+        self._cache.set(key, (value, expires))
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+
+class FragmentCache(AAppComponent):
+
+    """Caches rendered fragments in a :class:`FragmentBackend`.
+
+    Each tag has a version, which is stored in the backend along with
+    the fragments. A fragment is stored with the versions of its tags
+    at the time it was rendered; when a tag is invalidated, its version
+    changes, so the fragments rendered with the old version are
+    considered stale.
+
+    """
+
+    def __init__(self, app, backend):
+        self.app = app
+        self.backend = backend
+        self.default_ttl = app.get_setting('fragments.ttl')
+
+    @classmethod
+    def from_app(cls, app):
+        backend_factory = load_object(app.get_setting('fragments.backend'))
+        return cls(app, backend_factory(app))
+
+    # The app's name isn't set until after includes are run, so these
+    # are computed when they're first used.
+
+    @cached_property
+    def prefix(self):
+        return '{}:fragment:'.format(self.app.name)
+
+    @cached_property
+    def tag_prefix(self):
+        return '{}:fragment-tag:'.format(self.app.name)
+
+    def get(self, key):
+        """Get the fragment cached under ``key`` or ``None``.
+
+        ``None`` is also returned if any of the fragment's tags have
+        been invalidated since it was cached.
+
+        """
+        entry = self.backend.get(self.prefix + key)
+        if entry is None:
+            return None
+        fragment, versions = entry
+        if versions and versions != self._get_tag_versions(versions, create=False):
+            return None
+        return fragment
+
+    def set(self, key, fragment, ttl=None, tags=()):
+        versions = self._get_tag_versions(tags) if tags else {}
+        self._set(key, fragment, ttl, versions)
+
+    def get_or_render(self, key, render, ttl=None, tags=()):
+        fragment = self.get(key)
+        if fragment is None:
+            # The tag versions are read *before* rendering so that if
+            # a tag is invalidated while the fragment is being rendered,
+            # the fragment is stored with the old version (i.e., stale).
+            versions = self._get_tag_versions(tags) if tags else {}
+            fragment = render()
+            self._set(key, fragment, ttl, versions)
+        return fragment
+
+    def _set(self, key, fragment, ttl, versions):
+        if ttl is None:
+            ttl = self.default_ttl
+        self.backend.set(self.prefix + key, (fragment, versions), ttl)
+
+    def invalidate(self, *tags):
+        backend = self.backend
+        for tag in tags:
+            backend.delete(self.tag_prefix + tag)
+
+    def _get_tag_versions(self, tags, create=True):
+        backend = self.backend
+        versions = {}
+        for tag in tags:
+            tag_key = self.tag_prefix + tag
+            version = backend.get(tag_key)
+            if version is None and create:
+                # Versions only need to be unique (they're never ordered),
+                # so this works across processes without coordination.
+                version = uuid.uuid4().hex
+                backend.set(tag_key, version)
+            versions[tag] = version
+        return versions
@@ -0,0 +1,132 @@
+"""Frozen application mode.
+
+Enable by setting ``tangled.app.freeze = true``. When the application
+is created (after :class:`~tangled.web.events.ApplicationCreated`
+subscribers are called), its registry is compiled into the immutable
+lookup tables of a :class:`FrozenDispatch` and any further registrations
+(or removals) will raise a :class:`~tangled.web.exc.ConfigurationError`.
+
+In frozen mode:
+
+    - Registry lookups are simple dict lookups against flattened tables.
+    - Resources are searched in a precomputed order.
+    - Subscribers are presorted by priority.
+    - The request class (including dynamic request attributes) and the
+      helpers class are built once instead of for every request.
+    - Config fields and representation args are precomputed for each
+      method and content type.
+
+This is intended for production workers that never reconfigure the
+application after it's created.
+
+"""
+from collections import OrderedDict
+from types import MappingProxyType
+
+from . import abcs
+from .const import ALL_HTTP_METHODS
+from .events import Subscriber
+from .resource.config import Field, RepresentationArg
+
+
+class FrozenDispatch:
+
+    """Immutable lookup tables compiled from an application's registry.
+
+    .. note:: This reads the registry's components directly, so it must
+        be created before the application is frozen.
+
+    """
+
+    __slots__ = (
+        'components',
+        'component_lists',
+        'component_dicts',
+        'mounted_resources',
+        'subscribers',
+        'request_factory',
+        'helpers_factory',
+        'config_args',
+    )
+
+    def __init__(self, app):
+        components = {}
+        component_lists = {}
+        component_dicts = {}
+        for key, registered in app._components.items():
+            component_lists[key] = tuple(registered.values())
+            component_dicts[key] = MappingProxyType(OrderedDict(registered))
+            for differentiator, component in registered.items():
+                components[(key, differentiator)] = component
+
+        mounted_resources = component_lists.get(abcs.AMountedResource, ())
+
+        # Event types with subscribers => subscribers sorted by priority
+        subscribers = {}
+        for key, registered in component_lists.items():
+            if registered and all(isinstance(s, Subscriber) for s in registered):
+                subscribers[key] = tuple(sorted(registered, key=Subscriber.sorter))
+
+        request_factory = components[(abcs.ARequest, None)]
+        attrs = component_dicts.get('dynamic_request_attr')
+        if attrs:
+            request_factory = type(request_factory.__name__, (request_factory,), dict(attrs))
+
+        helpers_factory = components.get((abcs.AHelpers, None))
+        if helpers_factory is not None:
+            helpers = dict(component_dicts.get('helper', {}))
+            helpers_factory = type('Helpers', (helpers_factory,), helpers)
+
+        # (method, content type) => (fields, representation args)
+        config_args = {}
+        keys = set((method, '*/*') for method in ALL_HTTP_METHODS)
+        for arg_type in (Field, RepresentationArg):
+            keys.update(d for (k, d) in components if k is arg_type)
+        for method, content_type in keys:
+            config_args[(method, content_type)] = (
+                self._get_config_args(components, Field, method, content_type),
+                self._get_config_args(components, RepresentationArg, method, content_type),
+            )
+
+        set_attr = super().__setattr__
+        set_attr('components', MappingProxyType(components))
+        set_attr('component_lists', MappingProxyType(component_lists))
+        set_attr('component_dicts', MappingProxyType(component_dicts))
+        set_attr('mounted_resources', tuple(reversed(mounted_resources)))
+        set_attr('subscribers', MappingProxyType(subscribers))
+        set_attr('request_factory', request_factory)
+        set_attr('helpers_factory', helpers_factory)
+        set_attr('config_args', MappingProxyType(config_args))
+
+    @staticmethod
+    def _get_config_args(components, arg_type, method, content_type):
+        # Same as Config._get_args() but against the flattened tables
+        all_items = []
+        items = components.get((arg_type, (method, '*/*')))
+        if items:
+            all_items.extend(items.get_all(arg_type, default=()))
+        if content_type != '*/*':
+            items = components.get((arg_type, (method, content_type)))
+            if items:
+                all_items.extend(items.get_all(arg_type, default=()))
+        return tuple(all_items)
+
+    def get_config_args(self, method, content_type):
+        """Get config fields and representation args.
+
+        Returns a tuple of ``(fields, representation args)``. If no args
+        were added specifically for ``content_type``, only the args for
+        ``*/*`` apply.
+
+        """
+        config_args = self.config_args
+        args = config_args.get((method, content_type))
+        if args is None:
+            args = config_args.get((method, '*/*'), ((), ()))
+        return args
+
+    def __setattr__(self, name, value):
+        raise AttributeError("can't set {} on {}".format(name, self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("can't delete {} from {}".format(name, self.__class__.__name__))
@@ -32,13 +32,13 @@ import traceback
 
 from webob.exc import WSGIHTTPException, HTTPInternalServerError
 
-from tangled.util import load_object
+from tangled.util import NOT_SET, load_object
 
-from . import abcs, csrf
+from . import abcs
 from .events import NewRequest, ResourceFound, NewResponse
 from .exc import DebugHTTPInternalServerError
 from .representations import Representation
-from .response import Response
+from .response import Response, StreamingAppIter
 from .resource.exc import BindError
 
 
@@ -155,11 +155,18 @@ def request_finished_handler(app, request, _):
     finished callbacks, they can be logged and displayed as usual.
 
     .. note:: Finished callbacks are not called for static requests.
+        For streamed responses, they're called when the response has
+        been sent (see :class:`.StreamingAppIter`).
 
     """
-    if not getattr(request, 'is_static', False):
-        request._call_finished_callbacks(request.response)
-    return request.response
+    response = request.response
+    if getattr(request, 'is_static', False):
+        return response
+    if isinstance(getattr(response, 'app_iter', None), StreamingAppIter):
+        # Called when the streamed response has been sent
+        return response
+    request._call_finished_callbacks(response)
+    return response
 
 
 def static_files(app, request, next_handler):
@@ -196,6 +203,7 @@ def tweaker(app, request, next_handler):
         if method == 'DELETE':
             # Changing request.method to DELETE makes request.POST
             # inaccessible.
+            from . import csrf
             token = csrf.get_token(request)
             header = csrf.get_header(request)
             if token in request.POST and header not in request.headers:
@@ -214,9 +222,15 @@ def tweaker(app, request, next_handler):
     elif app.settings['tangled.app.set_accept_from_ext']:
         root, ext = os.path.splitext(request.path_info)
         if ext:
-            repr_type = app.get(Representation, ext.lstrip('.'))
-            if repr_type is not None:
-                request.accept = repr_type.content_type
+            cache = app._negotiation_cache
+            cache_key = (Representation, ext)
+            content_type = cache.get(cache_key, NOT_SET)
+            if content_type is NOT_SET:
+                repr_type = app.get(Representation, ext.lstrip('.'))
+                content_type = None if repr_type is None else repr_type.content_type
+                cache.set(cache_key, content_type)
+            if content_type is not None:
+                request.accept = content_type
                 request.path_info = root
 
     return next_handler(app, request)
@@ -236,14 +250,27 @@ def resource_finder(app, request, next_handler):
     If a resource is found but doesn't respond to the request's method,
     a ``405 Method Not Allowed`` response is returned.
 
-    Sets ``request.resource`` and ``request.resource_method``. Notifies
-    :class:`ResourceFound` subscribers.
+    ``HEAD`` requests for resources that don't implement ``HEAD`` are
+    handled by the resource's ``GET`` method (see :func:`main` too).
+
+    Sets ``request.mounted_resource``, ``request.resource``, and
+    ``request.resource_method``. Notifies :class:`ResourceFound`
+    subscribers.
 
     """
-    match = app.find_mounted_resource(request.method, request.path)
+    timings = request.timings
+    start = timings.start()
+    method = request.method
+    match = app.find_mounted_resource(method, request.path)
+
+    if match is None and method == 'HEAD':
+        # Resources that don't implement HEAD handle it via GET
+        match = app.find_mounted_resource('GET', request.path)
+        method = 'GET'
 
     if match is None:
         match = app.find_mounted_resource(request.method, request.path, ignore_method=True)
+        timings.record('routing', start)
         if match is None:
             # No resources mounted at path
             request.abort(404)
@@ -251,19 +278,24 @@ def resource_finder(app, request, next_handler):
         # request method
         request.abort(405)
 
+    timings.record('routing', start)
     mounted_resource, request.urlvars = match
+    request.mounted_resource = mounted_resource
 
     if mounted_resource.add_slash and not request.path_info.endswith('/'):
         request.path_info = '{request.path_info}/'.format_map(locals())
         request.abort(303, location=request.url)
 
     resource = mounted_resource.factory(app, request, mounted_resource.name)
-    method = mounted_resource.method or request.method
+    method = mounted_resource.method or method
 
+    start = timings.start()
     try:
         resource_args = resource.bind(request, method)
     except BindError as exc:
         request.abort(400, str(exc))
+    finally:
+        timings.record('bind', start)
 
     request.resource = resource
     request.resource_method = method
@@ -280,10 +312,18 @@ def resource_finder(app, request, next_handler):
 
 
 def timer(app, request, next_handler):
-    """Log time taken to handle a request."""
-    start_time = time.time()
+    """Log time taken to handle a request.
+
+    .. note:: This is no longer enabled by default. Enabling the
+        ``tangled.app.timing.enabled`` setting provides more detailed
+        timing info (see :mod:`tangled.web.timing`).
+
+    """
+    if not log.isEnabledFor(logging.DEBUG):
+        return next_handler(app, request)
+    start_time = time.perf_counter()
     response = next_handler(app, request)
-    elapsed_time = (time.time() - start_time) * 1000
+    elapsed_time = (time.perf_counter() - start_time) * 1000
     log.debug('Request to {} took {:.2f}ms'.format(request.url, elapsed_time))
     return response
 
@@ -308,20 +348,36 @@ def main(app, request, _):
     If the representation returns a response object as its content, that
     response will be returned without further processing.
 
+    If the resource method returns an iterator (e.g., if it's
+    a generator) and the representation supports streaming, the
+    response body will be streamed from the representation's
+    :meth:`~.Representation.iter_content` (without a ``Content-Length``,
+    so servers will use chunked transfer encoding). Request finished
+    callbacks are called after the body has been sent.
+
+    For ``HEAD`` requests, if the representation can compute the length
+    of its content without generating it (i.e., if its
+    ``content_length`` isn't ``None``), the content won't be generated;
+    only the response headers will be set.
+
     Otherwise, `request.response` will be updated according to the
     representation type (the response's content_type, charset, and body
-    are set from the representation).
+    are set from the representation). Binary representations can return
+    ``bytes`` as their content; it's used as the body as is.
 
     """
+    timings = request.timings
     method = getattr(request.resource, request.resource_method)
     resource_args = getattr(request, 'resource_args', None)
 
+    start = timings.start()
     if resource_args is None:
         data = method()
     else:
         args = request.resource_args.args
         kwargs = request.resource_args.kwargs
         data = method(*args, **kwargs)
+    timings.record('resource', start)
 
     if isinstance(data, Response):
         return data
@@ -331,6 +387,7 @@ def main(app, request, _):
     if 300 <= response.status_code < 400 and data is None:
         return response
 
+    start = timings.start()
     info = request.resource_config
     log.debug(info)
 
@@ -343,12 +400,37 @@ def main(app, request, _):
     kwargs = info.representation_args
     representation = repr_type(app, request, data, **kwargs)
 
-    if isinstance(representation.content, Response):
-        return representation.content
+    if representation.is_stream:
+        response.content_type = representation.content_type
+        response.charset = representation.encoding
+        response.app_iter = StreamingAppIter(
+            request, representation.iter_content(), representation.encoding)
+        response.content_length = None
+        timings.record('representation', start)
+        return response
+
+    if request.method == 'HEAD':
+        content_length = representation.content_length
+        if content_length is not None:
+            response.content_type = representation.content_type
+            response.charset = representation.encoding
+            response.content_length = content_length
+            timings.record('representation', start)
+            return response
+
+    content = representation.content
+
+    if isinstance(content, Response):
+        timings.record('representation', start)
+        return content
 
     response.content_type = representation.content_type
     response.charset = representation.encoding
-    response.text = representation.content
+    if isinstance(content, bytes):
+        response.body = content
+    else:
+        response.text = content
+    timings.record('representation', start)
     return response
 
 
@@ -0,0 +1,328 @@
+"""Request metrics with Prometheus text exposition.
+
+Enable by setting ``tangled.app.metrics.enabled = true``. This will:
+
+    - Add the metrics handler to the handler chain. It records a request
+      counter (by mounted resource name, method, and status) and a
+      request duration histogram (by mounted resource name and method)
+      for every request, including requests that result in errors.
+    - Mount a resource that exposes the metrics in the Prometheus text
+      format at ``tangled.app.metrics.path`` (``/metrics`` by default).
+
+Metrics are accumulated per thread without locking; the per-thread
+stores are only merged when the metrics are collected. When a thread
+exits, its store is merged into an aggregate store.
+
+**Pre-fork servers:**
+
+When ``tangled.app.metrics.shared_dir`` is set, each worker process
+periodically writes a snapshot of its metrics to a file in that
+directory (at most once every ``tangled.app.metrics.flush_interval``
+seconds and when it exits). When metrics are collected, the snapshots
+of all the workers are merged, so any worker can serve the metrics
+resource. Pointing ``shared_dir`` at a memory-backed file system like
+``/dev/shm`` avoids disk I/O.
+
+Snapshots of workers that have exited are retained so that counters
+don't go backwards. Snapshots are keyed by server run (see
+:class:`~tangled.web.snapshots.SnapshotFiles`); snapshots from earlier
+runs are ignored and are removed when
+:meth:`.Application.prepare_for_fork` is called in the master process.
+
+"""
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from webob.exc import WSGIHTTPException
+
+from .abcs import AAppComponent
+from .resource.resource import Resource
+from .response import Response
+from .snapshots import SnapshotFiles, flush_at_exit
+from .timing import perf_counter_ns
+
+
+log = logging.getLogger(__name__)
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+UNMATCHED = '__unmatched__'
+
+
+def include(app):
+    app.register(MetricsRegistry, MetricsRegistry.from_app(app))
+    path = app.get_setting('metrics.path')
+    if path:
+        app.mount_resource('tangled.web.metrics', MetricsResource, path, methods=('GET',))
+
+
+def metrics_handler(app, request, next_handler):
+    """Record request count and duration.
+
+    This wraps the exception handler, so it sees the final response for
+    every request.
+
+    """
+    start = perf_counter_ns()
+    status = 500
+    try:
+        response = next_handler(app, request)
+        status = response.status_code
+        return response
+    except WSGIHTTPException as exc:
+        status = exc.status_code
+        raise
+    finally:
+        elapsed = (perf_counter_ns() - start) / 1000000000
+        mounted_resource = getattr(request, 'mounted_resource', None)
+        name = UNMATCHED if mounted_resource is None else mounted_resource.name
+        app.get_required(MetricsRegistry).observe(name, request.method, status, elapsed)
+
+
+class _ThreadStore:
+
+    # Accumulates metrics for one thread; only the owning thread writes
+    # to a store.
+
+    __slots__ = ('counters', 'histograms')
+
+    def __init__(self):
+        # (name, method, status) => count
+        self.counters = {}
+        # (name, method) => [bucket counts..., +Inf count, sum]
+        self.histograms = {}
+
+
+class MetricsRegistry(AAppComponent):
+
+    """Accumulates request metrics.
+
+    ``buckets`` are the upper bounds of the duration histogram buckets
+    in seconds (the ``+Inf`` bucket is implied).
+
+    """
+
+    def __init__(self, buckets, shared_dir=None, flush_interval=5):
+        self.buckets = tuple(buckets)
+        self.shared_dir = shared_dir
+        self.flush_interval = flush_interval
+        self._snapshots = SnapshotFiles(shared_dir, 'tangled-metrics') if shared_dir else None
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: ref() is not None and ref()._reset())
+        if shared_dir:
+            flush_at_exit(self)
+
+    @classmethod
+    def from_app(cls, app):
+        buckets = app.get_setting('metrics.buckets')
+        buckets = tuple(sorted(float(b) for b in buckets))
+        shared_dir = app.get_setting('metrics.shared_dir')
+        flush_interval = app.get_setting('metrics.flush_interval')
+        return cls(buckets, shared_dir, flush_interval)
+
+    def _reset(self):
+        # Metrics recorded in the parent shouldn't be counted again in
+        # each forked child.
+        self._local = threading.local()
+        self._stores = []
+        # Metrics from threads that have exited
+        self._retired = _ThreadStore()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = 0
+
+    def prepare_for_fork(self):
+        if self._snapshots is not None:
+            self._snapshots.clean()
+
+    def _get_store(self):
+        try:
+            return self._local.store
+        except AttributeError:
+            store = _ThreadStore()
+            with self._lock:
+                self._stores.append(store)
+            self._local.store = store
+            # Thread-per-connection servers create a thread per
+            # connection, so stores are retired when their threads exit
+            # to keep them from piling up.
+            weakref.finalize(threading.current_thread(), _retire_store, weakref.ref(self), store)
+            return store
+
+    def _retire(self, store):
+        retired = self._retired
+        with self._lock:
+            stores = self._stores
+            if not any(s is store for s in stores):
+                return  # Recorded before a fork
+            stores[:] = [s for s in stores if s is not store]
+            _merge_store(retired, store)
+
+    def observe(self, name, method, status, seconds):
+        store = self._get_store()
+
+        key = (name, method, status)
+        counters = store.counters
+        counters[key] = counters.get(key, 0) + 1
+
+        key = (name, method)
+        histogram = store.histograms.get(key)
+        if histogram is None:
+            histogram = [0] * (len(self.buckets) + 2)
+            store.histograms[key] = histogram
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                histogram[i] += 1
+                break
+        else:
+            histogram[-2] += 1
+        histogram[-1] += seconds
+
+        if self.shared_dir and time.monotonic() - self._last_flush > self.flush_interval:
+            self.flush()
+
+    def snapshot(self):
+        """Merge the per-thread stores for this process.
+
+        Returns a dict with ``counters`` and ``histograms`` items. The
+        histograms are *not* cumulative.
+
+        """
+        snapshot = _ThreadStore()
+        with self._lock:
+            _merge_store(snapshot, self._retired)
+            stores = list(self._stores)
+        for store in stores:
+            _merge_store(snapshot, store)
+        return {'counters': snapshot.counters, 'histograms': snapshot.histograms}
+
+    # Multi-process support
+
+    def flush(self):
+        """Write a snapshot of this process's metrics to ``shared_dir``.
+
+        If another thread is already flushing or no metrics have been
+        recorded in this process, this does nothing.
+
+        """
+        if not self._flush_lock.acquire(False):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            snapshot = self.snapshot()
+            if not snapshot['counters']:
+                return
+            self._snapshots.write({
+                'buckets': self.buckets,
+                'counters': [list(k) + [v] for k, v in snapshot['counters'].items()],
+                'histograms': [list(k) + [v] for k, v in snapshot['histograms'].items()],
+            })
+        except OSError:
+            log.exception('Could not write metrics snapshot')
+        finally:
+            self._flush_lock.release()
+
+    def collect(self):
+        """Collect metrics from this process and, if configured, from
+        the snapshots written by other processes.
+
+        """
+        snapshot = self.snapshot()
+        if not self.shared_dir:
+            return snapshot
+        counters = snapshot['counters']
+        histograms = snapshot['histograms']
+        for path, data in self._snapshots.read():
+            if tuple(data['buckets']) != self.buckets:
+                log.warning('Skipping metrics snapshot with different buckets: {}'.format(path))
+                continue
+            for name, method, status, count in data['counters']:
+                key = (name, method, status)
+                counters[key] = counters.get(key, 0) + count
+            for name, method, histogram in data['histograms']:
+                _merge_histogram(histograms, (name, method), histogram)
+        return snapshot
+
+    def exposition(self):
+        """Render metrics in the Prometheus text exposition format."""
+        snapshot = self.collect()
+        out = [
+            '# HELP tangled_requests_total Total number of requests.',
+            '# TYPE tangled_requests_total counter',
+        ]
+        for (name, method, status), count in sorted(snapshot['counters'].items()):
+            labels = _format_labels(resource=name, method=method, status=status)
+            out.append('tangled_requests_total{{{labels}}} {count}'.format_map(locals()))
+        out.extend((
+            '# HELP tangled_request_duration_seconds Request duration in seconds.',
+            '# TYPE tangled_request_duration_seconds histogram',
+        ))
+        bounds = [_format_float(b) for b in self.buckets] + ['+Inf']
+        for (name, method), histogram in sorted(snapshot['histograms'].items()):
+            cumulative = 0
+            for bound, count in zip(bounds, histogram):
+                cumulative += count
+                labels = _format_labels(resource=name, method=method, le=bound)
+                out.append(
+                    'tangled_request_duration_seconds_bucket{{{labels}}} {cumulative}'
+                    .format_map(locals()))
+            labels = _format_labels(resource=name, method=method)
+            total = _format_float(histogram[-1])
+            out.append('tangled_request_duration_seconds_sum{{{labels}}} {total}'
+                       .format_map(locals()))
+            out.append('tangled_request_duration_seconds_count{{{labels}}} {cumulative}'
+                       .format_map(locals()))
+        out.append('')
+        return '\n'.join(out)
+
+
+class MetricsResource(Resource):
+
+    """Exposes metrics in the Prometheus text format."""
+
+    def GET(self):
+        registry = self.app.get_required(MetricsRegistry)
+        response = Response(content_type=CONTENT_TYPE, charset='utf-8')
+        response.text = registry.exposition()
+        return response
+
+
+def _retire_store(ref, store):
+    registry = ref()
+    if registry is not None:
+        registry._retire(store)
+
+
+def _merge_store(target, store):
+    counters = target.counters
+    for key, count in dict(store.counters).items():
+        counters[key] = counters.get(key, 0) + count
+    for key, histogram in dict(store.histograms).items():
+        _merge_histogram(target.histograms, key, list(histogram))
+
+
+def _merge_histogram(histograms, key, histogram):
+    existing = histograms.get(key)
+    if existing is None:
+        histograms[key] = histogram
+    else:
+        for i, value in enumerate(histogram):
+            existing[i] += value
+
+
+def _format_labels(**labels):
+    items = OrderedDict(sorted(labels.items()))
+    return ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for k, v in items.items())
+
+
+def _format_float(value):
+    return repr(float(value))
@@ -0,0 +1,268 @@
+"""Per-request profiling.
+
+Enable by setting ``tangled.app.profiling.enabled = true``. This adds
+the profiling handler to the handler chain. For each request, the
+handler decides whether the request should be profiled:
+
+    - A fraction of requests are sampled according to
+      ``tangled.app.profiling.sample_rate`` (``0.0`` to ``1.0``).
+    - A request can ask to be profiled by sending a signed header (see
+      :func:`sign`). The header name is set via
+      ``tangled.app.profiling.header`` and the signing key via
+      ``tangled.app.profiling.secret``. Signed requests are disabled
+      when no secret is set. Signatures include a timestamp and expire
+      after ``tangled.app.profiling.max_signature_age`` seconds, so
+      a captured header can't be replayed indefinitely.
+
+Requests that aren't selected go straight to the next handler.
+
+Two profilers are available, selected via
+``tangled.app.profiling.profiler``:
+
+    - ``cprofile`` runs the request under :mod:`cProfile`. The capture
+      is stored in the same (marshalled) format as
+      :meth:`cProfile.Profile.dump_stats`, so it can be loaded with
+      :class:`pstats.Stats`. Only one request can be profiled this way
+      at a time (Python 3.12+ doesn't allow concurrent profilers), so
+      requests selected while another request is being profiled are
+      profiled with the sampler instead.
+    - ``sampler`` runs a lightweight stack sampler in a background
+      thread that looks at the request thread's stack every
+      ``tangled.app.profiling.interval`` seconds. The capture is stored
+      in the "collapsed" format used by flame graph tools.
+
+The most recent ``tangled.app.profiling.max_captures`` captures are kept
+in memory, keyed by a generated capture ID, which is sent back in the
+``X-Profile-ID`` response header of profiled requests. The request's
+``X-Request-ID`` header, if present, is recorded with the capture (but
+isn't used as its ID, so clients can't overwrite other captures).
+
+Captures can be listed and downloaded via the resource mounted at
+``tangled.app.profiling.path``. When a secret is set, requests to that
+resource must also be signed; otherwise, it's only available in debug
+mode.
+
+"""
+import collections
+import cProfile
+import hashlib
+import hmac
+import marshal
+import random
+import sys
+import threading
+import time
+import uuid
+
+from tangled.util import constant_time_compare
+
+from .abcs import AAppComponent
+from .resource.resource import Resource
+from .response import Response
+
+
+def include(app):
+    app.register(CaptureStore, CaptureStore.from_app(app))
+    path = app.get_setting('profiling.path')
+    if path:
+        path = path.rstrip('/')
+        app.mount_resource(
+            'tangled.web.profiling', CapturesResource, path + '/', methods=('GET',))
+        app.mount_resource(
+            'tangled.web.profiling.capture', CapturesResource, path + '/<id>', methods=('GET',))
+
+
+def sign(secret, path, timestamp=None):
+    """Get the signature for ``path`` at ``timestamp``.
+
+    A client requests profiling by sending this as the value of the
+    profiling header. The signature has the form ``{timestamp}:{HMAC}``,
+    where the HMAC covers both the timestamp and the path. ``timestamp``
+    defaults to the current time (in whole seconds since the epoch).
+
+    """
+    if timestamp is None:
+        timestamp = int(time.time())
+    message = '{timestamp}:{path}'.format_map(locals()).encode('utf-8')
+    digest = hmac.new(secret.encode('utf-8'), message, hashlib.sha256).hexdigest()
+    return '{timestamp}:{digest}'.format_map(locals())
+
+
+def is_signed(app, request):
+    secret = app.get_setting('profiling.secret')
+    if not secret:
+        return False
+    signature = request.headers.get(app.get_setting('profiling.header'))
+    if not signature:
+        return False
+    timestamp, _, _ = signature.partition(':')
+    try:
+        timestamp = int(timestamp)
+    except ValueError:
+        return False
+    max_age = app.get_setting('profiling.max_signature_age')
+    if abs(time.time() - timestamp) > max_age:
+        return False
+    return constant_time_compare(signature, sign(secret, request.path, timestamp))
+
+
+# Held while a request is being profiled with cProfile
+_cprofile_lock = threading.Lock()
+
+
+def profiling_handler(app, request, next_handler):
+    """Profile sampled or signed requests."""
+    sample_rate = app.get_setting('profiling.sample_rate')
+    sampled = sample_rate and random.random() < sample_rate
+    if not (sampled or is_signed(app, request)):
+        return next_handler(app, request)
+
+    capture_id = uuid.uuid4().hex
+    profiler = app.get_setting('profiling.profiler')
+    store = app.get_required(CaptureStore)
+
+    # Captures are stored even when an exception is raised since failed
+    # requests are often the most interesting.
+    if profiler == 'cprofile' and not _cprofile_lock.acquire(False):
+        profiler = 'sampler'
+    if profiler == 'cprofile':
+        try:
+            profile = cProfile.Profile()
+            try:
+                response = profile.runcall(next_handler, app, request)
+            finally:
+                profile.create_stats()
+                store.add(Capture(
+                    capture_id, request, 'application/octet-stream', 'pstats',
+                    marshal.dumps(profile.stats)))
+        finally:
+            _cprofile_lock.release()
+    elif profiler == 'sampler':
+        sampler = StackSampler(threading.get_ident(), app.get_setting('profiling.interval'))
+        sampler.start()
+        try:
+            response = next_handler(app, request)
+        finally:
+            sampler.stop()
+            store.add(Capture(
+                capture_id, request, 'text/plain', 'collapsed',
+                sampler.collapsed().encode('utf-8')))
+    else:
+        raise ValueError('Unknown profiler: {}'.format(profiler))
+
+    response.headers['X-Profile-ID'] = capture_id
+    return response
+
+
+class Capture:
+
+    def __init__(self, id, request, content_type, format, data):
+        self.id = id
+        self.request_id = request.headers.get('X-Request-ID')
+        self.method = request.method
+        self.path = request.path
+        self.timestamp = time.time()
+        self.content_type = content_type
+        self.format = format
+        self.data = data
+
+    def info(self):
+        return {
+            'id': self.id,
+            'request_id': self.request_id,
+            'method': self.method,
+            'path': self.path,
+            'timestamp': self.timestamp,
+            'format': self.format,
+            'size': len(self.data),
+        }
+
+
+class CaptureStore(AAppComponent):
+
+    """Keeps the ``max_captures`` most recent captures."""
+
+    def __init__(self, max_captures):
+        self.max_captures = max_captures
+        self._captures = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_app(cls, app):
+        return cls(app.get_setting('profiling.max_captures'))
+
+    def add(self, capture):
+        with self._lock:
+            self._captures.pop(capture.id, None)
+            self._captures[capture.id] = capture
+            while len(self._captures) > self.max_captures:
+                self._captures.popitem(last=False)
+
+    def get(self, id):
+        return self._captures.get(id)
+
+    def all(self):
+        with self._lock:
+            return list(self._captures.values())
+
+
+class StackSampler:
+
+    """Periodically samples the stack of the specified thread."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = collections.Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('{}:{}'.format(code.co_filename, code.co_name))
+                frame = frame.f_back
+            self.counts[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        """Get samples in the collapsed stack format."""
+        return ''.join(
+            '{} {}\n'.format(stack, count) for stack, count in sorted(self.counts.items()))
+
+
+class CapturesResource(Resource):
+
+    """List captures or download a capture."""
+
+    def GET(self, id=None):
+        app = self.app
+        request = self.request
+        if app.get_setting('profiling.secret'):
+            if not is_signed(app, request):
+                request.abort(403)
+        elif not app.debug:
+            request.abort(404)
+        store = app.get_required(CaptureStore)
+        if id is None:
+            return {'captures': [capture.info() for capture in store.all()]}
+        capture = store.get(id)
+        if capture is None:
+            request.abort(404)
+        extension = 'pstats' if capture.format == 'pstats' else 'txt'
+        response = Response(content_type=capture.content_type, body=capture.data)
+        # The capture's ID is generated (hex), so it's safe to use as is
+        response.content_disposition = 'attachment; filename="{}.{}"'.format(
+            capture.id, extension)
+        return response
@@ -0,0 +1,55 @@
+"""Dependency injection for resource methods.
+
+Providers are added for types via :meth:`.Application.add_provider`::
+
+    app.add_provider(Session, lambda app, request: app.make_session())
+    app.add_provider(User, 'myapp.auth:get_current_user')
+
+Resource method parameters annotated with a provided type are passed
+the value from the type's provider instead of being bound from the
+request (so clients can't override them)::
+
+    class Items(Resource):
+
+        def GET(self, session: Session, user: User, page: int = 1):
+            ...
+
+Providers are called with the app and request as args and are scoped:
+
+    - ``'app'``: The value is created once per app (``request`` is
+      ``None``).
+    - ``'request'``: The value is created once per request and shared
+      by everything that's injected with it during that request.
+    - ``'call'``: The value is created each time it's injected.
+
+Which parameters are injected is determined once per resource class and
+method (see :meth:`.Resource.bind`), so injection only costs a provider
+call (or a dict lookup) per parameter.
+
+"""
+import collections
+
+
+SCOPES = ('app', 'request', 'call')
+
+
+Provider = collections.namedtuple('Provider', 'type factory scope')
+
+
+def provide(provider, app, request):
+    """Get the value for ``provider`` according to its scope."""
+    scope = provider.scope
+    if scope == 'call':
+        return provider.factory(app, request)
+    key = provider.type
+    if scope == 'app':
+        values = app._provided
+        request = None
+    else:
+        values = request._provided
+    try:
+        return values[key]
+    except KeyError:
+        # When app scoped values are created concurrently, the first
+        # one stored wins.
+        return values.setdefault(key, provider.factory(app, request))
@@ -1,10 +1,15 @@
+import csv
 import datetime
+import io
 import json
+import struct
 from abc import ABCMeta, abstractmethod
-from collections import Mapping
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 
 from .abcs import AResponse
 from .events import TemplateContextCreated
+from .sse import EventStream, format_event
+from .templates import TemplateRegistry
 
 
 class Representation(metaclass=ABCMeta):
@@ -12,17 +17,51 @@ class Representation(metaclass=ABCMeta):
     encoding = 'utf-8'
     quality = 0.5
 
+    #: Representations that can compute the length of their content
+    #: (in bytes) without generating it should set this. It's used to
+    #: respond to ``HEAD`` requests without generating the content.
+    content_length = None
+
+    #: Representations that can generate their content incrementally
+    #: from an iterator (e.g., a generator returned from a resource
+    #: method) should set this and implement :meth:`iter_content`.
+    streaming = False
+
+    #: Whether the representation is registered when an app is created.
+    #: Others can be registered via
+    #: :meth:`.Application.register_representation_type`. Note that
+    #: registering a representation makes its :attr:`key` a recognized
+    #: path extension (see ``tangled.app.set_accept_from_ext``).
+    register_by_default = True
+
     def __init__(self, app, request, data, encoding=None):
         self.app = app
         self.request = request
         self.data = data
         if encoding is not None:
             self.encoding = encoding
+        if self.is_stream:
+            return
         if not isinstance(data, self.data_type):
             raise TypeError(
                 'Got {}; expected {}'
                 .format(data.__class__, self.data_type))
 
+    @property
+    def is_stream(self):
+        """Whether the content should be streamed."""
+        return self.streaming and isinstance(self.data, Iterator)
+
+    def iter_content(self):
+        """Generate the content in chunks from an iterator of data.
+
+        Chunks can be strings (which will be encoded incrementally) or
+        bytes. This is used instead of :attr:`content` when
+        :attr:`is_stream` is set.
+
+        """
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def key(self):
@@ -60,38 +99,61 @@ class StringRepresentation(Representation):
     key = 'string'
     data_type = object
     content_type = 'text/plain'
+    streaming = True
 
     @property
     def content(self):
         return str(self.data)
 
+    def iter_content(self):
+        for chunk in self.data:
+            yield chunk if isinstance(chunk, (str, bytes)) else str(chunk)
+
 
 class HTMLRepresentation(Representation):
 
     key = 'html'
     content_type = 'text/html'
     data_type = object
+    streaming = True
 
     @property
     def content(self):
         return str(self.data)
 
+    def iter_content(self):
+        for chunk in self.data:
+            yield chunk if isinstance(chunk, (str, bytes)) else str(chunk)
+
 
 class JSONRepresentation(Representation):
 
     key = 'json'
     content_type = 'application/json'
     data_type = Mapping
+    streaming = True
 
     @property
     def content(self):
         # TODO: Prepend 'while(1);' (if set)?
+        return self.dumps(self.data)
+
+    def iter_content(self):
+        """Generate a JSON array from an iterator of items."""
+        dumps = self.dumps
+        separator = '['
+        for item in self.data:
+            yield separator + dumps(item)
+            separator = ','
+        yield '[]' if separator == '[' else ']'
+
+    def dumps(self, obj):
         encoder_cls = self.app.get_setting('representation.json.encoder')
         default = self.app.get_setting('representation.json.encoder.default')
         if encoder_cls is not None or default is not None:
-            return json.dumps(self.data, cls=encoder_cls, default=default)
+            return json.dumps(obj, cls=encoder_cls, default=default)
         else:
-            return json.dumps(self.data, default=self.default)
+            return json.dumps(obj, default=self.default)
 
     @staticmethod
     def default(o):
@@ -102,6 +164,258 @@ class JSONRepresentation(Representation):
         raise TypeError('{!r} is not JSON serializable'.format(o))
 
 
+class CSVRepresentation(Representation):
+
+    """Tabular data as CSV.
+
+    The data can be any iterable of rows, where rows are either mappings
+    or sequences. When the data is an iterator (e.g., if the resource
+    method is a generator), the CSV is streamed.
+
+    These args can be passed via ``@config('text/csv', ...)``:
+
+        - ``columns``: Column names. For mapping rows, this selects the
+          columns to include (other keys are ignored); if not specified,
+          the keys of the first row are used. For sequence rows, these
+          are only used for the header.
+        - ``dialect``: Name of a :mod:`csv` dialect (``'excel'`` by
+          default).
+        - ``header``: Whether to write a header row (if ``columns`` are
+          known).
+        - ``flush_rows``: Number of rows that are written to the
+          in-memory buffer before it's flushed (when streaming).
+
+    """
+
+    key = 'csv'
+    content_type = 'text/csv'
+    data_type = Iterable
+    streaming = True
+
+    def __init__(self, app, request, data, encoding=None, columns=None, dialect='excel',
+                 header=True, flush_rows=100):
+        if isinstance(data, (str, bytes, Mapping)):
+            raise TypeError('Got {}; expected an iterable of rows'.format(data.__class__))
+        super().__init__(app, request, data, encoding)
+        self.columns = columns
+        self.dialect = dialect
+        self.header = header
+        self.flush_rows = flush_rows
+
+    @property
+    def content(self):
+        return ''.join(self.iter_content())
+
+    def iter_content(self):
+        rows = iter(self.data)
+        first_row = next(rows, None)
+        if first_row is None:
+            if self.header and self.columns:
+                yield self._format_row(self.columns)
+            return
+
+        buffer = io.StringIO()
+        columns = self.columns
+
+        if isinstance(first_row, Mapping):
+            if columns is None:
+                columns = list(first_row)
+            writer = csv.DictWriter(
+                buffer, columns, dialect=self.dialect, extrasaction='ignore')
+            write_row = writer.writerow
+        else:
+            write_row = csv.writer(buffer, dialect=self.dialect).writerow
+
+        if self.header and columns:
+            csv.writer(buffer, dialect=self.dialect).writerow(columns)
+
+        flush_rows = self.flush_rows
+        write_row(first_row)
+        count = 1
+        for row in rows:
+            write_row(row)
+            count += 1
+            if count == flush_rows:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                count = 0
+
+        yield buffer.getvalue()
+
+    def _format_row(self, row):
+        buffer = io.StringIO()
+        csv.writer(buffer, dialect=self.dialect).writerow(row)
+        return buffer.getvalue()
+
+
+class BinaryRepresentation(Representation):
+
+    """Binary data.
+
+    The data can be any object that supports the buffer protocol (e.g.,
+    ``bytes``, ``bytearray``, ``memoryview``, or ``array.array``).
+    ``bytes`` are used as the response body as is. Other types are
+    converted to ``bytes`` (WSGI requires ``bytes``), which copies the
+    data once. When the data is an iterator of such objects, it's
+    streamed.
+
+    Subclasses can set :attr:`content_type` (and :attr:`key`) for
+    specific binary formats.
+
+    This isn't registered by default (so paths ending with ``.binary``
+    aren't treated as requests for this representation). To use it::
+
+        app.register_representation_type(BinaryRepresentation)
+
+    """
+
+    key = 'binary'
+    content_type = 'application/octet-stream'
+    encoding = None
+    data_type = object
+    streaming = True
+    register_by_default = False
+
+    def __init__(self, app, request, data, encoding=None):
+        super().__init__(app, request, data, encoding)
+        if not self.is_stream:
+            self.check_data()
+
+    def check_data(self):
+        try:
+            memoryview(self.data)
+        except TypeError:
+            raise TypeError(
+                'Got {}; expected a bytes-like object'.format(self.data.__class__)) from None
+
+    @property
+    def content_length(self):
+        if self.is_stream:
+            return None
+        return memoryview(self.data).nbytes
+
+    @property
+    def content(self):
+        return as_bytes(self.data)
+
+    def iter_content(self):
+        for chunk in self.data:
+            yield as_bytes(chunk)
+
+
+class PackedRecordsRepresentation(BinaryRepresentation):
+
+    """A stream of length-prefixed binary records.
+
+    The data is an iterable of bytes-like records. Each record is
+    written as its length (a 4 byte unsigned big-endian integer)
+    followed by its bytes. Use :func:`unpack_records` to read records
+    from the content.
+
+    Like :class:`BinaryRepresentation`, this isn't registered by
+    default.
+
+    """
+
+    key = 'records'
+    content_type = 'application/x-length-prefixed-records'
+
+    def check_data(self):
+        if not isinstance(self.data, Iterable) or isinstance(self.data, (bytes, bytearray)):
+            raise TypeError(
+                'Got {}; expected an iterable of records'.format(self.data.__class__))
+
+    @property
+    def content_length(self):
+        data = self.data
+        if not isinstance(data, Sequence):
+            return None
+        return sum(RECORD_LENGTH.size + memoryview(record).nbytes for record in data)
+
+    @property
+    def content(self):
+        return b''.join(self.iter_content())
+
+    def iter_content(self):
+        pack_length = RECORD_LENGTH.pack
+        for record in self.data:
+            record = as_bytes(record)
+            yield pack_length(len(record)) + record
+
+
+RECORD_LENGTH = struct.Struct('>I')
+
+
+def as_bytes(data):
+    """Get ``bytes`` from a bytes-like object (without copying bytes)."""
+    if isinstance(data, bytes):
+        return data
+    return memoryview(data).tobytes()
+
+
+def unpack_records(data):
+    """Get records from :class:`PackedRecordsRepresentation` content.
+
+    Records are returned as :class:`memoryview` slices of ``data``, so
+    they're not copied.
+
+    """
+    view = memoryview(data)
+    size = RECORD_LENGTH.size
+    offset = 0
+    end = len(view)
+    while offset < end:
+        if end - offset < size:
+            raise ValueError('Truncated record length at offset {}'.format(offset))
+        length, = RECORD_LENGTH.unpack_from(view, offset)
+        offset += size
+        if end - offset < length:
+            raise ValueError('Truncated record at offset {}'.format(offset))
+        yield view[offset:offset + length]
+        offset += length
+
+
+class EventStreamRepresentation(Representation):
+
+    """Server-sent events (see :mod:`tangled.web.sse`).
+
+    The data is typically an :class:`~tangled.web.sse.EventStream` or an
+    iterator of events, which are streamed. A list of events is sent all
+    at once.
+
+    This isn't registered by default; it's registered by including
+    :mod:`tangled.web.sse`.
+
+    """
+
+    key = 'event_stream'
+    content_type = 'text/event-stream'
+    data_type = Iterable
+    streaming = True
+    register_by_default = False
+
+    def __init__(self, app, request, data, encoding=None):
+        super().__init__(app, request, data, encoding)
+        if request is not None:
+            response = request.response
+            response.cache_control = 'no-cache'
+            # Disable response buffering in nginx
+            response.headers['X-Accel-Buffering'] = 'no'
+
+    @property
+    def is_stream(self):
+        return isinstance(self.data, (EventStream, Iterator))
+
+    @property
+    def content(self):
+        return ''.join(self.iter_content())
+
+    def iter_content(self):
+        for event in self.data:
+            yield format_event(event)
+
+
 class TemplateMixin:
 
     data_type = Mapping
@@ -119,3 +433,16 @@ class TemplateMixin:
         self.app.notify_subscribers(
             TemplateContextCreated, self.app, self.request, context)
         return context
+
+    def render(self, template, **extra):
+        """Render ``template`` with the template context.
+
+        The template is rendered by the engine added for this
+        representation's content type via
+        :meth:`.Application.add_template_engine`. The compiled template
+        is cached by the app's :class:`~.templates.TemplateRegistry`.
+
+        """
+        registry = self.app.get_required(TemplateRegistry)
+        context = self.template_context(**extra)
+        return registry.render(template, context, self.content_type)
@@ -1,5 +1,6 @@
 import logging
 import posixpath
+import sys
 from urllib.parse import quote, quote_plus, urlencode, urlparse
 
 from webob import BaseRequest
@@ -11,6 +12,7 @@ from .abcs import AHelpers, AMountedResource, ARequest, AResponse
 from .exc import format_exc
 from .resource.config import Config
 from .static import RemoteDirectory
+from .timing import NULL_TIMINGS
 
 
 log = logging.getLogger(__name__)
@@ -62,6 +64,24 @@ class Request(ARequest, BaseRequest):
         """
         return self.app.get_setting(*args, **kwargs)
 
+    @cached_property
+    def timings(self):
+        """Timings recorded while handling this request.
+
+        When timing is disabled (the default), this is a null object
+        that doesn't record anything. See :mod:`tangled.web.timing`.
+
+        """
+        factory = self.app._timings_factory
+        if factory is None:
+            return NULL_TIMINGS
+        return factory()
+
+    @cached_property
+    def _provided(self):
+        # Request scoped provider values by type (see tangled.web.providers)
+        return {}
+
     @cached_property
     def helpers(self):
         """Get helpers for this request.
@@ -71,6 +91,9 @@ class Request(ARequest, BaseRequest):
         accessible as methods of this instance.
 
         """
+        frozen = self.app._frozen
+        if frozen is not None and frozen.helpers_factory is not None:
+            return frozen.helpers_factory(self.app, self)
         helpers_factory = self.app.get_required(AHelpers)
         helpers = self.app.get_all('helper', default={}, as_dict=True)
         return type('Helpers', (helpers_factory,), helpers)(self.app, self)
@@ -112,7 +135,7 @@ class Request(ARequest, BaseRequest):
                 content_type = info.content_type
             else:
                 content_type = 'text/html'
-            args['status'] = STATUS_MAP[content_type][self.method]
+            args['status'] = STATUS_MAP[content_type][self.config_method]
         if info.location:
             location = info.location
             if location == 'REFERER':
@@ -139,6 +162,33 @@ class Request(ARequest, BaseRequest):
         for name, value in kwargs.items():
             setattr(response, name, value)
 
+    @property
+    def last_event_id(self):
+        """ID of the last server-sent event received by the client.
+
+        This is sent by clients when they reconnect to an event stream
+        (see :mod:`tangled.web.sse`). It's ``None`` if the client didn't
+        send it.
+
+        """
+        return self.headers.get('Last-Event-ID')
+
+    @property
+    def config_method(self):
+        """Request method used to look up config for the resource.
+
+        This is the same as :attr:`method` except for ``HEAD`` requests
+        that are handled by the resource's ``GET`` method (when the
+        resource doesn't implement ``HEAD``). In that case, it's
+        ``GET`` so that the response has the same status and headers as
+        it would for a ``GET`` request.
+
+        """
+        method = self.method
+        if method == 'HEAD' and getattr(self, 'resource_method', None) == 'GET':
+            return 'GET'
+        return method
+
     @cached_property
     def response_content_type(self):
         """Get the content type to use for the response.
@@ -149,21 +199,35 @@ class Request(ARequest, BaseRequest):
         types or of there's no best match, the default content type will
         be used.
 
+        The result is cached by resource class, resource method, request
+        method, and ``Accept`` header (the size of the cache is set via
+        ``tangled.app.negotiation_cache.max_size``).
+
         .. note:: This can't be safely accessed until after the resource
                   has been found and set for this request.
 
         """
         app = self.app
         resource = self.resource
-        method = self.method
+        method = self.config_method
         resource_method = self.resource_method
+
+        cache = app._negotiation_cache
+        cache_key = (type(resource), resource_method, method, self.environ.get('HTTP_ACCEPT'))
+        chosen_content_type = cache.get(cache_key)
+        if chosen_content_type is not None:
+            return chosen_content_type
+
+        timings = self.timings
         content_types = []
 
         for content_type, quality in app.get_all('content_type'):
             args = (app, resource, method, content_type, resource_method)
             config_kwargs = Config.get_resource_args(*args)
             if config_kwargs:
+                start = timings.start()
                 resource_config = Config.for_resource(*args)
+                timings.record('config', start)
                 resource_quality = resource_config.quality
                 quality = resource_quality if resource_quality is not None else quality
                 content_types.append((content_type, quality))
@@ -176,6 +240,7 @@ class Request(ARequest, BaseRequest):
         if not chosen_content_type:
             chosen_content_type = self.get_setting('default_content_type')
 
+        cache.set(cache_key, chosen_content_type)
         return chosen_content_type
 
     @cached_property('response_content_type')
@@ -186,9 +251,14 @@ class Request(ARequest, BaseRequest):
                   has been found and set for this request.
 
         """
-        return Config.for_resource(
-            self.app, self.resource, self.method, self.response_content_type,
+        response_content_type = self.response_content_type
+        timings = self.timings
+        start = timings.start()
+        config = Config.for_resource(
+            self.app, self.resource, self.config_method, response_content_type,
             self.resource_method)
+        timings.record('config', start)
+        return config
 
     # URL generators
 
@@ -207,14 +277,8 @@ class Request(ARequest, BaseRequest):
         all special characters will be quoted).
 
         """
-        path = path.lstrip('/')
-        if _fully_qualified:
-            base = self.application_url
-        else:
-            base = self.script_name
-            if not base.startswith('/'):
-                base = '/' + base
-        url = posixpath.join(base, path)
+        base_url, base_path = self._url_bases
+        url = (base_url if _fully_qualified else base_path) + path.lstrip('/')
         if query is not None:
             url += self.make_query_string(query)
         if fragment is not None:
@@ -257,14 +321,38 @@ class Request(ARequest, BaseRequest):
                 errors=errors)
         return '?' + query
 
+    @cached_property
+    def _url_bases(self):
+        # The application URL and SCRIPT_NAME with trailing slashes.
+        # WebOb computes application_url from several environ values on
+        # each access. Requests to the same host (the usual case) share
+        # the same interned strings via the app's cache.
+        environ = self.environ
+        key = (
+            environ.get('wsgi.url_scheme'),
+            environ.get('HTTP_HOST'),
+            environ.get('SERVER_NAME'),
+            environ.get('SERVER_PORT'),
+            environ.get('SCRIPT_NAME', ''),
+        )
+        cache = self.app._url_base_cache
+        bases = cache.get(key)
+        if bases is None:
+            base_url = self.application_url.rstrip('/') + '/'
+            script_name = self.script_name.strip('/')
+            base_path = '/{}/'.format(script_name) if script_name else '/'
+            bases = (sys.intern(base_url), sys.intern(base_path))
+            cache.set(key, bases)
+        return bases
+
+    def _get_mounted_resource(self, resource):
+        name = resource if isinstance(resource, str) else resource.name
+        return self.app.get(AMountedResource, name)
+
     def resource_url(self, resource, urlvars=None, **kwargs):
         """Generate a URL for a resource."""
-        if isinstance(resource, str):
-            name = resource
-        else:
-            name = resource.name
-        mounted_resource = self.app.get(AMountedResource, name)
-        path = mounted_resource.format_path(**(urlvars or {}))
+        mounted_resource = self._get_mounted_resource(resource)
+        path = mounted_resource.build_path(urlvars or {})
         return self.make_url(path, **kwargs)
 
     def resource_path(self, resource, urlvars=None, **kwargs):
@@ -272,6 +360,28 @@ class Request(ARequest, BaseRequest):
         return self.resource_url(
             resource, urlvars, _fully_qualified=False, **kwargs)
 
+    def resource_urls(self, resource, urlvars_list, **kwargs):
+        """Generate URLs for a resource, one per dict of URL vars.
+
+        This is more efficient than calling :meth:`resource_url`
+        repeatedly (e.g., when generating links for a list of items)
+        since the mounted resource is only looked up once. ``kwargs``
+        (``query`` and/or ``fragment``) apply to all the URLs.
+
+        """
+        build_path = self._get_mounted_resource(resource).build_path
+        make_url = self.make_url
+        return [make_url(build_path(urlvars), **kwargs) for urlvars in urlvars_list]
+
+    def resource_paths(self, resource, urlvars_list, **kwargs):
+        """Generate URL paths (with SCRIPT_NAME) for a resource.
+
+        See :meth:`resource_urls`.
+
+        """
+        return self.resource_urls(
+            resource, urlvars_list, _fully_qualified=False, **kwargs)
+
     def static_url(self, path, query=None, **kwargs):
         """Generate a static URL from ``path``.
 
@@ -85,8 +85,12 @@ class Config:
                     all_items.extend(items.values())
             return all_items
 
-        _fields = _get_args(Field)
-        _args = _get_args(RepresentationArg)
+        frozen = app._frozen
+        if frozen is not None:
+            _fields, _args = frozen.get_config_args(request_method, content_type)
+        else:
+            _fields = _get_args(Field)
+            _args = _get_args(RepresentationArg)
 
         self._field_names = set(f.name for f in _fields)
         self._arg_names = set(a.name for a in _args)
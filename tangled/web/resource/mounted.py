@@ -1,12 +1,47 @@
 import collections
 import re
+from urllib.parse import quote
+
+from tangled.util import load_object
 
 
 MountedResourceMatch = collections.namedtuple('MountedResourceMatch', 'mounted_resource urlvars')
 
 
+# Characters allowed in a path segment (RFC 3986 pchar)
+SEGMENT_SAFE = "!$&'()*+,;=:@~"
+
+_segment_needs_quoting = re.compile(r"[^\w.~!$&'()*+,;=:@-]", re.ASCII).search
+
+
+def quote_segment(value):
+    """Quote ``value`` for use in a URL path segment.
+
+    Values that don't contain any special characters (the usual case)
+    are returned as is.
+
+    """
+    value = str(value)
+    if _segment_needs_quoting(value) is None:
+        return value
+    return quote(value, safe=SEGMENT_SAFE)
+
+
 class MountedResource:
 
+    """A resource mounted at a path.
+
+    ``factory`` may be passed as an object path like
+    ``'package.module:factory'``; it won't be loaded until it's first
+    needed (e.g., when a request matches the resource's path or the
+    application is frozen). The path must be absolute
+    (:meth:`.Application.mount_resource` resolves relative paths).
+
+    Likewise, if ``methods`` aren't specified, the methods the resource
+    responds to won't be determined until they're first needed.
+
+    """
+
     urlvar_regex = r'<(?P<identifier>[^\d\W]\w*)>'
 
     def __init__(self, app, name, factory, path, methods=(), method=None, add_slash=False):
@@ -24,23 +59,25 @@ class MountedResource:
             path = '{path}/'.format_map(locals())
 
         if not methods:
-            resource = factory(app, None, name)
-            methods = resource.allowed_methods
+            methods = None  # Determined from factory when needed
         elif isinstance(methods, str):
-            methods = (methods,)
+            methods = {methods}
         else:
-            methods = tuple(methods)
+            methods = set(methods)
 
+        self.app = app
         self.name = name
-        self.factory = factory
+        self._factory = factory
         self.path = path  # normalized path
-        self.methods = set(methods)
+        self._methods = methods
         self.method = method
         self.add_slash = add_slash
 
         urlvars = []
         path_regex = ['^']
         format_string = []
+        path_parts = []
+        urlvar_positions = []
         i = 0
 
         for match in re.finditer(self.urlvar_regex, path):
@@ -60,16 +97,20 @@ class MountedResource:
                 before_match = path[i:start]
                 path_regex.append(before_match)
                 format_string.append(before_match)
+                path_parts.append(before_match)
 
             i = end
 
             path_regex.append('(?P<{identifier}>[^/]+)'.format_map(locals()))
             format_string.extend(('{', identifier, '}'))
+            urlvar_positions.append((len(path_parts), identifier))
+            path_parts.append(None)
 
         if i != len(path):
             remainder = path[i:]
             path_regex.append(remainder)
             format_string.append(remainder)
+            path_parts.append(remainder)
 
         path_regex = ''.join(path_regex)
         format_string = ''.join(format_string)
@@ -84,13 +125,59 @@ class MountedResource:
         self.path_regex = path_regex
         self.format_string = format_string
 
+        # Precomputed for build_path(): the literal parts of the path
+        # with placeholders for URL vars and the positions of the vars.
+        self._path_parts = path_parts
+        self._urlvar_positions = tuple(urlvar_positions)
+        self._urlvar_set = frozenset(urlvars)
+
+    @property
+    def factory(self):
+        factory = self._factory
+        if isinstance(factory, str):
+            factory = load_object(factory)
+            self._factory = factory
+        return factory
+
+    @property
+    def methods(self):
+        methods = self._methods
+        if methods is None:
+            factory = self.factory
+            get_allowed_methods = getattr(factory, 'get_allowed_methods', None)
+            if get_allowed_methods is not None:
+                methods = get_allowed_methods()
+            if methods is None:
+                methods = factory(self.app, None, self.name).allowed_methods
+            methods = set(methods)
+            self._methods = methods
+        return methods
+
+    def load(self):
+        """Load the factory and determine methods if necessary."""
+        self.factory
+        self.methods
+        return self
+
     def format_path(self, **args):
         """Format the resource path with the specified args."""
-        for k, v in args.items():
-            if k not in self.urlvars:
-                raise ValueError('Unknown URL var: {}'.format(k))
-            # TODO: Check that args are valid
-        return self.format_string.format(**args)
+        return self.build_path(args)
+
+    def build_path(self, urlvars):
+        """Build the resource path from a dict of URL vars.
+
+        URL var values are quoted for use in a path segment.
+
+        """
+        if not self._urlvar_set.issuperset(urlvars):
+            unknown = sorted(set(urlvars) - self._urlvar_set)
+            raise ValueError('Unknown URL var: {}'.format(', '.join(unknown)))
+        if not self._urlvar_positions:
+            return self.path
+        parts = self._path_parts[:]
+        for i, name in self._urlvar_positions:
+            parts[i] = quote_segment(urlvars[name])
+        return ''.join(parts)
 
     def __repr__(self):
         return (
@@ -1,16 +1,20 @@
-from inspect import ismethod, signature, Parameter
+from collections import namedtuple
+from inspect import getattr_static, isfunction, ismethod, signature, BoundArguments, Parameter
 from urllib.parse import unquote, unquote_plus
 
 from webob.exc import HTTPMethodNotAllowed
 
 from tangled.decorators import cached_property
 from tangled.util import as_bool
-from tangled.web import csrf
+from tangled.web.providers import Provider, provide
 from tangled.web.response import Response
 
 from .exc import BindError
 
 
+BindPlan = namedtuple('BindPlan', 'signature bind_signature injected')
+
+
 class Resource:
 
     """Base resource class.
@@ -50,6 +54,10 @@ class Resource:
         keyword arguments (it's an instance of
         :class:`inspect.BoundArguments`).
 
+        Parameters annotated with a type that has a provider (see
+        :meth:`.Application.add_provider`) are injected instead of being
+        bound from the request.
+
         """
         def add_args_from(data, source, *, exclude=(), decoder=None):
             added_args = {}
@@ -70,19 +78,25 @@ class Resource:
         add_args_from(request.GET, 'GET', decoder=unquote_plus)
         if request.content_type == 'application/json':
             add_args_from(request.json, 'JSON')
-        add_args_from(
-            request.POST, 'POST', exclude=[csrf.get_token(request)],
-            decoder=unquote)
+        if request.POST:
+            from tangled.web import csrf
+            add_args_from(
+                request.POST, 'POST', exclude=[csrf.get_token(request)],
+                decoder=unquote)
 
         if messages:
             raise BindError(self, request, method, ', '.join(messages))
 
+        plan = self._get_bind_plan(method)
         method = getattr(self, method)
-        method_signature = signature(method)
-        parameters = method_signature.parameters
+        parameters = plan.signature.parameters
+
+        # Injected args can't be passed by clients
+        for name, _ in plan.injected:
+            args.pop(name, None)
 
         try:
-            bound_args = method_signature.bind(**args)
+            bound_args = plan.bind_signature.bind(**args)
         except TypeError as exc:
             raise BindError(self, request, method, exc)
 
@@ -103,8 +117,44 @@ class Resource:
                 raise BindError(self, request, method, exc)
             bound_args.arguments[name] = value
 
+        if plan.injected:
+            app = self.app
+            arguments = bound_args.arguments
+            for name, provider in plan.injected:
+                arguments[name] = provide(provider, app, request)
+            bound_args = BoundArguments(plan.signature, arguments)
+
         return bound_args
 
+    def _get_bind_plan(self, method_name):
+        # The method's signature and the parameters that are injected
+        # are determined once per app, resource class, and method.
+        plans = self.app._bind_plans
+        key = (self.__class__, method_name)
+        plan = plans.get(key)
+        if plan is None:
+            method_signature = signature(getattr(self, method_name))
+            bind_parameters = []
+            injected = []
+            for parameter in method_signature.parameters.values():
+                provider = self._get_provider(parameter.annotation)
+                if provider is None:
+                    bind_parameters.append(parameter)
+                else:
+                    injected.append((parameter.name, provider))
+            bind_signature = method_signature.replace(parameters=bind_parameters)
+            plan = BindPlan(method_signature, bind_signature, tuple(injected))
+            plans[key] = plan
+        return plan
+
+    def _get_provider(self, annotation):
+        if annotation is Parameter.empty:
+            return None
+        try:
+            return self.app.get(Provider, annotation)
+        except TypeError:  # Unhashable annotation
+            return None
+
     def url(self, urlvars, **kwargs):
         """Generate a fully qualified URL for this resource.
 
@@ -129,11 +179,47 @@ class Resource:
 
     @cached_property
     def allowed_methods(self):
-        candidates = (
-            name for name in dir(self)
-            if not name.startswith('_') and name.isupper() and ismethod(getattr(self, name))
-        )
-        allowed_methods = tuple(name for name in candidates if self.allows_method(name))
+        allowed_methods = self.get_allowed_methods()
+        if allowed_methods is None:
+            candidates = (
+                name for name in dir(self)
+                if not name.startswith('_') and name.isupper() and ismethod(getattr(self, name))
+            )
+            allowed_methods = tuple(name for name in candidates if self.allows_method(name))
+        return allowed_methods
+
+    @classmethod
+    def get_allowed_methods(cls):
+        """Get the methods implemented by this resource class.
+
+        This is computed once per class (it's cached on the class) so
+        that resources don't need to be instantiated to find out which
+        methods they allow (e.g., when mounting them).
+
+        If the class overrides :meth:`allows_method`, ``None`` is
+        returned, since the allowed methods can only be determined by
+        calling it on an instance (see :attr:`allowed_methods`).
+
+        """
+        if cls.allows_method is not Resource.allows_method:
+            return None
+        allowed_methods = cls.__dict__.get('_allowed_methods')
+        if allowed_methods is None:
+            not_allowed = cls.NOT_ALLOWED
+            allowed_methods = []
+            for name in dir(cls):
+                if name.startswith('_') or not name.isupper():
+                    continue
+                # Equivalent to allows_method() on an instance
+                attr = getattr_static(cls, name)
+                if isinstance(attr, classmethod):
+                    attr = attr.__func__
+                elif not isfunction(attr):
+                    continue
+                if attr is not not_allowed:
+                    allowed_methods.append(name)
+            allowed_methods = tuple(allowed_methods)
+            cls._allowed_methods = allowed_methods
         return allowed_methods
 
     def NOT_ALLOWED(self):
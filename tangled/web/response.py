@@ -1,6 +1,58 @@
+import codecs
+
 from webob import Response as BaseResponse
 
 
 class Response(BaseResponse):
 
     pass
+
+
+class StreamingAppIter:
+
+    """WSGI app iter for streamed content.
+
+    Chunks of content are encoded incrementally (bytes are passed
+    through as is), so the entire content is never in memory at once.
+
+    When the WSGI server closes the iterator (after the response has
+    been sent or if the client disconnects), the request's finished
+    callbacks are called. Since the response has already been started
+    at that point, errors in finished callbacks are logged but don't
+    affect the response.
+
+    """
+
+    def __init__(self, request, chunks, encoding=None):
+        self.request = request
+        self.chunks = chunks
+        self.encoding = encoding
+
+    def __iter__(self):
+        request = self.request
+        encoder = codecs.getincrementalencoder(self.encoding or 'utf-8')()
+        encode = encoder.encode
+        try:
+            for chunk in self.chunks:
+                if isinstance(chunk, str):
+                    chunk = encode(chunk)
+                if chunk:
+                    yield chunk
+            chunk = encode('', True)
+            if chunk:
+                yield chunk
+        except Exception as exc:
+            request.app.log_exc(request, exc)
+            raise
+
+    def close(self):
+        request = self.request
+        try:
+            close = getattr(self.chunks, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            try:
+                request._call_finished_callbacks(request.response)
+            except Exception as exc:
+                request.app.log_exc(request, exc)
@@ -1,7 +1,9 @@
 import datetime
+import gc
 import glob
 import itertools
 import os
+import signal
 import subprocess
 import sys
 import threading
@@ -13,6 +15,7 @@ from tangled.abcs import ACommand
 from tangled.decorators import cached_property
 from tangled.util import fully_qualified_name
 
+from ..snapshots import flush_all
 from .mixins import AppMixin
 
 
@@ -33,6 +36,11 @@ class Command(ACommand, AppMixin):
         parser.add_argument(
             '--reload-interval', type=int, default=1,
             help='How often (in seconds) to check for changed files')
+        parser.add_argument(
+            '-w', '--workers', type=int, default=1,
+            help='Number of worker processes to pre-fork; when this is greater than 1, '
+                 'reloading is disabled and workers that exit are replaced (except in '
+                 'debug mode)')
         parser.add_argument('--enable-permissive-cors', action='store_true', default=False)
 
     @cached_property
@@ -49,16 +57,25 @@ class Command(ACommand, AppMixin):
         return settings
 
     def run(self):
-        reload = self.args.reload
+        workers = self.args.workers
+        reload = self.args.reload and workers == 1
 
         if reload and not os.environ.get('MONITOR'):
             return self.run_with_monitor()
 
+        if workers > 1:
+            # Avoid leaving holes in memory pages that would otherwise be
+            # shared with workers (see Application.prepare_for_fork()).
+            gc.disable()
+
         print('[{}]'.format(datetime.datetime.now()))
         factory_name = fully_qualified_name(self.args.app_factory)
         print('Creating app from {} factory'.format(factory_name))
         app = self.make_app()
 
+        if workers > 1:
+            return self.run_workers(app, workers)
+
         server = None
         try:
             message = 'Starting server on http://{0.host}:{0.port}/'
@@ -82,6 +99,88 @@ class Command(ACommand, AppMixin):
                 server.shutdown()
                 server.server_close()
 
+    def run_workers(self, app, workers):
+        """Serve ``app`` from pre-forked worker processes.
+
+        The server socket is bound in this (the parent) process and
+        shared by the workers, each of which accepts connections on it.
+
+        When a worker exits (e.g., because it crashed), a new worker is
+        forked to replace it so capacity isn't lost. In debug mode,
+        workers aren't replaced (so errors aren't repeated endlessly)
+        and the server stops when all the workers have exited.
+
+        """
+        server = None
+        pids = []
+        try:
+            server = make_server(self.args.host, self.args.port, app)
+            app.prepare_for_fork()
+            for _ in range(workers):
+                pids.append(self.fork_worker(server))
+            message = 'Starting server on http://{0.host}:{0.port}/ with {0.workers} workers...'
+            print(message.format(self.args))
+            while pids:
+                pid, status = os.wait()
+                if pid not in pids:
+                    continue
+                pids.remove(pid)
+                message = 'Worker {} {}'.format(pid, describe_exit_status(status))
+                if app.debug:
+                    print(message)
+                else:
+                    print('{}; starting a new worker'.format(message))
+                    pids.append(self.fork_worker(server))
+        except KeyboardInterrupt:
+            print()
+        except Exception:
+            traceback.print_exc()
+            print('\nCould not start server')
+            return 2
+        finally:
+            for pid in pids:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    os.waitpid(pid, 0)
+                except (ChildProcessError, ProcessLookupError):
+                    pass
+            if server is not None:
+                server.server_close()
+
+    def fork_worker(self, server):
+        """Fork a worker process that serves requests via ``server``.
+
+        Returns the worker's PID (in the parent process).
+
+        """
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 2
+            try:
+                exit_code = self.run_worker(server)
+            finally:
+                # os._exit() skips atexit handlers, so metrics and slow
+                # log snapshots have to be flushed explicitly.
+                flush_all()
+                os._exit(exit_code)
+        return pid
+
+    def run_worker(self, server):
+        gc.enable()
+        # The parent stops workers with SIGTERM; turn it into SystemExit
+        # so the worker shuts down normally.
+        signal.signal(signal.SIGTERM, raise_system_exit)
+        try:
+            server.serve_forever()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+        except Exception:
+            traceback.print_exc()
+            return 2
+        finally:
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        return 0
+
     def run_with_monitor(self):
         argv = sys.argv.copy()
         env = os.environ.copy()
@@ -107,6 +206,16 @@ class Command(ACommand, AppMixin):
                 break
 
 
+def describe_exit_status(status):
+    if os.WIFSIGNALED(status):
+        return 'was killed by signal {}'.format(os.WTERMSIG(status))
+    return 'exited with status {}'.format(os.WEXITSTATUS(status))
+
+
+def raise_system_exit(signum, frame):
+    raise SystemExit(0)
+
+
 class MonitorThread(threading.Thread):
 
     """Monitors all modules on sys.path and config files."""
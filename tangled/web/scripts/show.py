@@ -1,9 +1,21 @@
+import collections
+import re
+import subprocess
+import sys
+import time
+
 from tangled.abcs import ACommand
+from tangled.util import fully_qualified_name
 
+from ..abcs import AMountedResource
+from ..slowlog import SlowLog
 from .mixins import AppMixin
 
 
-CHOICES = ['settings', 'handlers', 'resources']
+CHOICES = ['settings', 'handlers', 'resources', 'slow_requests', 'startup']
+
+# Startup is excluded by default because it runs a subprocess
+DEFAULT_CHOICES = [c for c in CHOICES if c != 'startup']
 
 
 def choice(value):
@@ -22,7 +34,11 @@ class Command(ACommand, AppMixin):
     @classmethod
     def configure(cls, parser):
         AppMixin.configure(parser)
-        parser.add_argument('what', nargs='*', type=choice, default=CHOICES)
+        parser.add_argument('what', nargs='*', type=choice, default=DEFAULT_CHOICES)
+        parser.add_argument(
+            '--access-log', default=None,
+            help='Replay requests from an access log against the mounted resources '
+                 '(used with "resources")')
 
     def run(self):
         for what in self.args.what:
@@ -40,4 +56,243 @@ class Command(ACommand, AppMixin):
             print('{} = {}'.format(k, v))
 
     def show_resources(self):
-        print('not yet implemented')
+        mounted_resources = self.app.get_all(AMountedResource, as_dict=True)
+        if not mounted_resources:
+            print('No resources mounted')
+            return
+
+        print('Matching strategy: {}'.format(get_matching_strategy(self.app)))
+        print()
+
+        mounted_resources = list(mounted_resources.values())
+        shadowed = find_shadowed(mounted_resources)
+
+        for mounted in mounted_resources:
+            methods = ', '.join(sorted(mounted.methods)) or '[NONE]'
+            method = ' ({})'.format(mounted.method) if mounted.method else ''
+            print('{mounted.name} => {methods}{method}'.format_map(locals()))
+            print('    path: {}'.format(mounted.path))
+            print('    regex: {}'.format(mounted.path_regex.pattern))
+            if mounted.urlvars:
+                print('    urlvars: {}'.format(', '.join(mounted.urlvars)))
+            print('    factory: {}'.format(format_factory(mounted.factory)))
+            if not mounted.methods:
+                print('    UNREACHABLE: no methods')
+            elif mounted.name in shadowed:
+                shadowed_methods, by = shadowed[mounted.name]
+                if shadowed_methods == mounted.methods:
+                    message = '    UNREACHABLE: shadowed by {by}'
+                else:
+                    message = '    SHADOWED for {shadowed_methods} by {by}'
+                shadowed_methods = ', '.join(sorted(shadowed_methods))
+                by = ', '.join(by)
+                print(message.format_map(locals()))
+
+        if self.args.access_log:
+            print()
+            self.replay_access_log(self.args.access_log)
+
+    access_log_regex = re.compile(r'(?P<method>[A-Z]+) (?P<path>/[^\s?#]*)')
+
+    def replay_access_log(self, file_name):
+        """Replay requests from an access log file.
+
+        Lines are expected to contain a request line like
+        ``GET /some/path HTTP/1.1`` (as in common/combined log format)
+        or just ``GET /some/path``. Other lines are skipped.
+
+        Match times are measured *without* the match cache so they
+        reflect the cost of the matching strategy itself.
+
+        """
+        app = self.app
+        find = type(app).find_mounted_resource.__wrapped__
+        durations = []
+        hits = collections.Counter()
+        not_found = 0
+        not_allowed = 0
+        skipped = 0
+
+        with open(file_name) as fp:
+            for line in fp:
+                match = self.access_log_regex.search(line)
+                if match is None:
+                    skipped += 1
+                    continue
+                method, path = match.group('method'), match.group('path')
+                start = time.perf_counter()
+                result = find(app, method, path)
+                durations.append(time.perf_counter() - start)
+                if result is None:
+                    if find(app, method, path, ignore_method=True) is None:
+                        not_found += 1
+                    else:
+                        not_allowed += 1
+                else:
+                    hits[result.mounted_resource.name] += 1
+
+        print('[access log replay: {}]'.format(file_name))
+        total = len(durations)
+        if not total:
+            print('No requests found')
+            return
+        print('Requests: {total} (404: {not_found}, 405: {not_allowed}, '
+              'skipped lines: {skipped})'.format_map(locals()))
+        durations.sort()
+        print('Match time (microseconds):')
+        for label, percentile in (('p50', 50), ('p90', 90), ('p99', 99), ('max', 100)):
+            index = min(total - 1, total * percentile // 100)
+            print('    {label}: {duration:.2f}'.format(
+                label=label, duration=durations[index] * 1000000))
+        print('    mean: {:.2f}'.format(sum(durations) / total * 1000000))
+        print('Hot routes:')
+        for name, count in hits.most_common(10):
+            print('    {name}: {count} ({percent:.1f}%)'.format(
+                name=name, count=count, percent=count / total * 100))
+
+    def show_slow_requests(self):
+        slow_log = self.app.get(SlowLog)
+        if slow_log is None:
+            print('Slow log not enabled (set tangled.app.slow_log.enabled)')
+            return
+        if not slow_log.shared_dir:
+            print('Slow log shared_dir not set (set tangled.app.slow_log.shared_dir)')
+            return
+        routes = slow_log.collect(all_runs=True)
+        if not routes:
+            print('No slow requests logged')
+            return
+        # Routes with the slowest requests first
+        routes = sorted(routes.items(), key=lambda item: item[1][0]['duration'], reverse=True)
+        for route, entries in routes:
+            print(route)
+            for entry in entries:
+                size = entry['size'] if entry['size'] is not None else '-'
+                print('    {0[duration]:>10.2f}ms {0[status]} {0[method]} {0[path]} {1}'
+                      .format(entry, size))
+                if entry['urlvars']:
+                    urlvars = sorted(entry['urlvars'].items())
+                    urlvars = ', '.join('{}={}'.format(*item) for item in urlvars)
+                    print('        urlvars: {}'.format(urlvars))
+                if entry['phases']:
+                    phases = entry['phases'].items()
+                    phases = ', '.join('{}={:.2f}ms'.format(*item) for item in phases)
+                    print('        phases: {}'.format(phases))
+
+    def show_startup(self):
+        timings = self.app.startup_timings
+        print('App creation (milliseconds):')
+        total = 0
+        for name, duration in timings.items():
+            total += duration
+            print('    {name}: {duration:.2f}'.format_map(locals()))
+        print('    total: {total:.2f}'.format_map(locals()))
+        print()
+        self.show_import_times()
+
+    def show_import_times(self, limit=10):
+        """Show import times for the app factory's module.
+
+        The module is imported in a fresh interpreter with ``-X
+        importtime`` (Python 3.7+).
+
+        """
+        module = self.args.app_factory.__module__
+        print('Import of {} (milliseconds):'.format(module))
+        if sys.version_info < (3, 7):
+            print('    Import times require Python 3.7+')
+            return
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+        imports = parse_import_times(result.stderr)
+        # Imports are listed after the modules that import them (and
+        # the module itself is listed last), so the module's imports are
+        # those after the previous top level import.
+        end = None
+        for i, (name, _, _, depth) in enumerate(imports):
+            if depth == 0 and name == module:
+                end = i + 1
+        if result.returncode or end is None:
+            print('    Could not import {}'.format(module))
+            return
+        start = end - 1
+        while start > 0 and imports[start - 1][3] > 0:
+            start -= 1
+        imports = imports[start:end]
+        print('    total: {:.2f}'.format(imports[-1][2] / 1000))
+        print('    Direct imports (cumulative):')
+        direct = [i for i in imports if i[3] == 1]
+        for name, _, cumulative, _ in sorted(direct, key=lambda i: i[2], reverse=True)[:limit]:
+            print('        {name}: {ms:.2f}'.format(name=name, ms=cumulative / 1000))
+        print('    Slowest modules (self):')
+        for name, self_time, _, _ in sorted(imports, key=lambda i: i[1], reverse=True)[:limit]:
+            print('        {name}: {ms:.2f}'.format(name=name, ms=self_time / 1000))
+
+
+def get_matching_strategy(app):
+    """Describe how ``app`` matches request paths to resources."""
+    if app.frozen:
+        search = 'precomputed table in reverse mount order (app is frozen)'
+    else:
+        search = 'registry in reverse mount order on each uncached lookup'
+    return (
+        'linear regex search of the {search}; resources mounted later take '
+        'precedence and matches are cached by (method, path)'.format(search=search))
+
+
+def parse_import_times(output):
+    """Parse output from ``python -X importtime``.
+
+    Returns a list of ``(module name, self time, cumulative time,
+    depth)`` tuples, where times are in microseconds and depth is the
+    nesting level of the import (0 for top level imports).
+
+    """
+    imports = []
+    regex = re.compile(r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|(?P<name>.+)$')
+    for line in output.splitlines():
+        match = regex.match(line)
+        if match:
+            name = match.group('name')
+            stripped_name = name.lstrip()
+            depth = (len(name) - len(stripped_name) - 1) // 2
+            imports.append(
+                (stripped_name, int(match.group('self')), int(match.group('cumulative')), depth))
+    return imports
+
+
+def find_shadowed(mounted_resources):
+    """Find mounted resources that are shadowed by other resources.
+
+    Resources are searched in reverse mount order, so a resource can
+    only be shadowed by a resource mounted after it. A resource is
+    considered shadowed for a method when a resource that's searched
+    first responds to that method and matches the resource's path (with
+    placeholders substituted for its URL vars).
+
+    Returns a dict of resource name => (shadowed methods, names of
+    shadowing resources).
+
+    """
+    shadowed = {}
+    for i, mounted in enumerate(mounted_resources):
+        probe = mounted.format_path(**{v: '__{}__'.format(v) for v in mounted.urlvars})
+        methods = set()
+        by = []
+        for other in reversed(mounted_resources[i + 1:]):
+            if other.path_regex.search(probe):
+                overlap = (mounted.methods & other.methods) - methods
+                if overlap:
+                    methods |= overlap
+                    by.append(other.name)
+        if methods:
+            shadowed[mounted.name] = (methods, by)
+    return shadowed
+
+
+def format_factory(factory):
+    try:
+        return fully_qualified_name(factory)
+    except AttributeError:
+        return repr(factory)
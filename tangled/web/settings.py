@@ -1,4 +1,9 @@
+import os
+from copy import deepcopy
+from types import MappingProxyType
+
 from tangled.settings import parse_settings_file, check_required
+from tangled.util import abs_path
 
 from .abcs import AAppSettings
 
@@ -22,15 +27,19 @@ def make_app_settings(settings, section='app', defaults={}, required=(), extra={
         - Required settings are checked for after all the settings are
           merged.
 
+    Parsed settings files (including the core defaults) are cached (see
+    :func:`get_settings_file`), so creating many apps from the same
+    settings is cheap.
+
     In most cases, you don't need to call this directly--you can pass
     a settings file name or dict to :class:`tangled.web.app.Application`
     and this will be called for you.
 
     """
-    all_settings = parse_settings_file('tangled.web:defaults.ini', meta_settings=False)
+    all_settings = copy_settings(get_settings_file('tangled.web:defaults.ini', meta_settings=False))
     all_settings.update(defaults)
     if isinstance(settings, str):
-        all_settings.update(parse_settings_file(settings, section=section))
+        all_settings.update(copy_settings(get_settings_file(settings, section=section)))
     else:
         all_settings.update(settings)
     all_settings.update(extra)
@@ -40,3 +49,55 @@ def make_app_settings(settings, section='app', defaults={}, required=(), extra={
 
 AppSettings = type('AppSettings', (dict,), {})
 AAppSettings.register(AppSettings)
+
+
+# (file name, section, meta settings) => (file names, mtimes, settings)
+_settings_file_cache = {}
+
+
+def get_settings_file(path, section='app', meta_settings=True):
+    """Get settings from a settings file, parsing it only if necessary.
+
+    Settings are parsed via :func:`.parse_settings_file` and cached by
+    file name and modification time. When the file extends other files,
+    their modification times are checked too (the metadata settings
+    are needed for this, so it's only done when ``meta_settings`` is
+    set).
+
+    The settings are returned as a read only mapping. Use
+    :func:`copy_settings` to get a copy that can be modified.
+
+    """
+    file_name = abs_path(path)
+    key = (file_name, section, meta_settings)
+    cached = _settings_file_cache.get(key)
+    if cached is not None:
+        file_names, mtimes, settings = cached
+        try:
+            if _get_mtimes(file_names) == mtimes:
+                return settings
+        except OSError:
+            pass
+    settings = parse_settings_file(file_name, section=section, meta_settings=meta_settings)
+    settings = MappingProxyType(settings)
+    file_names = (file_name,) + tuple(settings.get('__bases__', ()))
+    _settings_file_cache[key] = (file_names, _get_mtimes(file_names), settings)
+    return settings
+
+
+def _get_mtimes(file_names):
+    return tuple(os.stat(f).st_mtime_ns for f in file_names)
+
+
+def copy_settings(settings):
+    """Copy settings so they can be modified.
+
+    This is a shallow copy, except that mutable containers are copied
+    too, so modifying the copy (e.g., the list of resources mounted via
+    settings) won't affect the original.
+
+    """
+    return {
+        k: deepcopy(v) if isinstance(v, (dict, list, set)) else v
+        for k, v in settings.items()
+    }
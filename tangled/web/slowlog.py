@@ -0,0 +1,204 @@
+"""Slow request log.
+
+Enable by setting ``tangled.app.slow_log.enabled = true``. This adds
+the slow log handler to the handler chain. It keeps the slowest
+``tangled.app.slow_log.size`` requests for each mounted resource route
+template (e.g., ``/users/<id>``) that were handled in the last
+``tangled.app.slow_log.window`` seconds. Requests that don't match
+a mounted resource aren't logged.
+
+Each entry records the request's method, path, URL vars, status,
+duration, response size, and, if timing is enabled (see
+:mod:`tangled.web.timing`), its phase breakdown.
+
+The slow log can be viewed in the following ways:
+
+    - By mounting a JSON resource via ``tangled.app.slow_log.path``.
+    - By setting ``tangled.app.slow_log.shared_dir``. Each worker
+      process will periodically (and when it exits, including workers
+      started by ``tangled serve --workers``, which flush explicitly)
+      write a snapshot of its slow log to that directory and
+      ``tangled show slow_requests`` will merge and display the
+      snapshots. Snapshots from earlier server runs are removed when
+      :meth:`.Application.prepare_for_fork` is called in the master
+      process (see :class:`~tangled.web.snapshots.SnapshotFiles`).
+
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+
+from .abcs import AAppComponent
+from .resource.resource import Resource
+from .snapshots import SnapshotFiles, flush_at_exit
+from .timing import perf_counter_ns
+
+
+log = logging.getLogger(__name__)
+
+
+def include(app):
+    app.register(SlowLog, SlowLog.from_app(app))
+    path = app.get_setting('slow_log.path')
+    if path:
+        app.mount_resource('tangled.web.slow_log', SlowLogResource, path, methods=('GET',))
+
+
+def slow_log_handler(app, request, next_handler):
+    """Add request to slow log if it's one of the slowest for its route."""
+    start = perf_counter_ns()
+    response = next_handler(app, request)
+    duration = (perf_counter_ns() - start) / 1000000
+    mounted_resource = getattr(request, 'mounted_resource', None)
+    if mounted_resource is not None:
+        def make_entry():
+            return {
+                'name': mounted_resource.name,
+                'method': request.method,
+                'path': request.path,
+                'urlvars': dict(request.urlvars),
+                'status': response.status_code,
+                'duration': duration,
+                'size': response.content_length,
+                'phases': dict(request.timings.items()),
+                'timestamp': time.time(),
+            }
+        app.get_required(SlowLog).add(mounted_resource.path, duration, make_entry)
+    return response
+
+
+class SlowLog(AAppComponent):
+
+    """Keeps the slowest ``size`` requests per route.
+
+    Entries older than ``window`` seconds are discarded.
+
+    """
+
+    def __init__(self, size, window, shared_dir=None, flush_interval=5):
+        self.size = size
+        self.window = window
+        self.shared_dir = shared_dir
+        self.flush_interval = flush_interval
+        # route => min heap of (duration, sequence number, entry)
+        self._routes = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._last_flush = 0
+        self._snapshots = SnapshotFiles(shared_dir, 'tangled-slow-log') if shared_dir else None
+        if shared_dir:
+            flush_at_exit(self)
+
+    @classmethod
+    def from_app(cls, app):
+        return cls(
+            app.get_setting('slow_log.size'),
+            app.get_setting('slow_log.window'),
+            app.get_setting('slow_log.shared_dir'),
+            app.get_setting('slow_log.flush_interval'),
+        )
+
+    def add(self, route, duration, make_entry):
+        """Add entry for ``route`` if it's slow enough.
+
+        ``make_entry`` is a callable that returns the entry as a dict;
+        it's only called if the entry will be added.
+
+        """
+        heap = self._routes.get(route)
+        if heap is not None and len(heap) >= self.size:
+            # Fast path: not slower than the fastest entry and the
+            # fastest entry hasn't expired yet.
+            fastest_duration, _, fastest_entry = heap[0]
+            if duration <= fastest_duration and not self._is_expired(fastest_entry):
+                return False
+        entry = make_entry()
+        with self._lock:
+            heap = self._routes.setdefault(route, [])
+            self._prune(heap)
+            item = (duration, next(self._counter), entry)
+            if len(heap) < self.size:
+                heapq.heappush(heap, item)
+            elif duration > heap[0][0]:
+                heapq.heapreplace(heap, item)
+            else:
+                return False
+        if self.shared_dir and time.monotonic() - self._last_flush > self.flush_interval:
+            self.flush()
+        return True
+
+    def _is_expired(self, entry, now=None):
+        now = time.time() if now is None else now
+        return entry['timestamp'] < now - self.window
+
+    def _prune(self, heap):
+        now = time.time()
+        if any(self._is_expired(item[2], now) for item in heap):
+            heap[:] = [item for item in heap if not self._is_expired(item[2], now)]
+            heapq.heapify(heap)
+
+    def entries(self):
+        """Get entries for each route, slowest first."""
+        with self._lock:
+            routes = {}
+            for route, heap in self._routes.items():
+                self._prune(heap)
+                if heap:
+                    items = sorted(heap, reverse=True)
+                    routes[route] = [item[2] for item in items]
+            return routes
+
+    # Multi-process support
+
+    def prepare_for_fork(self):
+        if self._snapshots is not None:
+            self._snapshots.clean()
+
+    def flush(self):
+        """Write a snapshot of this process's slow log to ``shared_dir``.
+
+        If nothing has been logged in this process, this does nothing.
+
+        """
+        self._last_flush = time.monotonic()
+        if not self._routes:
+            return
+        try:
+            self._snapshots.write(self.entries())
+        except OSError:
+            log.exception('Could not write slow log snapshot')
+
+    def collect(self, all_runs=False):
+        """Merge entries from all snapshots in ``shared_dir``.
+
+        Entries from this process are included whether or not they've
+        been flushed. Unless ``all_runs`` is set, only snapshots written
+        by workers of the current server run are included; ``tangled
+        show slow_requests`` sets it since it runs in its own process.
+
+        """
+        merged = self.entries()
+        if self._snapshots is not None and os.path.isdir(self.shared_dir):
+            for path, routes in self._snapshots.read(all_runs):
+                for route, entries in routes.items():
+                    merged.setdefault(route, []).extend(entries)
+        now = time.time()
+        for route, entries in list(merged.items()):
+            entries = [e for e in entries if not self._is_expired(e, now)]
+            entries.sort(key=lambda e: e['duration'], reverse=True)
+            if entries:
+                merged[route] = entries[:self.size]
+            else:
+                del merged[route]
+        return merged
+
+
+class SlowLogResource(Resource):
+
+    """Exposes the slow log as JSON."""
+
+    def GET(self):
+        return {'routes': self.app.get_required(SlowLog).collect()}
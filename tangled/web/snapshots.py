@@ -0,0 +1,134 @@
+"""Snapshot files shared by worker processes.
+
+Used by :mod:`tangled.web.metrics` and :mod:`tangled.web.slowlog` to
+aggregate data across the worker processes of a pre-fork server.
+
+"""
+import atexit
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+import weakref
+
+
+log = logging.getLogger(__name__)
+
+
+class SnapshotFiles:
+
+    """Per-process snapshot files in a directory shared by workers.
+
+    File names look like ``{prefix}.{run ID}.{PID}.{start time}.json``.
+
+    The run ID is generated when this object is created, typically in
+    the master process before workers are forked, so all the workers of
+    a server run share it. Snapshots from earlier runs are ignored by
+    :meth:`read` (by default) and removed by :meth:`clean`, which should
+    be called when the master process starts up (it's called by
+    :meth:`.Application.prepare_for_fork`).
+
+    Including each process's start time means that a worker that reuses
+    the PID of a worker that exited doesn't overwrite its snapshot.
+
+    """
+
+    def __init__(self, directory, prefix):
+        self.directory = directory
+        self.prefix = prefix
+        self.run_id = uuid.uuid4().hex
+        self.pattern = re.compile(
+            r'{prefix}\.(?P<run_id>[0-9a-f]+)\.\d+\.\d+\.json'.format(prefix=re.escape(prefix)))
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: ref() is not None and ref()._reset())
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.start_time = int(time.time() * 1000000)
+
+    @property
+    def path(self):
+        """The path of the current process's snapshot file."""
+        if os.getpid() != self.pid:
+            self._reset()  # Forked without os.register_at_fork()
+        file_name = '{self.prefix}.{self.run_id}.{self.pid}.{self.start_time}.json'
+        return os.path.join(self.directory, file_name.format(self=self))
+
+    def write(self, data):
+        """Write a snapshot of the current process's ``data``."""
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump(data, fp)
+        os.replace(temp_name, self.path)
+
+    def read(self, all_runs=False):
+        """Read snapshots written by *other* processes.
+
+        Yields ``(path, data)`` for each snapshot. Unless ``all_runs``
+        is set, only snapshots from the current run are read.
+
+        """
+        own_path = self.path
+        for file_name in os.listdir(self.directory):
+            match = self.pattern.fullmatch(file_name)
+            if match is None:
+                continue
+            if not all_runs and match.group('run_id') != self.run_id:
+                continue
+            path = os.path.join(self.directory, file_name)
+            if path == own_path:
+                continue
+            try:
+                with open(path) as fp:
+                    data = json.load(fp)
+            except (OSError, ValueError):
+                log.exception('Could not read snapshot {}'.format(path))
+                continue
+            yield path, data
+
+    def clean(self):
+        """Remove snapshots from other runs."""
+        if not os.path.isdir(self.directory):
+            return
+        for file_name in os.listdir(self.directory):
+            match = self.pattern.fullmatch(file_name)
+            if match is not None and match.group('run_id') != self.run_id:
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except OSError:
+                    log.exception('Could not remove snapshot {}'.format(file_name))
+
+
+# Objects to flush when the process exits (see flush_at_exit())
+_flush_at_exit = weakref.WeakSet()
+
+
+def flush_at_exit(obj):
+    """Call ``obj.flush()`` when the process exits.
+
+    This ensures data recorded since the last periodic flush isn't lost
+    when a worker exits. Only a weak reference to ``obj`` is kept.
+
+    .. note:: Processes that exit via :func:`os._exit` (e.g., forked
+        workers) skip :mod:`atexit` handlers, so they need to call
+        :func:`flush_all` before exiting.
+
+    """
+    _flush_at_exit.add(obj)
+
+
+def flush_all():
+    """Flush all the objects registered via :func:`flush_at_exit`."""
+    for obj in list(_flush_at_exit):
+        try:
+            obj.flush()
+        except Exception:
+            log.exception('Could not flush {!r}'.format(obj))
+
+
+atexit.register(flush_all)
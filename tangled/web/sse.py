@@ -0,0 +1,185 @@
+"""Server-sent events.
+
+To enable server-sent events, include this module::
+
+    app.include('tangled.web.sse')
+
+This registers
+:class:`~tangled.web.representations.EventStreamRepresentation`, which
+isn't registered by default so that paths ending in ``.event_stream``
+aren't treated as requests for it.
+
+A resource method can stream events to a client by returning an
+:class:`EventStream`; the response is rendered via
+:class:`~tangled.web.representations.EventStreamRepresentation` as
+``text/event-stream``::
+
+    class Updates(Resource):
+
+        @config('text/event-stream', quality=1)
+        def GET(self):
+            queue = subscribe(after=self.request.last_event_id)
+            self.request.on_finished(lambda *args: unsubscribe(queue))
+            return EventStream(queue, heartbeat=15)
+
+Events can be strings (sent as the event data), mappings with ``data``,
+``event``, ``id``, and/or ``retry`` keys, or :class:`Event` instances.
+
+When a client reconnects, it sends the ID of the last event it received
+in the ``Last-Event-ID`` header, which is available as
+:attr:`.Request.last_event_id`, so the resource can resume the stream
+from that point.
+
+Each stream holds a worker thread for as long as the client is
+connected, so the server needs enough threads for the expected number
+of concurrent streams.
+
+"""
+import queue
+import re
+import sys
+from collections import namedtuple
+
+
+def include(app):
+    from .representations import EventStreamRepresentation
+    app.register_representation_type(EventStreamRepresentation)
+
+
+#: Put in an event queue (or yielded from an iterator) to send
+#: a heartbeat comment immediately.
+HEARTBEAT = object()
+
+#: Put in an event queue to end the stream.
+END = object()
+
+
+Event = namedtuple('Event', ('data', 'event', 'id', 'retry'))
+Event.__new__.__defaults__ = (None, None, None)
+
+
+# Only these are line terminators in the event stream format (unlike
+# str.splitlines(), which also splits on \x0b, \x1c, \u2028, etc).
+LINE_TERMINATOR = re.compile(r'\r\n|\r|\n')
+
+
+class EventStream:
+
+    """A stream of events from an iterable or a queue.
+
+    ``source`` can be:
+
+        - Any iterable of events. Iteration blocks until the next event
+          is available, so heartbeats can't be sent automatically; the
+          iterable can yield :data:`HEARTBEAT` to send one.
+        - A :class:`queue.Queue`. Events are read until :data:`END` is
+          read.
+        - An :class:`asyncio.Queue`. Events are read via ``loop``, which
+          must be running in another thread, until :data:`END` is read.
+
+    For queues, if no event is available within ``heartbeat`` seconds,
+    a heartbeat comment is sent so that proxies don't close the
+    connection (and so that disconnected clients are noticed).
+
+    ``retry`` sets the client's reconnection time (in milliseconds).
+
+    """
+
+    def __init__(self, source, heartbeat=None, retry=None, loop=None):
+        self.source = source
+        self.heartbeat = heartbeat
+        self.retry = retry
+        self.loop = loop
+
+    def __iter__(self):
+        if self.retry is not None:
+            yield Event('', retry=self.retry)
+        source = self.source
+        if isinstance(source, queue.Queue):
+            events = self._iter_queue(source.get)
+        elif self._is_async_queue(source):
+            events = self._iter_async_queue(source)
+        else:
+            events = source
+        yield from events
+
+    def _iter_queue(self, get):
+        heartbeat = self.heartbeat
+        while True:
+            try:
+                event = get(timeout=heartbeat)
+            except queue.Empty:
+                event = HEARTBEAT
+            if event is END:
+                break
+            yield event
+
+    def _is_async_queue(self, source):
+        # Avoid importing asyncio if it isn't already in use
+        asyncio = sys.modules.get('asyncio')
+        return asyncio is not None and isinstance(source, asyncio.Queue)
+
+    def _iter_async_queue(self, source):
+        import asyncio
+        from concurrent.futures import TimeoutError
+        loop = self.loop
+        if loop is None:
+            raise ValueError('An event loop is required to read events from an asyncio queue')
+
+        pending = None
+
+        def get(timeout=None):
+            nonlocal pending
+            if pending is None:
+                pending = asyncio.run_coroutine_threadsafe(source.get(), loop)
+            try:
+                event = pending.result(timeout)
+            except TimeoutError:
+                # The get is left pending for the next call rather than
+                # cancelled, since cancelling it could drop an event that
+                # was dequeued just as the timeout expired.
+                raise queue.Empty from None
+            pending = None
+            return event
+
+        try:
+            yield from self._iter_queue(get)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+
+def format_event(event):
+    """Format an event for a ``text/event-stream`` response.
+
+    Multiline data is sent as multiple ``data`` fields. The ``event``
+    and ``id`` fields can't contain line terminators (which would
+    inject fields), so a :exc:`ValueError` is raised if they do.
+
+    """
+    if event is HEARTBEAT:
+        return ':\n\n'
+    if isinstance(event, str):
+        event = Event(event)
+    elif not isinstance(event, Event):
+        event = Event(**event)
+    lines = []
+    if event.event is not None:
+        lines.append('event: {}\n'.format(_check_field('event', event.event)))
+    if event.id is not None:
+        lines.append('id: {}\n'.format(_check_field('id', event.id)))
+    if event.retry is not None:
+        lines.append('retry: {}\n'.format(event.retry))
+    data = '' if event.data is None else str(event.data)
+    if data or not lines:
+        for line in LINE_TERMINATOR.split(data):
+            lines.append('data: {}\n'.format(line))
+    lines.append('\n')
+    return ''.join(lines)
+
+
+def _check_field(name, value):
+    value = str(value)
+    if '\r' in value or '\n' in value or (name == 'id' and '\0' in value):
+        raise ValueError('Event {name} contains invalid characters: {value!r}'.format_map(locals()))
+    return value
@@ -1,4 +1,16 @@
-from webob.static import DirectoryApp as LocalDirectory
+import sys
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        # Avoid importing webob.static until a local directory is used
+        if name == 'LocalDirectory':
+            from webob.static import DirectoryApp as LocalDirectory
+            globals()['LocalDirectory'] = LocalDirectory
+            return LocalDirectory
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+else:
+    from webob.static import DirectoryApp as LocalDirectory
 
 
 class RemoteDirectory:
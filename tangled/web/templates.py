@@ -0,0 +1,147 @@
+"""Template engines and compiled template caching.
+
+Template extensions add an engine for the content type they render::
+
+    app.add_template_engine('text/html', MakoEngine(app))
+
+Engines are :class:`TemplateEngine` subclasses. They're only responsible
+for loading (compiling) and rendering templates; compiled templates are
+cached by the app's :class:`TemplateRegistry`, keyed by template name
+and content type.
+
+When the ``debug`` setting is enabled, templates are reloaded when their
+files are modified. Otherwise, templates are compiled once and their
+files are never checked again.
+
+When the ``tangled.app.templates.warmup`` setting is enabled, the
+templates specified via ``@config(content_type, template=...)`` are
+compiled when the app is created (so the first requests don't have to).
+
+Representations render templates via
+:meth:`tangled.web.representations.TemplateMixin.render`.
+
+"""
+import logging
+import os
+import threading
+
+from .abcs import AAppComponent
+from .resource.config import config
+
+
+log = logging.getLogger(__name__)
+
+
+def include(app):
+    app.register(TemplateRegistry, TemplateRegistry.from_app(app))
+    app.on_created(warmup)
+
+
+def warmup(event):
+    app = event.app
+    if not app.get_setting('templates.warmup'):
+        return
+    registry = app.get_required(TemplateRegistry)
+    count = registry.warmup()
+    log.debug('Compiled {count} templates for {app.name}'.format_map(locals()))
+
+
+class TemplateEngine:
+
+    """Base class for template engines."""
+
+    def load(self, name):
+        """Load and compile the template named ``name``."""
+        raise NotImplementedError
+
+    def get_file_name(self, name):
+        """Get the file name of the template named ``name``.
+
+        This is used to check whether the template has been modified in
+        debug mode. Return ``None`` (the default) if the template isn't
+        loaded from a file or shouldn't be checked.
+
+        """
+        return None
+
+    def render(self, template, context):
+        """Render a compiled ``template`` with ``context`` (a dict)."""
+        raise NotImplementedError
+
+
+class TemplateRegistry(AAppComponent):
+
+    """Compiled templates keyed by template name and content type."""
+
+    def __init__(self, app):
+        self.app = app
+        self.check_mtimes = app.debug
+        # (name, content type) => (template, file name, mtime)
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_app(cls, app):
+        return cls(app)
+
+    def get_engine(self, content_type):
+        engine = self.app.get(TemplateEngine, content_type)
+        if engine is None:
+            raise LookupError('No template engine for {}'.format(content_type))
+        return engine
+
+    def get(self, name, content_type):
+        """Get the compiled template for ``name`` and ``content_type``."""
+        key = (name, content_type)
+        entry = self._templates.get(key)
+        if entry is not None:
+            template, file_name, mtime = entry
+            if not self.check_mtimes or file_name is None:
+                return template
+            if self._get_mtime(file_name) == mtime:
+                return template
+        return self._load(key)
+
+    def _load(self, key):
+        name, content_type = key
+        engine = self.get_engine(content_type)
+        with self._lock:
+            file_name = engine.get_file_name(name)
+            mtime = self._get_mtime(file_name)
+            template = engine.load(name)
+            self._templates[key] = (template, file_name, mtime)
+        return template
+
+    def _get_mtime(self, file_name):
+        if file_name is None:
+            return None
+        try:
+            return os.stat(file_name).st_mtime_ns
+        except OSError:
+            return None
+
+    def render(self, name, context, content_type):
+        """Render the template ``name`` for ``content_type``."""
+        template = self.get(name, content_type)
+        return self.get_engine(content_type).render(template, context)
+
+    def warmup(self):
+        """Compile templates specified via ``@config``.
+
+        Returns the number of templates that were compiled.
+
+        """
+        count = 0
+        configs = self.app.get_all(config, default={}, as_dict=True)
+        for (_, content_type), kwargs in configs.items():
+            name = kwargs.get('template')
+            if name is None or not self.app.contains(TemplateEngine, content_type):
+                continue
+            if (name, content_type) not in self._templates:
+                self._load((name, content_type))
+                count += 1
+        return count
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
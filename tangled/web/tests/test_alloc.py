@@ -0,0 +1,69 @@
+import tracemalloc
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+from tangled.web.alloc import AllocationStats, AllocationTimings
+
+
+class Allocator(Resource):
+
+    def GET(self):
+        return {'data': ['x' * 100 for _ in range(100)]}
+
+
+class TestAllocationTimings(unittest.TestCase):
+
+    def setUp(self):
+        tracemalloc.start()
+
+    def tearDown(self):
+        tracemalloc.stop()
+
+    def test_record(self):
+        timings = AllocationTimings()
+        start = timings.start()
+        data = ['x' * 100 for _ in range(100)]
+        timings.record('phase', start)
+        blocks, size = timings.allocations['phase']
+        self.assertGreater(blocks, 0)
+        self.assertGreater(size, 0)
+        self.assertIn('phase', timings)
+        del data
+
+
+class TestAllocationTracking(unittest.TestCase):
+
+    def tearDown(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def test_alloc_tracking(self):
+        app = Application('tangled.web.tests:test.ini', extra={
+            'debug.alloc_tracking': True,
+        })
+        app.mount_resource('allocator', Allocator, '/allocator')
+        self.assertTrue(tracemalloc.is_tracing())
+        self.assertIsInstance(app.make_blank_request('/').timings, AllocationTimings)
+        test_app = TestApp(app)
+        test_app.get('/allocator')
+        test_app.get('/allocator')
+        summary = app.get_required(AllocationStats).summary()
+        phases = summary['allocator']
+        for phase in ('request', 'routing', 'resource', 'representation', 'handler.main'):
+            self.assertIn(phase, phases)
+        self.assertEqual(phases['resource']['requests'], 2)
+        response = test_app.get('/_allocations')
+        self.assertIn('allocator', response.json['routes'])
+
+    def test_clone_has_its_own_stats(self):
+        app = Application('tangled.web.tests:test.ini', extra={
+            'debug.alloc_tracking': True,
+        })
+        app.mount_resource('allocator', Allocator, '/allocator')
+        clone = app.clone()
+        TestApp(clone).get('/allocator')
+        self.assertIsNot(clone.get_required(AllocationStats), app.get_required(AllocationStats))
+        self.assertIn('allocator', clone.get_required(AllocationStats).summary())
+        self.assertEqual(app.get_required(AllocationStats).summary(), {})
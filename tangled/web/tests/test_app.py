@@ -1,7 +1,10 @@
 import unittest
 
+from tangled.web import abcs, Resource
 from tangled.web.app import Application
 from tangled.web.events import ApplicationCreated
+from tangled.web.exc import ConfigurationError
+from tangled.web.fragments import FragmentCache
 
 
 def include(app):
@@ -59,3 +62,79 @@ class Tests(unittest.TestCase):
         }
         self.assertRaisesRegex(
             AttributeError, 'non_existent_attribute', self.make_app, settings)
+
+
+class Hello(Resource):
+
+    def GET(self):
+        return 'Hello'
+
+
+class TestClone(unittest.TestCase):
+
+    def make_app(self, **extra):
+        app = Application({}, extra=extra)
+        app.mount_resource('hello', Hello, '/hello')
+        return app
+
+    def test_clone(self):
+        app = self.make_app()
+        clone = app.clone(**{'tenant': 'acme'})
+        self.assertIsInstance(clone, Application)
+        self.assertIsNot(clone, app)
+        self.assertNotEqual(clone.name, app.name)
+        self.assertEqual(clone.settings['tenant'], 'acme')
+        self.assertNotIn('tenant', app.settings)
+        self.assertIn('clone', dict(clone.startup_timings.items()))
+        self.assertNotIn('settings', dict(clone.startup_timings.items()))
+
+    def test_clone_copies_mounted_resources(self):
+        app = self.make_app()
+        clone = app.clone()
+        mounted_resource = app.get(abcs.AMountedResource, 'hello')
+        cloned_mounted_resource = clone.get(abcs.AMountedResource, 'hello')
+        self.assertIsNot(cloned_mounted_resource, mounted_resource)
+        self.assertIs(cloned_mounted_resource.app, clone)
+        self.assertIs(cloned_mounted_resource.path_regex, mounted_resource.path_regex)
+        self.assertIsNotNone(clone.find_mounted_resource('GET', '/hello'))
+
+    def test_clone_registry_is_independent(self):
+        app = self.make_app()
+        clone = app.clone()
+        clone.mount_resource('bye', Hello, '/bye')
+        self.assertIsNotNone(clone.get(abcs.AMountedResource, 'bye'))
+        self.assertIsNone(app.get(abcs.AMountedResource, 'bye'))
+
+    def test_clone_computes_cached_properties_from_its_settings(self):
+        app = self.make_app(debug=False)
+        self.assertFalse(app.debug)
+        clone = app.clone(debug=True)
+        self.assertTrue(clone.debug)
+        self.assertFalse(app.debug)
+
+    def test_clone_calls_once_subscribers_again(self):
+        app = self.make_app()
+        called = []
+        app.on_created(lambda event: called.append(event.app))
+        app.created()
+        clone = app.clone()
+        self.assertEqual(called, [app, clone])
+
+    def test_clone_cant_override_construction_settings(self):
+        app = self.make_app()
+        with self.assertRaises(ConfigurationError):
+            app.clone(**{'tangled.app.metrics.enabled': True})
+        with self.assertRaises(ConfigurationError):
+            app.clone(**{'tangled.app.includes': []})
+
+    def test_clone_recreates_app_components(self):
+        app = self.make_app(**{'tangled.app.includes': ['tangled.web.fragments']})
+        cache = app.get_required(FragmentCache)
+        cache.set('key', 'fragment')
+        clone = app.clone(**{'tangled.app.fragments.ttl': 60})
+        cloned_cache = clone.get_required(FragmentCache)
+        self.assertIsNot(cloned_cache, cache)
+        self.assertIs(cloned_cache.app, clone)
+        self.assertEqual(cloned_cache.default_ttl, 60)
+        self.assertIsNone(cloned_cache.get('key'))
+        self.assertEqual(cache.get('key'), 'fragment')
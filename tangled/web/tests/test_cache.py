@@ -0,0 +1,71 @@
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+from tangled.web.cache import LRUCache
+from tangled.web.representations import Representation
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_and_set(self):
+        cache = LRUCache(2)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('a', 1), 1)
+        cache.set('a', 'A')
+        self.assertEqual(cache.get('a'), 'A')
+        self.assertIn('a', cache)
+
+    def test_least_recently_used_item_is_evicted(self):
+        cache = LRUCache(2)
+        cache.set('a', 'A')
+        cache.set('b', 'B')
+        cache.get('a')
+        cache.set('c', 'C')
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_clear(self):
+        cache = LRUCache(2)
+        cache.set('a', 'A')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class Data(Resource):
+
+    def GET(self):
+        return {'a': 1}
+
+
+class TestNegotiationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Application('tangled.web.tests:test.ini')
+        self.app.mount_resource('data', Data, '/data')
+        self.cache = self.app._negotiation_cache
+        self.test_app = TestApp(self.app)
+
+    def test_content_type_is_cached(self):
+        headers = {'Accept': 'application/json'}
+        response = self.test_app.get('/data', headers=headers)
+        self.assertEqual(response.content_type, 'application/json')
+        self.assertIn((Data, 'GET', 'GET', 'application/json'), self.cache)
+        response = self.test_app.get('/data', headers=headers)
+        self.assertEqual(response.content_type, 'application/json')
+
+    def test_ext_is_cached(self):
+        response = self.test_app.get('/data.json')
+        self.assertEqual(response.content_type, 'application/json')
+        self.assertEqual(self.cache.get((Representation, '.json')), 'application/json')
+        self.test_app.get('/data.nope', status=404)
+        self.assertIsNone(self.cache.get((Representation, '.nope'), 'not cached'))
+
+    def test_cache_is_cleared_on_registration(self):
+        self.test_app.get('/data', headers={'Accept': 'application/json'})
+        self.assertTrue(len(self.cache))
+        self.app.mount_resource('more_data', Data, '/more-data')
+        self.assertFalse(len(self.cache))
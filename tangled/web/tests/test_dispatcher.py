@@ -0,0 +1,75 @@
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application
+from tangled.web.dispatcher import Dispatcher
+
+
+def make_wsgi_app(name):
+    def app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        body = '{} {} {}'.format(name, environ['SCRIPT_NAME'], environ['PATH_INFO'])
+        return [body.encode('utf-8')]
+    return app
+
+
+class Shared:
+
+    pass
+
+
+class TestDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        dispatcher = Dispatcher()
+        dispatcher.mount(make_wsgi_app('root'))
+        dispatcher.mount(make_wsgi_app('api'), '/api')
+        dispatcher.mount(make_wsgi_app('v2'), '/api/v2/')
+        dispatcher.mount(make_wsgi_app('example'), host='example.com')
+        self.dispatcher = dispatcher
+        self.app = TestApp(dispatcher)
+
+    def test_root(self):
+        response = self.app.get('/x')
+        self.assertEqual(response.text, 'root  /x')
+
+    def test_prefix(self):
+        response = self.app.get('/api/x')
+        self.assertEqual(response.text, 'api /api /x')
+
+    def test_prefix_without_trailing_slash(self):
+        response = self.app.get('/api')
+        self.assertEqual(response.text, 'api /api ')
+
+    def test_prefix_must_match_whole_segment(self):
+        response = self.app.get('/apix')
+        self.assertEqual(response.text, 'root  /apix')
+
+    def test_deeper_prefix_takes_precedence(self):
+        response = self.app.get('/api/v2/x')
+        self.assertEqual(response.text, 'v2 /api/v2 /x')
+
+    def test_host(self):
+        response = self.app.get('/api/x', extra_environ={'HTTP_HOST': 'EXAMPLE.com:8080'})
+        self.assertEqual(response.text, 'example  /api/x')
+
+    def test_not_found(self):
+        dispatcher = Dispatcher()
+        dispatcher.mount(make_wsgi_app('api'), '/api')
+        TestApp(dispatcher).get('/x', status=404)
+
+    def test_mount_at_same_prefix(self):
+        self.assertRaises(ValueError, self.dispatcher.mount, make_wsgi_app('api'), '/api/')
+
+    def test_shared_components(self):
+        dispatcher = Dispatcher(shared=(Shared,))
+        shared = Shared()
+        app_1 = Application({}, extra={'tangled.app.defer_created': True})
+        app_1.register(Shared, shared)
+        app_2 = Application({}, extra={'tangled.app.defer_created': True})
+        app_2.register(Shared, Shared())
+        dispatcher.mount(app_1, '/one')
+        dispatcher.mount(app_2, '/two')
+        self.assertIs(app_1.get(Shared), shared)
+        self.assertIs(app_2.get(Shared), shared)
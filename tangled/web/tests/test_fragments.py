@@ -0,0 +1,96 @@
+import unittest
+from unittest import mock
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+from tangled.web.fragments import FragmentCache
+
+
+renders = []
+
+
+def render_nav():
+    renders.append('nav')
+    return '<nav>{}</nav>'.format(len(renders))
+
+
+class Page(Resource):
+
+    def GET(self):
+        helpers = self.request.helpers
+        nav = helpers.cache_fragment('nav', render=render_nav, tags=['menu'])
+
+        @helpers.cache_fragment('footer', 60)
+        def footer():
+            renders.append('footer')
+            return '<footer></footer>'
+
+        return nav + footer
+
+
+class TestFragments(unittest.TestCase):
+
+    def setUp(self):
+        del renders[:]
+
+    def make_app(self):
+        app = Application('tangled.web.tests:test.ini', extra={
+            'tangled.app.default_content_type': 'text/plain',
+        })
+        app.include('tangled.web.fragments')
+        app.mount_resource('page', Page, '/')
+        return app
+
+    def test_fragments_are_cached(self):
+        test_app = TestApp(self.make_app())
+        self.assertEqual(test_app.get('/').text, '<nav>1</nav><footer></footer>')
+        self.assertEqual(test_app.get('/').text, '<nav>1</nav><footer></footer>')
+        self.assertEqual(renders, ['nav', 'footer'])
+
+    def test_invalidate_tag(self):
+        app = self.make_app()
+        test_app = TestApp(app)
+        test_app.get('/')
+        app.make_blank_request('/').helpers.invalidate_fragments('menu')
+        self.assertEqual(test_app.get('/').text, '<nav>3</nav><footer></footer>')
+        self.assertEqual(renders, ['nav', 'footer', 'nav'])
+
+    def test_ttl(self):
+        cache = self.make_app().get_required(FragmentCache)
+        with mock.patch('time.monotonic', return_value=0):
+            cache.set('key', 'fragment', ttl=10)
+        with mock.patch('time.monotonic', return_value=9):
+            self.assertEqual(cache.get('key'), 'fragment')
+        with mock.patch('time.monotonic', return_value=10):
+            self.assertIsNone(cache.get('key'))
+
+    def test_keys_are_namespaced_by_app_name(self):
+        cache = self.make_app().get_required(FragmentCache)
+        other_cache = FragmentCache(self.make_app(), cache.backend)
+        cache.set('key', 'fragment')
+        self.assertEqual(cache.get('key'), 'fragment')
+        self.assertIsNone(other_cache.get('key'))
+
+    def test_invalidated_while_rendering(self):
+        cache = self.make_app().get_required(FragmentCache)
+
+        def render():
+            cache.invalidate('tag')
+            return 'stale'
+
+        self.assertEqual(cache.get_or_render('key', render, tags=['tag']), 'stale')
+        self.assertIsNone(cache.get('key'))
+
+    def test_included_via_settings(self):
+        app = Application('tangled.web.tests:test.ini', extra={
+            'tangled.app.includes': ['tangled.web.fragments'],
+        })
+        cache = app.get_required(FragmentCache)
+        self.assertEqual(cache.prefix, '{}:fragment:'.format(app.name))
+
+    def test_evicted_tag_invalidates_fragment(self):
+        cache = self.make_app().get_required(FragmentCache)
+        cache.set('key', 'fragment', tags=['tag'])
+        cache.backend.delete(cache.tag_prefix + 'tag')
+        self.assertIsNone(cache.get('key'))
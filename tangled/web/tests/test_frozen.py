@@ -0,0 +1,88 @@
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+from tangled.web.abcs import AMountedResource
+from tangled.web.events import NewRequest
+from tangled.web.exc import ConfigurationError
+from tangled.web.frozen import FrozenDispatch
+
+
+class Hello(Resource):
+
+    def GET(self):
+        return 'Hello, {}'.format(self.request.helpers.name())
+
+
+def name(helpers):
+    return 'World'
+
+
+class TestFrozen(unittest.TestCase):
+
+    def make_app(self, **settings):
+        settings.setdefault('tangled.app.freeze', True)
+        settings.setdefault('tangled.app.default_content_type', 'text/plain')
+        app = Application('tangled.web.tests:test.ini', extra=settings)
+        return app
+
+    def test_not_frozen_by_default(self):
+        app = self.make_app(**{'tangled.app.freeze': False})
+        self.assertFalse(app.frozen)
+        app.mount_resource('hello', Hello, '/')
+
+    def test_frozen(self):
+        app = self.make_app(**{'tangled.app.defer_created': True})
+        app.mount_resource('hello', Hello, '/')
+        app.add_helper(name)
+        app.add_request_attribute(property(lambda request: 'value'), name='attr')
+        app.created()
+        self.assertTrue(app.frozen)
+        self.assertIsInstance(app._frozen, FrozenDispatch)
+        request = app.make_blank_request('/')
+        self.assertEqual(request.attr, 'value')
+        self.assertIs(type(request), type(app.make_blank_request('/')))
+        response = TestApp(app).get('/')
+        self.assertEqual(response.text, 'Hello, World')
+
+    def test_registration_rejected(self):
+        app = self.make_app()
+        self.assertRaises(ConfigurationError, app.mount_resource, 'hello', Hello, '/')
+        self.assertRaises(ConfigurationError, app.add_helper, name)
+
+    def test_config_args_rejected(self):
+        app = self.make_app()
+        # Args for an existing (method, content type) are added to
+        # a nested registry
+        self.assertTrue(app._frozen.get_config_args('GET', '*/*'))
+        self.assertRaises(ConfigurationError, app.add_config_field, '*/*', 'permission')
+        self.assertRaises(
+            ConfigurationError, app.add_representation_arg, 'text/csv', 'columns', None)
+
+    def test_lookups(self):
+        app = self.make_app(**{'tangled.app.defer_created': True})
+        app.mount_resource('hello', Hello, '/')
+        app.created()
+        self.assertEqual(app.get(AMountedResource, 'hello').name, 'hello')
+        self.assertTrue(app.has_any('content_type'))
+        self.assertTrue(app.contains('content_type', 'text/html'))
+        self.assertEqual(app.get('content_type', 'text/html'), ('text/html', 0.5))
+        self.assertIsNone(app.get('content_type', 'x/y'))
+        self.assertRaises(KeyError, app.get_required, 'content_type', 'x/y')
+        self.assertIn('text/html', app.get_all('content_type', as_dict=True))
+        self.assertIsNotNone(app.find_mounted_resource('GET', '/'))
+
+    def test_once_subscriber(self):
+        calls = []
+        app = self.make_app(**{'tangled.app.defer_created': True})
+        app.mount_resource('hello', Hello, '/')
+        app.add_helper(name)
+        app.add_subscriber(NewRequest, lambda event: calls.append(event), once=True)
+        app.created()
+        test_app = TestApp(app)
+        test_app.get('/')
+        test_app.get('/')
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(app.frozen)
+        self.assertNotIn(NewRequest, app._frozen.subscribers)
@@ -1,8 +1,11 @@
 import unittest
 
+from webtest import TestApp
+
 from webob.exc import HTTPNotFound, HTTPMethodNotAllowed, _HTTPMove
 
 from tangled.web import handlers, Application, Resource
+from tangled.web.representations import Representation
 
 
 class TestResource(Resource):
@@ -50,9 +53,85 @@ class TestResourceFinder(unittest.TestCase):
             handlers.resource_finder(self.app, request, lambda a, r: None)
         self.assertEqual(cm.exception.location, 'http://localhost/slash/')
 
+    def test_head_falls_back_to_get(self):
+        request = self.app.make_blank_request('/test', method='HEAD')
+        handlers.resource_finder(self.app, request, lambda a, r: None)
+        self.assertEqual(request.resource_method, 'GET')
+        self.assertEqual(request.config_method, 'GET')
+
     def test_custom_method_name(self):
         self.app.mount_resource('my_method', TestResource, '/my_method', method='my_method')
         request = self.app.make_blank_request('/my_method')
         handlers.resource_finder(self.app, request, lambda a, r: None)
         self.assertTrue(hasattr(request, 'resource'))
         self.assertEqual(request.resource_method, 'my_method')
+
+
+class SizedRepresentation(Representation):
+
+    key = 'sized'
+    content_type = 'text/x-sized'
+    data_type = str
+
+    @property
+    def content_length(self):
+        return len(self.data.encode(self.encoding))
+
+    @property
+    def content(self):
+        raise AssertionError('Content should not be generated for HEAD')
+
+
+class Data(Resource):
+
+    def GET(self):
+        return {'a': 1}
+
+
+class Sized(Resource):
+
+    def GET(self):
+        return 'sized'
+
+
+class Headed(Resource):
+
+    def GET(self):
+        return {'a': 1}
+
+    def HEAD(self):
+        self.request.response.status = 200
+        self.request.response.headers['X-Head'] = 'yes'
+        return {'a': 1}
+
+
+class TestHead(unittest.TestCase):
+
+    def make_app(self, **settings):
+        app = Application('tangled.web.tests:test.ini', extra=settings)
+        app.register_representation_type(SizedRepresentation)
+        app.mount_resource('data', Data, '/data')
+        app.mount_resource('sized', Sized, '/sized')
+        app.mount_resource('headed', Headed, '/headed')
+        return TestApp(app)
+
+    def test_head_via_get(self):
+        app = self.make_app()
+        get_response = app.get('/data')
+        head_response = app.head('/data')
+        self.assertEqual(head_response.status_int, 200)
+        self.assertEqual(head_response.body, b'')
+        self.assertEqual(head_response.content_length, get_response.content_length)
+        self.assertEqual(head_response.content_type, 'application/json')
+
+    def test_head_skips_content_when_length_is_known(self):
+        app = self.make_app(**{'tangled.app.default_content_type': 'text/x-sized'})
+        response = app.head('/sized')
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.content_length, 5)
+        self.assertEqual(response.content_type, 'text/x-sized')
+
+    def test_head_method(self):
+        app = self.make_app()
+        response = app.head('/headed')
+        self.assertEqual(response.headers['X-Head'], 'yes')
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+
+import tangled.web
+from tangled.web.scripts.show import parse_import_times
+
+
+# Upper bound for the cumulative time it takes to import tangled.web in
+# a fresh interpreter (microseconds). Importing the package shouldn't
+# import the framework, so this should be well under the budget.
+IMPORT_TIME_BUDGET = 20000
+
+# Modules that should only be imported on first use
+LAZY_MODULES = (
+    'markupsafe',
+    'webob',
+    'webob.static',
+    'tangled.web.app',
+    'tangled.web.csrf',
+    'tangled.web.request',
+)
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'Lazy imports require Python 3.7+')
+class TestImports(unittest.TestCase):
+
+    def get_import_times(self, code):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return {name: cumulative for name, _, cumulative, _ in parse_import_times(result.stderr)}
+
+    def test_import_time_budget(self):
+        import_times = self.get_import_times('import tangled.web')
+        self.assertLess(import_times['tangled.web'], IMPORT_TIME_BUDGET)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, import_times)
+
+    def test_app_import_does_not_import_optional_subsystems(self):
+        code = (
+            'from tangled.web.app import Application; '
+            'import tangled.web.handlers, tangled.web.resource.resource')
+        import_times = self.get_import_times(code)
+        self.assertIn('tangled.web.app', import_times)
+        self.assertNotIn('markupsafe', import_times)
+        self.assertNotIn('webob.static', import_times)
+        self.assertNotIn('tangled.web.csrf', import_times)
+
+    def test_api(self):
+        from tangled.web.app import Application
+        self.assertIs(tangled.web.Application, Application)
+        for name in tangled.web.__all__:
+            self.assertTrue(hasattr(tangled.web, name))
+            self.assertIn(name, dir(tangled.web))
+        self.assertRaises(AttributeError, getattr, tangled.web, 'Nope')
@@ -0,0 +1,125 @@
+import gc
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+from tangled.web.metrics import MetricsRegistry, UNMATCHED
+
+
+class Hello(Resource):
+
+    def GET(self):
+        return {'hello': 'world'}
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_observe(self):
+        registry = MetricsRegistry((0.1, 1))
+        registry.observe('hello', 'GET', 200, 0.05)
+        registry.observe('hello', 'GET', 200, 0.5)
+        registry.observe('hello', 'GET', 500, 5)
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['counters'][('hello', 'GET', 200)], 2)
+        self.assertEqual(snapshot['counters'][('hello', 'GET', 500)], 1)
+        histogram = snapshot['histograms'][('hello', 'GET')]
+        self.assertEqual(histogram[:3], [1, 1, 1])
+        self.assertAlmostEqual(histogram[3], 5.55)
+
+    def test_exposition(self):
+        registry = MetricsRegistry((0.1, 1))
+        registry.observe('hello', 'GET', 200, 0.05)
+        registry.observe('hello', 'GET', 200, 0.5)
+        text = registry.exposition()
+        self.assertIn(
+            'tangled_requests_total{method="GET",resource="hello",status="200"} 2', text)
+        self.assertIn(
+            'tangled_request_duration_seconds_bucket{le="0.1",method="GET",resource="hello"} 1',
+            text)
+        self.assertIn(
+            'tangled_request_duration_seconds_bucket{le="+Inf",method="GET",resource="hello"} 2',
+            text)
+        self.assertIn(
+            'tangled_request_duration_seconds_count{method="GET",resource="hello"} 2', text)
+
+    def test_collect_from_shared_dir(self):
+        with tempfile.TemporaryDirectory() as shared_dir:
+            registry = MetricsRegistry((0.1, 1), shared_dir=shared_dir)
+            registry.observe('hello', 'GET', 200, 0.05)
+            other_worker = {
+                'buckets': [0.1, 1],
+                'counters': [['hello', 'GET', 200, 3]],
+                'histograms': [['hello', 'GET', [3, 0, 0, 0.15]]],
+            }
+            run_id = registry._snapshots.run_id
+            # Another worker in this run and a worker from an earlier run
+            for file_name in (
+                'tangled-metrics.{}.1.1.json'.format(run_id),
+                'tangled-metrics.0123abcd.2.1.json',
+            ):
+                with open(os.path.join(shared_dir, file_name), 'w') as fp:
+                    json.dump(other_worker, fp)
+            snapshot = registry.collect()
+            self.assertEqual(snapshot['counters'][('hello', 'GET', 200)], 4)
+            self.assertEqual(snapshot['histograms'][('hello', 'GET')][0], 4)
+            registry.flush()
+            self.assertIn(os.path.basename(registry._snapshots.path), os.listdir(shared_dir))
+            registry.prepare_for_fork()
+            self.assertNotIn('tangled-metrics.0123abcd.2.1.json', os.listdir(shared_dir))
+            self.assertEqual(len(os.listdir(shared_dir)), 2)
+
+    def test_worker_that_reuses_pid_doesnt_overwrite_snapshot(self):
+        with tempfile.TemporaryDirectory() as shared_dir:
+            registry = MetricsRegistry((0.1, 1), shared_dir=shared_dir)
+            path = registry._snapshots.path
+            registry._snapshots.start_time += 1
+            self.assertNotEqual(registry._snapshots.path, path)
+
+    def test_nothing_flushed_when_nothing_recorded(self):
+        with tempfile.TemporaryDirectory() as shared_dir:
+            MetricsRegistry((0.1, 1), shared_dir=shared_dir).flush()
+            self.assertEqual(os.listdir(shared_dir), [])
+
+    def test_stores_of_exited_threads_are_retired(self):
+        registry = MetricsRegistry((0.1, 1))
+        registry.observe('hello', 'GET', 200, 0.05)
+        for _ in range(3):
+            thread = threading.Thread(target=registry.observe, args=('hello', 'GET', 200, 0.5))
+            thread.start()
+            thread.join()
+            del thread
+        gc.collect()
+        self.assertEqual(len(registry._stores), 1)
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['counters'][('hello', 'GET', 200)], 4)
+        self.assertEqual(snapshot['histograms'][('hello', 'GET')][:3], [1, 3, 0])
+
+
+class TestMetricsIntegration(unittest.TestCase):
+
+    def setUp(self):
+        app = Application('tangled.web.tests:test.ini', extra={
+            'tangled.app.metrics.enabled': True,
+        })
+        app.mount_resource('hello', Hello, '/hello')
+        self.app = app
+        self.test_app = TestApp(app)
+
+    def test_requests_are_counted(self):
+        self.test_app.get('/hello')
+        self.test_app.get('/hello')
+        self.test_app.get('/nowhere', status=404)
+        counters = self.app.get(MetricsRegistry).snapshot()['counters']
+        self.assertEqual(counters[('hello', 'GET', 200)], 2)
+        self.assertEqual(counters[(UNMATCHED, 'GET', 404)], 1)
+
+    def test_metrics_resource(self):
+        self.test_app.get('/hello')
+        response = self.test_app.get('/metrics')
+        self.assertEqual(response.content_type, 'text/plain')
+        self.assertIn('resource="hello"', response.text)
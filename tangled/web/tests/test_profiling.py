@@ -0,0 +1,93 @@
+import marshal
+import time
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource, profiling
+from tangled.web.profiling import CaptureStore, sign
+
+
+class Hello(Resource):
+
+    def GET(self):
+        return {'hello': 'world'}
+
+
+class TestProfiling(unittest.TestCase):
+
+    def make_app(self, **settings):
+        settings.setdefault('tangled.app.profiling.enabled', True)
+        app = Application('tangled.web.tests:test.ini', extra=settings)
+        app.mount_resource('hello', Hello, '/hello')
+        return app
+
+    def test_not_sampled(self):
+        app = self.make_app()
+        response = TestApp(app).get('/hello')
+        self.assertNotIn('X-Profile-ID', response.headers)
+        self.assertEqual(app.get(CaptureStore).all(), [])
+
+    def test_sampled_cprofile(self):
+        app = self.make_app(**{'tangled.app.profiling.sample_rate': 1.0})
+        response = TestApp(app).get('/hello', headers={'X-Request-ID': 'abc'})
+        capture_id = response.headers['X-Profile-ID']
+        # Client supplied request IDs aren't used as capture IDs
+        self.assertNotEqual(capture_id, 'abc')
+        capture = app.get(CaptureStore).get(capture_id)
+        self.assertEqual(capture.request_id, 'abc')
+        self.assertEqual(capture.format, 'pstats')
+        self.assertIsInstance(marshal.loads(capture.data), dict)
+
+    def test_concurrent_cprofile_falls_back_to_sampler(self):
+        app = self.make_app(**{'tangled.app.profiling.sample_rate': 1.0})
+        # Simulate another request being profiled with cProfile
+        with profiling._cprofile_lock:
+            response = TestApp(app).get('/hello')
+        capture = app.get(CaptureStore).get(response.headers['X-Profile-ID'])
+        self.assertEqual(capture.format, 'collapsed')
+        # The lock is released after profiling
+        response = TestApp(app).get('/hello')
+        capture = app.get(CaptureStore).get(response.headers['X-Profile-ID'])
+        self.assertEqual(capture.format, 'pstats')
+        self.assertFalse(profiling._cprofile_lock.locked())
+
+    def test_signed_header_with_sampler(self):
+        app = self.make_app(**{
+            'tangled.app.profiling.secret': 'secret',
+            'tangled.app.profiling.profiler': 'sampler',
+        })
+        test_app = TestApp(app)
+        response = test_app.get('/hello', headers={'X-Tangled-Profile': 'bad'})
+        self.assertNotIn('X-Profile-ID', response.headers)
+        signature = sign('secret', '/hello')
+        response = test_app.get('/hello', headers={'X-Tangled-Profile': signature})
+        profile_id = response.headers['X-Profile-ID']
+        self.assertEqual(app.get(CaptureStore).get(profile_id).format, 'collapsed')
+
+    def test_captures_resource_requires_signature(self):
+        app = self.make_app(**{
+            'tangled.app.profiling.sample_rate': 1.0,
+            'tangled.app.profiling.secret': 'secret',
+        })
+        test_app = TestApp(app)
+        capture_id = test_app.get('/hello').headers['X-Profile-ID']
+        path = '/_profiles/{}'.format(capture_id)
+        test_app.get(path, status=403)
+        response = test_app.get(path, headers={'X-Tangled-Profile': sign('secret', path)})
+        self.assertEqual(response.content_type, 'application/octet-stream')
+        self.assertEqual(
+            response.content_disposition, 'attachment; filename="{}.pstats"'.format(capture_id))
+
+    def test_expired_signature(self):
+        app = self.make_app(**{'tangled.app.profiling.secret': 'secret'})
+        test_app = TestApp(app)
+        signature = sign('secret', '/hello', int(time.time()) - 61)
+        response = test_app.get('/hello', headers={'X-Tangled-Profile': signature})
+        self.assertNotIn('X-Profile-ID', response.headers)
+        # The timestamp is signed too
+        timestamp = int(time.time())
+        _, digest = signature.split(':')
+        forged = '{}:{}'.format(timestamp, digest)
+        response = test_app.get('/hello', headers={'X-Tangled-Profile': forged})
+        self.assertNotIn('X-Profile-ID', response.headers)
@@ -0,0 +1,98 @@
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+
+
+class Session:
+
+    instances = 0
+
+    def __init__(self):
+        Session.instances += 1
+        self.id = Session.instances
+
+
+class User(str):
+
+    pass
+
+
+class Clock:
+
+    pass
+
+
+def get_user(app, request):
+    return User(request.headers.get('X-User', 'anonymous'))
+
+
+class Items(Resource):
+
+    def GET(self, session: Session, other_session: Session, user: User, page: int = 1):
+        return {
+            'session': session.id,
+            'same_session': other_session is session,
+            'user': user,
+            'page': page,
+        }
+
+
+class TestProviders(unittest.TestCase):
+
+    def setUp(self):
+        Session.instances = 0
+
+    def make_app(self, scope='request'):
+        app = Application('tangled.web.tests:test.ini')
+        app.add_provider(Session, lambda app, request: Session(), scope=scope)
+        app.add_provider(User, get_user)
+        app.mount_resource('items', Items, '/items')
+        return app
+
+    def test_inject(self):
+        test_app = TestApp(self.make_app())
+        response = test_app.get('/items', {'page': '2'}, headers={'X-User': 'bob'})
+        self.assertEqual(response.json, {
+            'session': 1,
+            'same_session': True,
+            'user': 'bob',
+            'page': 2,
+        })
+        response = test_app.get('/items')
+        self.assertEqual(response.json['session'], 2)
+        self.assertEqual(response.json['user'], 'anonymous')
+
+    def test_injected_args_cant_be_passed_by_clients(self):
+        response = TestApp(self.make_app()).get('/items', {'user': 'admin'})
+        self.assertEqual(response.json['user'], 'anonymous')
+
+    def test_app_scope(self):
+        test_app = TestApp(self.make_app('app'))
+        self.assertEqual(test_app.get('/items').json['session'], 1)
+        self.assertEqual(test_app.get('/items').json['session'], 1)
+        self.assertEqual(Session.instances, 1)
+
+    def test_call_scope(self):
+        app = self.make_app('call')
+        request = app.make_blank_request('/items')
+        resource = Items(app, request)
+        arguments = resource.bind(request, 'GET').arguments
+        self.assertIsNot(arguments['session'], arguments['other_session'])
+
+    def test_plan_is_cached(self):
+        app = self.make_app()
+        request = app.make_blank_request('/items')
+        Items(app, request).bind(request, 'GET')
+        plan = app._bind_plans[(Items, 'GET')]
+        self.assertEqual(
+            [name for name, _ in plan.injected], ['session', 'other_session', 'user'])
+        Items(app, request).bind(request, 'GET')
+        self.assertIs(app._bind_plans[(Items, 'GET')], plan)
+        app.add_provider(Clock, lambda app, request: Clock())
+        self.assertNotIn((Items, 'GET'), app._bind_plans)
+
+    def test_bad_scope(self):
+        app = Application('tangled.web.tests:test.ini')
+        self.assertRaises(ValueError, app.add_provider, Session, Session, scope='session')
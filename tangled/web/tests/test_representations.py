@@ -0,0 +1,168 @@
+import array
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource, config
+from tangled.web.representations import (
+    BinaryRepresentation,
+    CSVRepresentation,
+    PackedRecordsRepresentation,
+    Representation,
+    unpack_records,
+)
+
+
+class Report(Resource):
+
+    @config('text/csv', columns=['id', 'name'], flush_rows=2)
+    def GET(self):
+        return ({'id': i, 'name': 'name {}'.format(i), 'other': i} for i in range(5))
+
+
+class Rows(Resource):
+
+    @config('text/csv', header=False)
+    def GET(self):
+        return [(1, 'a,b'), (2, 'c')]
+
+
+class TestCSVRepresentation(unittest.TestCase):
+
+    def setUp(self):
+        app = Application('tangled.web.tests:test.ini')
+        app.mount_resource('report', Report, '/report')
+        app.mount_resource('rows', Rows, '/rows')
+        app.load_config(Report)
+        app.load_config(Rows)
+        self.app = app
+
+    def make_representation(self, data, **kwargs):
+        return CSVRepresentation(self.app, None, data, **kwargs)
+
+    def test_mappings(self):
+        representation = self.make_representation([{'a': 1, 'b': 2}, {'a': 3, 'b': 4}])
+        self.assertEqual(representation.content, 'a,b\r\n1,2\r\n3,4\r\n')
+
+    def test_sequences_with_columns(self):
+        representation = self.make_representation([(1, 2)], columns=('a', 'b'))
+        self.assertEqual(representation.content, 'a,b\r\n1,2\r\n')
+
+    def test_empty(self):
+        representation = self.make_representation([], columns=('a', 'b'))
+        self.assertEqual(representation.content, 'a,b\r\n')
+        self.assertEqual(self.make_representation([]).content, '')
+
+    def test_flush_rows(self):
+        data = iter([(i,) for i in range(5)])
+        representation = self.make_representation(data, flush_rows=2)
+        self.assertTrue(representation.is_stream)
+        chunks = list(representation.iter_content())
+        self.assertEqual(chunks, ['0\r\n1\r\n', '2\r\n3\r\n', '4\r\n'])
+
+    def test_rejects_non_tabular_data(self):
+        self.assertRaises(TypeError, self.make_representation, 'a,b')
+        self.assertRaises(TypeError, self.make_representation, {'a': 1})
+
+    def test_stream_via_extension(self):
+        response = TestApp(self.app).get('/report.csv')
+        self.assertEqual(response.content_type, 'text/csv')
+        self.assertEqual(response.text.splitlines(), [
+            'id,name',
+            '0,name 0',
+            '1,name 1',
+            '2,name 2',
+            '3,name 3',
+            '4,name 4',
+        ])
+
+    def test_accept(self):
+        response = TestApp(self.app).get('/rows', headers={'Accept': 'text/csv'})
+        self.assertEqual(response.content_type, 'text/csv')
+        self.assertEqual(response.text, '1,"a,b"\r\n2,c\r\n')
+
+
+class Numbers(Resource):
+
+    @config('application/octet-stream', quality=1)
+    def GET(self):
+        return array.array('d', [1.0, 2.0, 3.0])
+
+
+class Records(Resource):
+
+    @config('application/x-length-prefixed-records', quality=1)
+    def GET(self):
+        return [b'a', b'bc', memoryview(b'def')]
+
+
+class Export(Resource):
+
+    @config('text/plain', quality=1)
+    def GET(self, name):
+        return name
+
+
+class TestBinaryRepresentation(unittest.TestCase):
+
+    def setUp(self):
+        app = Application('tangled.web.tests:test.ini')
+        app.register_representation_type(BinaryRepresentation)
+        app.register_representation_type(PackedRecordsRepresentation)
+        app.mount_resource('numbers', Numbers, '/numbers')
+        app.mount_resource('records', Records, '/records')
+        app.load_config(Numbers)
+        app.load_config(Records)
+        self.app = app
+
+    def test_bytes_are_not_copied(self):
+        data = b'x' * 10
+        representation = BinaryRepresentation(self.app, None, data)
+        self.assertIs(representation.content, data)
+        self.assertEqual(representation.content_length, 10)
+
+    def test_buffer(self):
+        data = array.array('i', [1, 2, 3])
+        representation = BinaryRepresentation(self.app, None, data)
+        self.assertEqual(representation.content, data.tobytes())
+        self.assertEqual(representation.content_length, data.itemsize * 3)
+
+    def test_rejects_non_buffer(self):
+        self.assertRaises(TypeError, BinaryRepresentation, self.app, None, 'text')
+
+    def test_response(self):
+        test_app = TestApp(self.app)
+        accept = {'Accept': 'application/octet-stream'}
+        response = test_app.get('/numbers', headers=accept)
+        self.assertEqual(response.content_type, 'application/octet-stream')
+        self.assertEqual(response.content_length, 24)
+        self.assertEqual(array.array('d', response.body).tolist(), [1.0, 2.0, 3.0])
+        response = test_app.head('/numbers', headers=accept)
+        self.assertEqual(response.content_length, 24)
+
+    def test_packed_records(self):
+        representation = PackedRecordsRepresentation(self.app, None, [b'a', b'', b'bc'])
+        content = representation.content
+        self.assertEqual(content, b'\x00\x00\x00\x01a\x00\x00\x00\x00\x00\x00\x00\x02bc')
+        self.assertEqual(representation.content_length, len(content))
+        self.assertEqual([bytes(r) for r in unpack_records(content)], [b'a', b'', b'bc'])
+
+    def test_truncated_records(self):
+        self.assertRaises(ValueError, list, unpack_records(b'\x00\x00\x00\x02a'))
+
+    def test_packed_records_response(self):
+        response = TestApp(self.app).get(
+            '/records', headers={'Accept': 'application/x-length-prefixed-records'})
+        self.assertEqual(response.content_length, 18)
+        self.assertEqual([bytes(r) for r in unpack_records(response.body)], [b'a', b'bc', b'def'])
+
+    def test_not_registered_by_default(self):
+        app = Application('tangled.web.tests:test.ini')
+        self.assertIsNone(app.get(Representation, 'binary'))
+        self.assertIsNone(app.get(Representation, 'application/x-length-prefixed-records'))
+        app.mount_resource('export', Export, '/exports/<name>')
+        app.load_config(Export)
+        # The extension isn't treated as a content type
+        response = TestApp(app).get('/exports/x.records')
+        self.assertEqual(response.content_type, 'text/plain')
+        self.assertEqual(response.text, 'x.records')
@@ -1,6 +1,7 @@
 import unittest
 
 from tangled.web import Application, Resource
+from tangled.web.abcs import AMountedResource
 from tangled.web.handlers import resource_finder
 from tangled.web.resource.mounted import MountedResource
 
@@ -47,6 +48,17 @@ class TestMountedResource(unittest.TestCase):
         with self.assertRaises(ValueError):
             mr.format_path(path='somewhere', name='bob', id='x', format='json')
 
+    def test_build_path_quotes_values(self):
+        mr = MountedResource(self.app, 'test', TestResource, '/<name>/<id>')
+        self.assertEqual(mr.build_path({'name': 'a b/c', 'id': 1}), '/a%20b%2Fc/1')
+        self.assertEqual(
+            mr.build_path({'name': 'a-b_c.d~e:f@g', 'id': 'é'}), '/a-b_c.d~e:f@g/%C3%A9')
+
+    def test_build_path_missing_var(self):
+        mr = MountedResource(self.app, 'test', TestResource, '/<name>/<id>')
+        with self.assertRaises(KeyError):
+            mr.build_path({'name': 'bob'})
+
     def test_add_slash(self):
         app = self.app
         path = '/some/dir/'
@@ -85,6 +97,52 @@ class TestMountedResource(unittest.TestCase):
             self.assertTrue(exc.location.endswith('/some/dir/'))
 
 
+class TestURLGeneration(unittest.TestCase):
+
+    def setUp(self):
+        app = Application({})
+        app.mount_resource('home', TestResource, '/')
+        app.mount_resource('item', TestResource, '/items/<id>')
+        self.app = app
+
+    def make_request(self, script_name=''):
+        return self.app.make_blank_request(
+            '/', base_url='http://localhost{}'.format(script_name))
+
+    def test_resource_url(self):
+        request = self.make_request()
+        self.assertEqual(request.resource_url('home'), 'http://localhost/')
+        self.assertEqual(
+            request.resource_url('item', {'id': 1}, query={'a': 'b'}, fragment='top'),
+            'http://localhost/items/1?a=b#top')
+
+    def test_resource_path_with_script_name(self):
+        request = self.make_request('/app')
+        self.assertEqual(request.resource_path('home'), '/app/')
+        self.assertEqual(request.resource_path('item', {'id': 1}), '/app/items/1')
+        self.assertEqual(request.resource_url('item', {'id': 1}), 'http://localhost/app/items/1')
+        self.assertEqual(request.make_path(''), '/app/')
+
+    def test_url_bases_are_shared_by_host(self):
+        request = self.make_request('/app')
+        other_request = self.make_request('/app')
+        self.assertIs(request._url_bases, other_request._url_bases)
+        self.assertEqual(len(self.app._url_base_cache), 1)
+        other_host_request = self.app.make_blank_request('/', base_url='http://example.com')
+        self.assertEqual(other_host_request.resource_url('home'), 'http://example.com/')
+        self.assertEqual(len(self.app._url_base_cache), 2)
+
+    def test_batch(self):
+        request = self.make_request('/app')
+        urlvars = [{'id': i} for i in range(3)]
+        self.assertEqual(
+            request.resource_paths('item', urlvars),
+            ['/app/items/0', '/app/items/1', '/app/items/2'])
+        self.assertEqual(
+            request.resource_urls('item', urlvars[:1], query='x=1'),
+            ['http://localhost/app/items/0?x=1'])
+
+
 class TestMountedResourceTree(unittest.TestCase):
 
     def setUp(self):
@@ -181,3 +239,49 @@ class TestMountedResourceTree(unittest.TestCase):
         cache_info = self.app.find_mounted_resource.cache_info()
         self.assertEqual(cache_info.hits, 1)
         self.assertEqual(cache_info.misses, 1)
+
+
+class TestLazyMountedResource(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Application({})
+
+    def test_allowed_methods_per_class(self):
+        self.assertEqual(TestResource.get_allowed_methods(), ('GET', 'OPTIONS', 'POST'))
+        self.assertIn('_allowed_methods', TestResource.__dict__)
+        resource = TestResource(self.app, None)
+        self.assertEqual(resource.allowed_methods, ('GET', 'OPTIONS', 'POST'))
+
+    def test_allows_method_override(self):
+
+        class ReadOnlyResource(TestResource):
+
+            def allows_method(self, method):
+                return method != 'POST' and super().allows_method(method)
+
+        self.assertIsNone(ReadOnlyResource.get_allowed_methods())
+        resource = ReadOnlyResource(self.app, None)
+        self.assertEqual(resource.allowed_methods, ('GET', 'OPTIONS'))
+        self.app.mount_resource('read_only', ReadOnlyResource, '/read-only')
+        self.assertEqual(self.app.get(AMountedResource, 'read_only').methods, {'GET', 'OPTIONS'})
+        self.assertIsNone(self.app.find_mounted_resource('POST', '/read-only'))
+
+    def test_factory_loaded_lazily(self):
+        self.app.mount_resource('test', '.test_mounted:TestResource', '/test')
+        mr = self.app.get(AMountedResource, 'test')
+        # The module name depends on how the tests were discovered
+        self.assertEqual(mr._factory, '{}:TestResource'.format(TestResource.__module__))
+        self.assertIsNone(mr._methods)
+        self.assertIsNone(self.app.find_mounted_resource('GET', '/other'))
+        self.assertIsInstance(mr._factory, str)
+        match = self.app.find_mounted_resource('GET', '/test')
+        self.assertIs(match.mounted_resource, mr)
+        self.assertIs(mr._factory, TestResource)
+        self.assertEqual(mr.methods, {'GET', 'OPTIONS', 'POST'})
+
+    def test_subresource_inherits_lazy_factory(self):
+        with self.app.mount_resource('parent', '.test_mounted:TestResource', '/parent') as parent:
+            parent.mount('child', 'child')
+        mr = self.app.get(AMountedResource, 'parent/child')
+        self.assertIsInstance(mr._factory, str)
+        self.assertIs(mr.factory, TestResource)
@@ -0,0 +1,121 @@
+import argparse
+import contextlib
+import gc
+import io
+import os
+import signal
+import tempfile
+import time
+import unittest
+
+from tangled.web import Application
+from tangled.web.metrics import MetricsRegistry
+from tangled.web.scripts.serve import Command
+from tangled.web.slowlog import SlowLog
+
+
+class RecordingServer:
+
+    """Records a request, tells the test it's ready, and then waits."""
+
+    def __init__(self, component, record, ready_fd):
+        self.component = component
+        self.record = record
+        self.ready_fd = ready_fd
+
+    def serve_forever(self):
+        # Make sure the request isn't flushed periodically
+        self.component._last_flush = time.monotonic()
+        self.record()
+        os.write(self.ready_fd, b'x')
+        while True:
+            time.sleep(1)
+
+
+class CrashingWorkersCommand(Command):
+
+    """Forks workers that exit immediately.
+
+    Stops the server (via KeyboardInterrupt) on the ``max_forks``-th
+    fork.
+
+    """
+
+    max_forks = 4
+
+    def __init__(self, parser, args):
+        super().__init__(parser, args)
+        self.forks = 0
+
+    def fork_worker(self, server):
+        self.forks += 1
+        if self.forks == self.max_forks:
+            raise KeyboardInterrupt
+        pid = os.fork()
+        if pid == 0:
+            os._exit(1)
+        return pid
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'Requires os.fork()')
+class TestWorkers(unittest.TestCase):
+
+    def make_command(self, command_class=Command):
+        parser = argparse.ArgumentParser()
+        command_class.configure(parser)
+        args = parser.parse_args([
+            '-a', 'tangled.web:Application', '-H', '127.0.0.1', '-p', '0', '--workers', '2'])
+        return command_class(parser, args)
+
+    def run_workers(self, command, app):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return command.run_workers(app, 2)
+        finally:
+            # Undo app.prepare_for_fork()
+            if hasattr(gc, 'unfreeze'):
+                gc.unfreeze()
+
+    def test_workers_that_exit_are_replaced(self):
+        command = self.make_command(CrashingWorkersCommand)
+        self.assertIsNone(self.run_workers(command, Application({})))
+        # 2 workers + 1 replacement; the 4th fork stops the server
+        self.assertEqual(command.forks, 4)
+
+    def test_workers_arent_replaced_in_debug_mode(self):
+        command = self.make_command(CrashingWorkersCommand)
+        self.assertIsNone(self.run_workers(command, Application({'debug': True})))
+        self.assertEqual(command.forks, 2)
+
+    def run_and_terminate_worker(self, component, record):
+        command = self.make_command()
+        read_fd, write_fd = os.pipe()
+        try:
+            pid = command.fork_worker(RecordingServer(component, record, write_fd))
+            self.assertEqual(os.read(read_fd, 1), b'x')
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+        self.assertEqual(list(component._snapshots.read()), [])
+        os.kill(pid, signal.SIGTERM)
+        _, status = os.waitpid(pid, 0)
+        self.assertTrue(os.WIFEXITED(status))
+        self.assertEqual(os.WEXITSTATUS(status), 0)
+        snapshots = list(component._snapshots.read())
+        self.assertEqual(len(snapshots), 1)
+        return snapshots[0][1]
+
+    def test_metrics_snapshot_flushed_when_worker_is_terminated(self):
+        with tempfile.TemporaryDirectory() as shared_dir:
+            metrics = MetricsRegistry((0.1,), shared_dir, flush_interval=3600)
+            data = self.run_and_terminate_worker(
+                metrics, lambda: metrics.observe('test', 'GET', 200, 0.01))
+            self.assertEqual(data['counters'], [['test', 'GET', 200, 1]])
+
+    def test_slow_log_snapshot_flushed_when_worker_is_terminated(self):
+        with tempfile.TemporaryDirectory() as shared_dir:
+            slow_log = SlowLog(1, 60, shared_dir, flush_interval=3600)
+            entry = {'path': '/test', 'timestamp': time.time()}
+            data = self.run_and_terminate_worker(
+                slow_log, lambda: slow_log.add('/test', 1.0, lambda: entry))
+            self.assertEqual(data, {'/test': [entry]})
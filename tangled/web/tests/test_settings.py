@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from tangled.settings import parse_settings_file
+from tangled.web.settings import get_settings_file, make_app_settings
+
+
+class TestSettingsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.base = self.write('base.ini', 'a = 1\nb = 2\n')
+        self.file_name = self.write('app.ini', 'extends = "base.ini"\nb = 3\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, settings, mtime=None):
+        file_name = os.path.join(self.dir, name)
+        with open(file_name, 'w') as fp:
+            fp.write('[app]\n')
+            fp.write(settings)
+        if mtime is not None:
+            os.utime(file_name, (mtime, mtime))
+        return file_name
+
+    def test_defaults_parsed_once(self):
+        defaults = get_settings_file('tangled.web:defaults.ini', meta_settings=False)
+        self.assertIs(get_settings_file('tangled.web:defaults.ini', meta_settings=False), defaults)
+        with self.assertRaises(TypeError):
+            defaults['tangled.app.name'] = 'nope'
+
+    def test_app_settings_are_copies(self):
+        settings = make_app_settings({})
+        settings['tangled.app.includes'].append('some.package')
+        settings = make_app_settings({})
+        self.assertNotIn('some.package', settings['tangled.app.includes'])
+
+    def test_file_cached(self):
+        settings = get_settings_file(self.file_name)
+        self.assertIs(get_settings_file(self.file_name), settings)
+        self.assertEqual(settings['__bases__'], (self.base,))
+
+    def test_file_changed(self):
+        old_settings = get_settings_file(self.file_name)
+        self.write('app.ini', 'extends = "base.ini"\nb = 4\n', mtime=1)
+        settings = get_settings_file(self.file_name)
+        self.assertEqual(settings['b'], parse_settings_file(self.file_name)['b'])
+        self.assertNotEqual(settings['b'], old_settings['b'])
+
+    def test_base_file_changed(self):
+        old_settings = get_settings_file(self.file_name)
+        self.write('base.ini', 'a = 5\n', mtime=1)
+        settings = get_settings_file(self.file_name)
+        self.assertEqual(settings['a'], parse_settings_file(self.file_name)['a'])
+        self.assertNotEqual(settings['a'], old_settings['a'])
@@ -0,0 +1,72 @@
+import unittest
+
+from tangled.web import Application, Resource
+from tangled.web.abcs import AMountedResource
+from tangled.web.scripts.show import find_shadowed, get_matching_strategy, parse_import_times
+
+
+class TestResource(Resource):
+
+    def GET(self):
+        pass
+
+    def POST(self):
+        pass
+
+
+class TestFindShadowed(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Application({})
+
+    def find_shadowed(self):
+        mounted_resources = self.app.get_all(AMountedResource, as_dict=True)
+        return find_shadowed(list(mounted_resources.values()))
+
+    def test_no_shadowing(self):
+        self.app.mount_resource('user', TestResource, '/users/<id>')
+        self.app.mount_resource('me', TestResource, '/users/me')
+        self.assertEqual(self.find_shadowed(), {})
+
+    def test_literal_path_shadowed_by_later_pattern(self):
+        self.app.mount_resource('me', TestResource, '/users/me')
+        self.app.mount_resource('user', TestResource, '/users/<id>')
+        self.assertEqual(self.find_shadowed(), {'me': ({'GET', 'OPTIONS', 'POST'}, ['user'])})
+
+    def test_partially_shadowed(self):
+        self.app.mount_resource('me', TestResource, '/users/me')
+        self.app.mount_resource('user', TestResource, '/users/<id>', methods='GET')
+        self.assertEqual(self.find_shadowed(), {'me': ({'GET'}, ['user'])})
+
+
+class TestMatchingStrategy(unittest.TestCase):
+
+    def test_not_frozen(self):
+        strategy = get_matching_strategy(Application({}))
+        self.assertNotIn('frozen', strategy)
+
+    def test_frozen(self):
+        strategy = get_matching_strategy(Application({'tangled.app.freeze': 'true'}))
+        self.assertIn('frozen', strategy)
+
+
+class TestParseImportTimes(unittest.TestCase):
+
+    def test_parse(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       200 |        200 |   _io\n'
+            'import time:       300 |        500 | package\n'
+        )
+        self.assertEqual(parse_import_times(output), [
+            ('_io', 200, 200, 1),
+            ('package', 300, 500, 0),
+        ])
+
+
+class TestStartupTimings(unittest.TestCase):
+
+    def test_startup_timings(self):
+        app = Application({})
+        for phase in ('settings', 'representations', 'resources', 'created'):
+            self.assertIn(phase, app.startup_timings)
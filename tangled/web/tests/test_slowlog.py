@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+from tangled.web.slowlog import SlowLog
+
+
+class User(Resource):
+
+    def GET(self, id):
+        return {'id': id}
+
+
+def make_entry(duration, timestamp=None):
+    return lambda: {'duration': duration, 'timestamp': timestamp or 2 ** 40}
+
+
+class TestSlowLog(unittest.TestCase):
+
+    def test_keeps_slowest(self):
+        slow_log = SlowLog(size=2, window=60)
+        for duration in (5, 1, 10, 3):
+            slow_log.add('/users/<id>', duration, make_entry(duration))
+        entries = slow_log.entries()['/users/<id>']
+        self.assertEqual([e['duration'] for e in entries], [10, 5])
+
+    def test_entry_only_made_when_added(self):
+        slow_log = SlowLog(size=1, window=60)
+        slow_log.add('/', 10, make_entry(10))
+        self.assertFalse(slow_log.add('/', 5, lambda: self.fail('Entry made')))
+
+    def test_expired_entries_are_discarded(self):
+        slow_log = SlowLog(size=1, window=60)
+        slow_log.add('/', 10, make_entry(10, timestamp=1))
+        self.assertTrue(slow_log.add('/', 5, make_entry(5)))
+        self.assertEqual([e['duration'] for e in slow_log.entries()['/']], [5])
+
+    def test_shared_dir(self):
+        with tempfile.TemporaryDirectory() as shared_dir:
+            slow_log = SlowLog(size=2, window=60, shared_dir=shared_dir)
+            other_worker = SlowLog(size=2, window=60, shared_dir=shared_dir)
+            # Same run, different process
+            other_worker._snapshots.run_id = slow_log._snapshots.run_id
+            other_worker._snapshots.start_time += 1
+            other_worker.add('/', 10, make_entry(10))
+            other_worker.flush()
+            # Earlier run
+            earlier_run = SlowLog(size=2, window=60, shared_dir=shared_dir)
+            earlier_run.add('/', 20, make_entry(20))
+            earlier_run.flush()
+            slow_log.add('/', 5, make_entry(5))
+            self.assertEqual([e['duration'] for e in slow_log.collect()['/']], [10, 5])
+            self.assertEqual(
+                [e['duration'] for e in slow_log.collect(all_runs=True)['/']], [20, 10])
+            slow_log.prepare_for_fork()
+            run_id = slow_log._snapshots.run_id
+            self.assertTrue(all(run_id in name for name in os.listdir(shared_dir)))
+            self.assertNotIn(os.path.basename(earlier_run._snapshots.path), os.listdir(shared_dir))
+
+
+class TestSlowLogIntegration(unittest.TestCase):
+
+    def test_requests_are_logged_by_route(self):
+        app = Application('tangled.web.tests:test.ini', extra={
+            'tangled.app.slow_log.enabled': True,
+            'tangled.app.slow_log.path': '/_slow',
+        })
+        app.mount_resource('user', User, '/users/<id>')
+        test_app = TestApp(app)
+        test_app.get('/users/1')
+        test_app.get('/users/2')
+        response = test_app.get('/_slow')
+        entries = response.json['routes']['/users/<id>']
+        self.assertEqual(len(entries), 2)
+        self.assertEqual({e['urlvars']['id'] for e in entries}, {'1', '2'})
+        self.assertEqual(entries[0]['name'], 'user')
@@ -0,0 +1,145 @@
+import asyncio
+import queue
+import threading
+import time
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource, config
+from tangled.web.representations import Representation
+from tangled.web.sse import END, HEARTBEAT, Event, EventStream, format_event
+
+
+events = queue.Queue()
+
+
+class Updates(Resource):
+
+    @config('text/event-stream', quality=1)
+    def GET(self):
+        events.put(Event('resumed', id=self.request.last_event_id))
+        events.put(END)
+        return EventStream(events, heartbeat=1, retry=1000)
+
+
+class TestFormatEvent(unittest.TestCase):
+
+    def test_string(self):
+        self.assertEqual(format_event('hello'), 'data: hello\n\n')
+
+    def test_multiline_data(self):
+        self.assertEqual(format_event('a\nb'), 'data: a\ndata: b\n\n')
+
+    def test_event(self):
+        event = Event('x', event='update', id=1)
+        self.assertEqual(format_event(event), 'event: update\nid: 1\ndata: x\n\n')
+
+    def test_data_line_terminators(self):
+        self.assertEqual(format_event('a\r\nb\rc'), 'data: a\ndata: b\ndata: c\n\n')
+        # Not line terminators in event streams
+        self.assertEqual(format_event('a\x0bb\u2028c'), 'data: a\x0bb\u2028c\n\n')
+        self.assertEqual(format_event('a\n'), 'data: a\ndata: \n\n')
+
+    def test_event_and_id_cant_contain_newlines(self):
+        self.assertRaises(ValueError, format_event, Event('x', event='a\ndata: injected'))
+        self.assertRaises(ValueError, format_event, Event('x', event='a\rb'))
+        self.assertRaises(ValueError, format_event, Event('x', id='1\n\nevent: x'))
+        self.assertRaises(ValueError, format_event, Event('x', id='1\0'))
+
+    def test_mapping(self):
+        self.assertEqual(format_event({'data': 'x', 'retry': 10}), 'retry: 10\ndata: x\n\n')
+
+    def test_heartbeat(self):
+        self.assertEqual(format_event(HEARTBEAT), ':\n\n')
+
+
+class TestEventStream(unittest.TestCase):
+
+    def test_iterable(self):
+        self.assertEqual(list(EventStream(['a', HEARTBEAT])), ['a', HEARTBEAT])
+
+    def test_queue(self):
+        source = queue.Queue()
+        source.put('a')
+        source.put(END)
+        self.assertEqual(list(EventStream(source)), ['a'])
+
+    def test_heartbeat(self):
+        source = queue.Queue()
+        stream = iter(EventStream(source, heartbeat=0.01))
+        self.assertIs(next(stream), HEARTBEAT)
+        source.put('a')
+        self.assertEqual(next(stream), 'a')
+
+    def test_asyncio_queue(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            async def make_queue():
+                source = asyncio.Queue()
+                source.put_nowait('a')
+                source.put_nowait(END)
+                return source
+            source = asyncio.run_coroutine_threadsafe(make_queue(), loop).result()
+            self.assertEqual(list(EventStream(source, heartbeat=1, loop=loop)), ['a'])
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+    def test_asyncio_queue_timeout_while_event_is_in_flight(self):
+
+        class SlowQueue(asyncio.Queue):
+
+            async def get(self):
+                event = await super().get()
+                if event != END:
+                    # Block the loop until after the stream's heartbeat
+                    # timeout expires.
+                    time.sleep(0.2)
+                return event
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            async def make_queue():
+                source = SlowQueue()
+                source.put_nowait('a')
+                source.put_nowait(END)
+                return source
+            source = asyncio.run_coroutine_threadsafe(make_queue(), loop).result()
+            events = list(EventStream(source, heartbeat=0.05, loop=loop))
+            self.assertIs(events[0], HEARTBEAT)
+            self.assertEqual([e for e in events if e is not HEARTBEAT], ['a'])
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+
+class TestEventStreamRepresentation(unittest.TestCase):
+
+    def setUp(self):
+        app = Application('tangled.web.tests:test.ini')
+        app.include('tangled.web.sse')
+        app.mount_resource('updates', Updates, '/updates')
+        app.load_config(Updates)
+        self.app = TestApp(app)
+
+    def test_stream(self):
+        response = self.app.get('/updates', headers={
+            'Accept': 'text/event-stream',
+            'Last-Event-ID': '5',
+        })
+        self.assertEqual(response.content_type, 'text/event-stream')
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        self.assertEqual(response.text, 'retry: 1000\n\nid: 5\ndata: resumed\n\n')
+
+    def test_not_registered_by_default(self):
+        app = Application('tangled.web.tests:test.ini')
+        self.assertIsNone(app.get(Representation, 'event_stream'))
+        self.assertIsNone(app.get(Representation, 'text/event-stream'))
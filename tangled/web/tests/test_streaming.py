@@ -0,0 +1,83 @@
+import unittest
+
+from webob import Request
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+
+
+events = []
+
+
+class Report(Resource):
+
+    def GET(self):
+        self.request.on_finished(lambda app, request, response: events.append('finished'))
+
+        def rows():
+            events.append('started')
+            for i in range(3):
+                yield 'row {}\n'.format(i)
+            # Multibyte character split across chunks by the encoder
+            yield 'caf'
+            yield 'é\n'
+            events.append('done')
+
+        return rows()
+
+
+class Items(Resource):
+
+    def GET(self):
+        return ({'id': i} for i in range(3))
+
+
+class Empty(Resource):
+
+    def GET(self):
+        return iter(())
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        del events[:]
+
+    def make_app(self, content_type='text/plain'):
+        app = Application('tangled.web.tests:test.ini', extra={
+            'tangled.app.default_content_type': content_type,
+        })
+        app.mount_resource('report', Report, '/report')
+        app.mount_resource('items', Items, '/items')
+        app.mount_resource('empty', Empty, '/empty')
+        return app
+
+    def test_stream(self):
+        app = self.make_app()
+        status, headers, app_iter = Request.blank('/report').call_application(app)
+        self.assertEqual(status, '200 OK')
+        self.assertNotIn('Content-Length', dict(headers))
+        self.assertEqual(events, [])
+        try:
+            body = b''.join(app_iter)
+        finally:
+            app_iter.close()
+        self.assertEqual(body.decode('utf-8'), 'row 0\nrow 1\nrow 2\ncafé\n')
+
+    def test_finished_callbacks_are_called_after_stream_is_sent(self):
+        response = TestApp(self.make_app()).get('/report')
+        self.assertEqual(response.content_type, 'text/plain')
+        self.assertEqual(events, ['started', 'done', 'finished'])
+
+    def test_head_doesnt_generate_stream(self):
+        TestApp(self.make_app()).head('/report')
+        self.assertEqual(events, ['finished'])
+
+    def test_json_stream(self):
+        response = TestApp(self.make_app('application/json')).get('/items')
+        self.assertEqual(response.content_type, 'application/json')
+        self.assertEqual(response.json, [{'id': 0}, {'id': 1}, {'id': 2}])
+
+    def test_empty_json_stream(self):
+        response = TestApp(self.make_app('application/json')).get('/empty')
+        self.assertEqual(response.json, [])
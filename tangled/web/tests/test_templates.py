@@ -0,0 +1,124 @@
+import os
+import shutil
+import string
+import tempfile
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource, config
+from tangled.web.representations import Representation, TemplateMixin
+from tangled.web.templates import TemplateEngine, TemplateRegistry
+
+
+class Engine(TemplateEngine):
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.loaded = []
+
+    def get_file_name(self, name):
+        return os.path.join(self.directory, name)
+
+    def load(self, name):
+        self.loaded.append(name)
+        with open(self.get_file_name(name)) as fp:
+            return string.Template(fp.read())
+
+    def render(self, template, context):
+        return template.substitute(context)
+
+
+class TextTemplateRepresentation(TemplateMixin, Representation):
+
+    key = 'text_template'
+    content_type = 'text/x-template'
+    quality = 1
+
+    def __init__(self, app, request, data, template, **kwargs):
+        super().__init__(app, request, data, **kwargs)
+        self.template = template
+
+    @property
+    def content(self):
+        return self.render(self.template, exclamation='!')
+
+
+class Greeting(Resource):
+
+    @config('text/x-template', template='greeting.txt')
+    def GET(self):
+        return {'name': 'World'}
+
+
+class TestTemplates(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.write('greeting.txt', 'Hello, $name$exclamation')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content, mtime=None):
+        file_name = os.path.join(self.directory, name)
+        with open(file_name, 'w') as fp:
+            fp.write(content)
+        if mtime is not None:
+            os.utime(file_name, (mtime, mtime))
+
+    def make_app(self, debug=False, **settings):
+        settings = {'tangled.app.{}'.format(k): v for (k, v) in settings.items()}
+        settings['debug'] = debug
+        app = Application('tangled.web.tests:test.ini', extra=settings)
+        app.register_representation_type(TextTemplateRepresentation)
+        app.add_representation_arg('text/x-template', 'template', None)
+        app.add_template_engine('text/x-template', Engine(self.directory))
+        app.mount_resource('greeting', Greeting, '/greeting')
+        app.load_config(Greeting)
+        return app
+
+    def test_render(self):
+        app = self.make_app(defer_created=True)
+        engine = app.get(TemplateEngine, 'text/x-template')
+        test_app = TestApp(app)
+        headers = {'Accept': 'text/x-template'}
+        for _ in range(2):
+            response = test_app.get('/greeting', headers=headers)
+            self.assertEqual(response.text, 'Hello, World!')
+        self.assertEqual(engine.loaded, ['greeting.txt'])
+
+    def test_template_isnt_reloaded_when_not_debugging(self):
+        app = self.make_app()
+        registry = app.get_required(TemplateRegistry)
+        template = registry.get('greeting.txt', 'text/x-template')
+        self.write('greeting.txt', 'Bye, $name', mtime=1)
+        self.assertIs(registry.get('greeting.txt', 'text/x-template'), template)
+
+    def test_template_is_reloaded_when_modified_in_debug_mode(self):
+        app = self.make_app(debug=True)
+        registry = app.get_required(TemplateRegistry)
+        template = registry.get('greeting.txt', 'text/x-template')
+        self.assertIs(registry.get('greeting.txt', 'text/x-template'), template)
+        self.write('greeting.txt', 'Bye, $name', mtime=1)
+        context = {'name': 'World'}
+        self.assertEqual(registry.render('greeting.txt', context, 'text/x-template'), 'Bye, World')
+
+    def test_warmup(self):
+        app = self.make_app(defer_created=True)
+        engine = app.get(TemplateEngine, 'text/x-template')
+        self.assertEqual(engine.loaded, [])
+        app.created()
+        self.assertEqual(engine.loaded, ['greeting.txt'])
+        TestApp(app).get('/greeting', headers={'Accept': 'text/x-template'})
+        self.assertEqual(engine.loaded, ['greeting.txt'])
+
+    def test_no_warmup(self):
+        app = self.make_app(defer_created=True, **{'templates.warmup': False})
+        app.created()
+        self.assertEqual(app.get(TemplateEngine, 'text/x-template').loaded, [])
+
+    def test_no_engine(self):
+        app = self.make_app()
+        registry = app.get_required(TemplateRegistry)
+        self.assertRaises(LookupError, registry.get, 'greeting.txt', 'text/html')
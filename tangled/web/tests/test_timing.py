@@ -0,0 +1,70 @@
+import unittest
+
+from webtest import TestApp
+
+from tangled.web import Application, Resource
+from tangled.web.timing import NULL_TIMINGS, Timings
+
+
+class TimedResource(Resource):
+
+    def GET(self):
+        return {'timings': sorted(self.request.timings)}
+
+
+class TestTimings(unittest.TestCase):
+
+    def test_record_accumulates(self):
+        timings = Timings()
+        start = timings.start()
+        timings.record('phase', start)
+        first = timings['phase']
+        timings.record('phase', start)
+        self.assertGreaterEqual(timings['phase'], first)
+        self.assertEqual(list(timings), ['phase'])
+
+    def test_server_timing(self):
+        timings = Timings()
+        timings.durations['a'] = 1500000
+        timings.durations['b'] = 250000
+        self.assertEqual(timings.server_timing(), 'a;dur=1.500, b;dur=0.250')
+
+    def test_null_timings(self):
+        start = NULL_TIMINGS.start()
+        self.assertEqual(NULL_TIMINGS.record('phase', start), 0)
+        self.assertEqual(len(NULL_TIMINGS), 0)
+        self.assertEqual(NULL_TIMINGS.server_timing(), '')
+
+
+class TestTimingIntegration(unittest.TestCase):
+
+    def make_app(self, **settings):
+        app = Application('tangled.web.tests:test.ini', extra=settings)
+        app.mount_resource('timed', TimedResource, '/timed')
+        return app
+
+    def test_disabled_by_default(self):
+        app = self.make_app()
+        request = app.make_blank_request('/timed')
+        self.assertIs(request.timings, NULL_TIMINGS)
+        response = TestApp(app).get('/timed')
+        self.assertNotIn('Server-Timing', response.headers)
+
+    def test_enabled(self):
+        app = self.make_app(**{'tangled.app.timing.enabled': True})
+        response = TestApp(app).get('/timed')
+        recorded = response.json['timings']
+        # Only phases completed before the resource method was called
+        self.assertEqual(recorded, ['bind', 'request', 'request_attributes', 'routing'])
+        self.assertNotIn('Server-Timing', response.headers)
+
+    def test_server_timing_header(self):
+        app = self.make_app(**{
+            'tangled.app.timing.enabled': True,
+            'tangled.app.timing.server_timing': True,
+        })
+        response = TestApp(app).get('/timed')
+        header = response.headers['Server-Timing']
+        self.assertIn('total;dur=', header)
+        self.assertIn('handler.main;dur=', header)
+        self.assertIn('representation;dur=', header)
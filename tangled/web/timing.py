@@ -0,0 +1,166 @@
+"""Request timing instrumentation.
+
+When the ``tangled.app.timing.enabled`` setting is on, every request
+gets a :class:`Timings` instance as ``request.timings``. Each handler in
+the handler chain is timed, as are the following phases of request
+processing:
+
+    - ``routing``: finding the mounted resource for the request
+    - ``bind``: binding the request to the resource method
+    - ``resource``: calling the resource method
+    - ``representation``: generating the representation
+
+Durations are measured with a monotonic clock and stored in nanoseconds.
+Handler durations are inclusive of the handlers they call.
+
+When the ``tangled.app.timing.server_timing`` setting is also on, the
+timings will be added to responses via the ``Server-Timing`` header.
+
+When timing is disabled, ``request.timings`` is a shared
+:class:`NullTimings` instance that records nothing.
+
+"""
+import logging
+from collections import OrderedDict
+
+from .handlers import HandlerWrapper
+
+
+try:
+    from time import perf_counter_ns
+except ImportError:  # Python < 3.7
+    from time import perf_counter
+
+    def perf_counter_ns():
+        return int(perf_counter() * 1000000000)
+
+
+log = logging.getLogger(__name__)
+
+
+class Timings:
+
+    """Records named durations for a request.
+
+    Usage::
+
+        start = request.timings.start()
+        ...
+        request.timings.record('phase', start)
+
+    Recording the same name more than once accumulates its duration.
+
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.durations = OrderedDict()
+
+    @staticmethod
+    def start():
+        return perf_counter_ns()
+
+    def record(self, name, start):
+        elapsed = perf_counter_ns() - start
+        durations = self.durations
+        durations[name] = durations.get(name, 0) + elapsed
+        return elapsed
+
+    def items(self):
+        """Get (name, milliseconds) pairs in the order recorded."""
+        return [(name, ns / 1000000) for name, ns in self.durations.items()]
+
+    def server_timing(self):
+        """Format timings as a ``Server-Timing`` header value."""
+        return ', '.join(
+            '{name};dur={ms:.3f}'.format(name=name, ms=ms) for name, ms in self.items())
+
+    def __getitem__(self, name):
+        return self.durations[name]
+
+    def __contains__(self, name):
+        return name in self.durations
+
+    def __iter__(self):
+        return iter(self.durations)
+
+    def __len__(self):
+        return len(self.durations)
+
+    def __repr__(self):
+        items = ', '.join('{}={:.3f}ms'.format(name, ms) for name, ms in self.items())
+        return '{self.__class__.__name__}({items})'.format_map(locals())
+
+
+class NullTimings:
+
+    """Stand-in for :class:`Timings` when timing is disabled."""
+
+    __slots__ = ()
+
+    enabled = False
+    durations = {}
+
+    @staticmethod
+    def start():
+        return 0
+
+    def record(self, name, start):
+        return 0
+
+    def items(self):
+        return []
+
+    def server_timing(self):
+        return ''
+
+    def __contains__(self, name):
+        return False
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __repr__(self):
+        return 'NullTimings()'
+
+
+NULL_TIMINGS = NullTimings()
+
+
+class TimedHandlerWrapper(HandlerWrapper):
+
+    # Used in place of HandlerWrapper when timing is enabled.
+
+    def __init__(self, callable_, next_handler):
+        super().__init__(callable_, next_handler)
+        self.timing_name = 'handler.{}'.format(
+            getattr(self.callable_, '__name__', self.callable_.__class__.__name__))
+
+    def __call__(self, app, request):
+        timings = request.timings
+        start = timings.start()
+        try:
+            return super().__call__(app, request)
+        finally:
+            timings.record(self.timing_name, start)
+
+
+def timing_handler(app, request, next_handler):
+    """Record total request time; add ``Server-Timing`` header.
+
+    This is the outermost handler when timing is enabled.
+
+    """
+    timings = request.timings
+    start = timings.start()
+    response = next_handler(app, request)
+    elapsed = timings.record('total', start)
+    if app.get_setting('timing.server_timing'):
+        response.headers['Server-Timing'] = timings.server_timing()
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug('Request to {} took {:.2f}ms'.format(request.url, elapsed / 1000000))
+    return response